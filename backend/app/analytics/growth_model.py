@@ -0,0 +1,37 @@
+"""
+Market-value trajectories: each year a player's value grows by
+
+    rate(k) = predicted_growth * multiplier * (1 + max(0, (peak_age - age) / 10)) * decay^k  (%)
+
+so younger players grow faster and growth fades over the horizon. Computed for
+N players x K years as one broadcast and a cumulative product.
+"""
+from typing import Dict
+import numpy as np
+
+DEFAULT_YEARS = 5
+MAX_YEARS = 15
+DEFAULT_DECAY = 0.9
+DEFAULT_PEAK_AGE = 25
+AGE_SCALE = 10
+CEILING_FACTOR = 1.5
+
+def project_values(ages, growth, values, years: int = DEFAULT_YEARS, decay: float = DEFAULT_DECAY,
+                   peak_age: float = DEFAULT_PEAK_AGE, multiplier: float = 1.0) -> np.ndarray:
+    """(N, years) projected values; column k is the value after k + 1 growth steps."""
+    ages = np.asarray(ages, dtype=np.float64)
+    growth = np.nan_to_num(np.asarray(growth, dtype=np.float64))
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+
+    age_factor = np.maximum(0.0, (peak_age - ages) / AGE_SCALE)
+    rates = (growth * multiplier * (1 + age_factor))[:, None] * decay ** np.arange(years)[None, :]
+    return values[:, None] * np.cumprod(1 + rates / 100, axis=1)
+
+def summarize(trajectories: np.ndarray, values) -> Dict[str, np.ndarray]:
+    """Squad totals per year and each player's value change over the horizon."""
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    final = trajectories[:, -1] if trajectories.shape[1] else values
+    return {
+        "totals": trajectories.sum(axis=0),
+        "gain": final - values,
+    }
@@ -18,8 +18,56 @@ XT_GRID = np.array([
     [0.055, 0.100, 0.200, 0.400, 0.400, 0.200, 0.100, 0.055],
 ])
 
+# Grid used when no fitted grid is passed; swapped at runtime by the xT grid store
+_active_grid = XT_GRID
+
+def active_grid() -> np.ndarray:
+    return _active_grid
+
+def set_active_grid(grid: np.ndarray):
+    """Hot-swaps the grid behind get_zone_value and the xT endpoints (a single reference assignment)."""
+    global _active_grid
+    _active_grid = np.asarray(grid, dtype=np.float64)
+
+def cell_indices(x_pct, y_pct, shape: tuple):
+    """Grid cell (column along the pitch, row across it) for arrays of normalized 0-100 coordinates."""
+    cols, rows = shape
+    grid_x = np.clip((np.asarray(x_pct, dtype=np.float64) * (cols / 100)).astype(np.intp), 0, cols - 1)
+    grid_y = np.clip((np.asarray(y_pct, dtype=np.float64) * (rows / 100)).astype(np.intp), 0, rows - 1)
+    return grid_x, grid_y
+
+def zone_values(x_pct, y_pct, grid: np.ndarray = None) -> np.ndarray:
+    grid = _active_grid if grid is None else grid
+    grid_x, grid_y = cell_indices(x_pct, y_pct, grid.shape)
+    return grid[grid_x, grid_y]
+
 def get_zone_value(x_pct: float, y_pct: float) -> float:
     """Gets the xT value for a normalized coordinate (0-100)."""
-    grid_x = min(int(x_pct / (100 / 12)), 11)
-    grid_y = min(int(y_pct / (100 / 8)), 7)
-    return XT_GRID[grid_x, grid_y]
+    return float(zone_values(x_pct, y_pct))
+
+def value_actions(start_x, start_y, end_x, end_y, grid: np.ndarray = None) -> dict:
+    """xT added by each ball movement: value of the end zone minus value of the start zone."""
+    grid = _active_grid if grid is None else grid
+    start_value = zone_values(start_x, start_y, grid)
+    end_value = zone_values(end_x, end_y, grid)
+    return {"start_value": start_value, "end_value": end_value, "xt": end_value - start_value}
+
+def aggregate_by_player(player_ids, xt: np.ndarray) -> list:
+    """Per-player totals over an action batch, highest total xT first."""
+    players, inverse = np.unique(np.asarray(player_ids, dtype=object).astype(str), return_inverse=True)
+    n = len(players)
+    actions = np.bincount(inverse, minlength=n)
+    total = np.bincount(inverse, weights=xt, minlength=n)
+    positive = np.bincount(inverse, weights=np.maximum(xt, 0), minlength=n)
+    progressive = np.bincount(inverse, weights=(xt > 0).astype(np.float64), minlength=n)
+    order = np.argsort(-total, kind="stable")
+    return [
+        {
+            "player_id": str(players[i]),
+            "actions": int(actions[i]),
+            "xt_total": round(float(total[i]), 6),
+            "xt_positive": round(float(positive[i]), 6),
+            "progressive_actions": int(progressive[i]),
+        }
+        for i in order
+    ]
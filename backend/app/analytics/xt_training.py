@@ -0,0 +1,230 @@
+"""
+Expected Threat (xT) fitted from event data with the Markov formulation
+(Karun Singh, 2019): for every zone z,
+
+    xT(z) = s(z) * g(z) + m(z) * sum_z' T(z -> z') * xT(z')
+
+where s/m are the shares of actions in z that are shots/moves, g is the shot
+conversion rate and T the transition matrix of *successful* moves. Failed moves
+and turnovers end the possession and contribute nothing. T is sparse (most zone
+pairs never occur) and the fixed point is found by vectorized value iteration.
+"""
+import os
+import re
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from app.analytics.xt_model import XT_GRID, cell_indices, set_active_grid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+XT_EVENTS_DIR = os.getenv("XT_EVENTS_DIR", os.path.join(BACKEND_DIR, "data", "events"))
+XT_GRID_DIR = os.getenv("XT_GRID_DIR", os.path.join(BACKEND_DIR, "data", "xt_grids"))
+
+MOVE_TYPES = {"move", "pass", "carry", "dribble", "cross"}
+SHOT_TYPES = {"shot"}
+TURNOVER_TYPES = {"turnover", "dispossessed", "miscontrol"}
+REQUIRED_COLUMNS = ["type", "start_x", "start_y"]
+KEY_PATTERN = re.compile(r"^[a-z0-9-]+_[a-z0-9-]+_\d+x\d+$")
+
+def load_events(path: str) -> pd.DataFrame:
+    """
+    Event file (CSV, JSON lines or Parquet) with columns type, start_x, start_y and,
+    for moves, end_x, end_y, success; for shots, goal. Coordinates are 0-100 with
+    the attacking team playing towards x=100.
+    """
+    if path.endswith(".parquet"):
+        events = pd.read_parquet(path)
+    elif path.endswith((".jsonl", ".json")):
+        events = pd.read_json(path, lines=True)
+    else:
+        events = pd.read_csv(path)
+    missing = [c for c in REQUIRED_COLUMNS if c not in events.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return events
+
+def _flag(events: pd.DataFrame, column: str, default: bool) -> np.ndarray:
+    if column not in events.columns:
+        return np.full(len(events), default)
+    values = events[column]
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return values.fillna(default).astype(bool).to_numpy()
+    truthy = values.astype(str).str.strip().str.lower().isin(["1", "1.0", "true", "yes", "goal", "complete", "successful"])
+    return np.where(values.isna(), default, truthy)
+
+def fit_grid(events: pd.DataFrame, cols: int = 12, rows: int = 8, tol: float = 1e-6,
+             max_iter: int = 500) -> Dict[str, Any]:
+    """Fits a (cols x rows) xT grid. Returns the grid plus fit diagnostics."""
+    if cols < 2 or rows < 2:
+        raise ValueError("Grid needs at least 2x2 zones")
+    n = cols * rows
+    kind = events["type"].astype(str).str.lower().to_numpy()
+    is_move = np.isin(kind, list(MOVE_TYPES))
+    is_shot = np.isin(kind, list(SHOT_TYPES))
+    is_turnover = np.isin(kind, list(TURNOVER_TYPES))
+
+    gx, gy = cell_indices(events["start_x"].to_numpy(), events["start_y"].to_numpy(), (cols, rows))
+    start = gx * rows + gy
+
+    shots = np.bincount(start[is_shot], minlength=n).astype(np.float64)
+    moves = np.bincount(start[is_move], minlength=n).astype(np.float64)
+    turnovers = np.bincount(start[is_turnover], minlength=n).astype(np.float64)
+    goals = np.bincount(start[is_shot & _flag(events, "goal", False)], minlength=n).astype(np.float64)
+    actions = shots + moves + turnovers
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shot_prob = np.where(actions > 0, shots / actions, 0.0)
+        move_prob = np.where(actions > 0, moves / actions, 0.0)
+        goal_prob = np.where(shots > 0, goals / shots, 0.0)
+
+    # Successful moves only; a failed move is a turnover and leads nowhere
+    completed = is_move & _flag(events, "success", True)
+    if completed.any():
+        if "end_x" not in events.columns or "end_y" not in events.columns:
+            raise ValueError("Moves need end_x and end_y")
+        ex, ey = cell_indices(events["end_x"].to_numpy()[completed], events["end_y"].to_numpy()[completed], (cols, rows))
+        counts = sparse.coo_matrix(
+            (np.ones(int(completed.sum())), (start[completed], ex * rows + ey)), shape=(n, n)
+        ).tocsr()  # duplicates are summed
+    else:
+        counts = sparse.csr_matrix((n, n))
+    # Row-normalize by all move attempts from the zone: T(z -> z') = completed(z, z') / moves(z)
+    inverse_moves = np.divide(1.0, moves, out=np.zeros(n), where=moves > 0)
+    transitions = sparse.diags(inverse_moves) @ counts
+
+    shot_value = shot_prob * goal_prob
+    xt = np.zeros(n)
+    iterations, converged = 0, False
+    while iterations < max_iter and not converged:
+        updated = shot_value + move_prob * (transitions @ xt)
+        converged = float(np.abs(updated - xt).max()) < tol
+        xt = updated
+        iterations += 1
+
+    return {
+        "grid": xt.reshape(cols, rows),
+        "events": int(len(events)),
+        "shots": int(shots.sum()),
+        "goals": int(goals.sum()),
+        "moves": int(moves.sum()),
+        "transitions_nnz": int(transitions.nnz),
+        "iterations": iterations,
+        "converged": converged,
+    }
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "all"
+
+class XTGridStore:
+    """
+    Fitted grids cached on disk per league/season/resolution (.npz + metadata),
+    and the pointer to the one currently served. Activating a grid swaps it into
+    xt_model in-process and persists the choice, so it survives restarts.
+    """
+
+    def __init__(self, grid_dir: str = XT_GRID_DIR, events_dir: str = XT_EVENTS_DIR):
+        self.grid_dir = grid_dir
+        self.events_dir = events_dir
+        self.active: Optional[Dict[str, Any]] = None  # metadata of the active fitted grid
+        self._grids: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def key(self, league: str, season: str, cols: int = 12, rows: int = 8) -> str:
+        return f"{_slug(league)}_{_slug(season)}_{cols}x{rows}"
+
+    def _path(self, key: str) -> str:
+        if not KEY_PATTERN.match(key):
+            raise ValueError(f"No fitted xT grid '{key}'")
+        return os.path.join(self.grid_dir, f"{key}.npz")
+
+    def events_path(self, filename: str) -> str:
+        """Event files are only read from the events directory."""
+        path = os.path.realpath(os.path.join(self.events_dir, filename))
+        if os.path.dirname(path) != os.path.realpath(self.events_dir) or not os.path.isfile(path):
+            raise ValueError(f"Event file not found: {filename}")
+        return path
+
+    def fit(self, league: str, season: str, filename: str, cols: int = 12, rows: int = 8) -> Dict[str, Any]:
+        events = load_events(self.events_path(filename))
+        if "league" in events.columns:
+            events = events[events["league"] == league]
+        if "season" in events.columns:
+            events = events[events["season"].astype(str) == str(season)]
+        if events.empty:
+            raise ValueError(f"No events for {league} {season} in {filename}")
+
+        started = datetime.now(timezone.utc)
+        result = fit_grid(events, cols, rows)
+        key = self.key(league, season, cols, rows)
+        meta = {
+            "key": key, "league": league, "season": str(season), "cols": cols, "rows": rows,
+            "source": filename, "fitted_at": started.isoformat(),
+            "fit_ms": round((datetime.now(timezone.utc) - started).total_seconds() * 1000, 1),
+            **{k: v for k, v in result.items() if k != "grid"},
+        }
+        os.makedirs(self.grid_dir, exist_ok=True)
+        tmp_path = self._path(key) + ".tmp.npz"
+        np.savez(tmp_path, grid=result["grid"], meta=json.dumps(meta))
+        os.replace(tmp_path, self._path(key))
+        with self._lock:
+            self._grids[key] = result["grid"]
+        return meta
+
+    def load(self, key: str) -> tuple:
+        with self._lock:
+            grid = self._grids.get(key)
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise ValueError(f"No fitted xT grid '{key}'")
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if grid is None:
+                grid = data["grid"]
+                with self._lock:
+                    self._grids[key] = grid
+        return grid, meta
+
+    def grid(self, league: str, season: str, cols: int = 12, rows: int = 8) -> np.ndarray:
+        return self.load(self.key(league, season, cols, rows))[0]
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.grid_dir):
+            return []
+        fitted = []
+        for name in sorted(os.listdir(self.grid_dir)):
+            if name.endswith(".npz") and not name.endswith(".tmp.npz"):
+                fitted.append(self.load(name[:-4])[1])
+        return fitted
+
+    def activate(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Serves the fitted grid `key`, or the built-in baseline for None."""
+        if key is None:
+            set_active_grid(XT_GRID)
+            self.active = None
+        else:
+            grid, meta = self.load(key)
+            set_active_grid(grid)
+            self.active = meta
+        os.makedirs(self.grid_dir, exist_ok=True)
+        with open(os.path.join(self.grid_dir, "active.json"), "w") as f:
+            json.dump({"key": key}, f)
+        return self.active
+
+    def restore(self):
+        """Re-activates the persisted choice at startup; a missing grid falls back to the baseline."""
+        pointer = os.path.join(self.grid_dir, "active.json")
+        if not os.path.exists(pointer):
+            return
+        with open(pointer) as f:
+            key = json.load(f).get("key")
+        try:
+            self.activate(key)
+        except ValueError:
+            print(f"WARNING: active xT grid '{key}' not found, serving the baseline grid")
+            self.activate(None)
+
+xt_grid_store = XTGridStore()
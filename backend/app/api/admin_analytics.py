@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlmodel import Session, select, func
-from app.core.db import get_session
+from app.core.db import get_session, get_pool_stats
 from app.models.player import Player
 from app.utils.data_generator import seed_data
+from app.core.cache import response_cache, PLAYERS
 import time
 
 router = APIRouter(prefix="/admin/stats", tags=["admin"])
@@ -27,6 +28,7 @@ async def get_data_health(session: Session = Depends(get_session)):
 async def trigger_regeneration():
     start_time = time.time()
     seed_data(target_total=200)
+    response_cache.invalidate(PLAYERS)
     end_time = time.time()
     
     return {
@@ -34,3 +36,13 @@ async def trigger_regeneration():
         "message": "Synthetic signals synchronized.",
         "duration_ms": int((end_time - start_time) * 1000)
     }
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Hit/miss counters of the analytics response cache."""
+    return response_cache.stats()
+
+@router.get("/pool")
+async def get_pool_statistics():
+    """Checkout wait times and saturation of the database connection pools."""
+    return get_pool_stats()
@@ -1,29 +1,50 @@
-from fastapi import APIRouter, HTTPException
-from sqlmodel import Session, select, delete
-from app.models.staff import Assignment
-from app.models.chat import Message
-from app.core.db import engine
-from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends
+from sqlmodel import Session
+from typing import Optional
+from app.core.db import get_session
+from app.core.cache import response_cache, NOTES
+from app.services.retention import retention_engine
+from datetime import datetime, timezone
 
 router = APIRouter(prefix="/admin/archive", tags=["admin"])
 
+@router.get("/policies")
+async def get_policies():
+    """Configured retention policies (RETENTION_<NAME>_DAYS overrides the age)."""
+    return [
+        {"policy": p.name, "table": p.model.__tablename__, "action": p.action, "older_than_days": p.days,
+         "statuses": list(p.statuses), "archive_table": p.archive_model.__tablename__ if p.archive_model else None}
+        for p in retention_engine.policies.values()
+    ]
+
 @router.post("/execute")
-async def execute_archiving():
+async def execute_archiving(
+    dry_run: bool = False,
+    policies: Optional[str] = None,
+    older_than_days: Optional[int] = None,
+    session: Session = Depends(get_session)
+):
     """
-    Move completed assignments and old messages to 'Archived' status or handle seasonal cleanup.
+    Seasonal cleanup: flags completed assignments as ARCHIVED and moves old chat
+    messages, scout notes and closed negotiations into their archive tables.
+    policies: comma-separated subset (default all); dry_run only counts matching rows.
     """
-    with Session(engine) as session:
-        # Archive completed assignments older than 30 days
-        cutoff = datetime.now() - timedelta(days=30)
-        
-        assignments = session.exec(
-            select(Assignment).where(Assignment.status == "COMPLETED").where(Assignment.created_at < cutoff)
-        ).all()
-        
-        count = 0
-        for a in assignments:
-            a.status = "ARCHIVED"
-            count += 1
-        
-        session.commit()
-        return {"archived_assignments": count, "timestamp": datetime.now()}
+    try:
+        report = retention_engine.run(
+            session,
+            names=policies.split(",") if policies else None,
+            dry_run=dry_run,
+            older_than_days=older_than_days
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = {p["policy"]: p["rows"] for p in report["policies"]}
+    if not dry_run and rows.get("scout_notes"):
+        response_cache.invalidate(NOTES)
+    return {
+        "archived_assignments": rows.get("assignments", 0),
+        "archived_messages": rows.get("messages", 0),
+        **report,
+        "timestamp": datetime.now(timezone.utc)
+    }
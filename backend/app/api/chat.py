@@ -1,10 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from sqlmodel import Session, select
 from app.models.chat import Channel, Message
-from app.core.db import engine
+from app.core.db import get_session
+from app.services.activity_feed import activity_feed, MESSAGE
+from app.services.chat_archive import chat_archive
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timezone
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -15,44 +17,47 @@ class MessageCreate(BaseModel):
     player_id: Optional[str] = None
 
 @router.get("/channels", response_model=List[Channel])
-async def get_channels():
-    with Session(engine) as session:
-        channels = session.exec(select(Channel)).all()
+async def get_channels(session: Session = Depends(get_session)):
+    channels = session.exec(select(Channel)).all()
+    
+    # Seed default channels if empty
+    if not channels:
+        internal = Channel(name="Staff Hub", type="INTERNAL")
+        network = Channel(name="Director Network", type="DIRECTOR_NETWORK")
+        support = Channel(name="Alpha Feedback (Dev)", type="SUPPORT")
+        session.add(internal)
+        session.add(network)
+        session.add(support)
+        session.commit()
+        session.refresh(internal)
+        session.refresh(network)
+        session.refresh(support)
+        channels = [internal, network, support]
         
-        # Seed default channels if empty
-        if not channels:
-            internal = Channel(name="Staff Hub", type="INTERNAL")
-            network = Channel(name="Director Network", type="DIRECTOR_NETWORK")
-            support = Channel(name="Alpha Feedback (Dev)", type="SUPPORT")
-            session.add(internal)
-            session.add(network)
-            session.add(support)
-            session.commit()
-            session.refresh(internal)
-            session.refresh(network)
-            session.refresh(support)
-            channels = [internal, network, support]
-            
-        return channels
+    return channels
 
 @router.get("/messages/{channel_id}", response_model=List[Message])
-async def get_messages(channel_id: int):
-    with Session(engine) as session:
-        statement = select(Message).where(Message.channel_id == channel_id).order_by(Message.timestamp.asc())
-        results = session.exec(statement).all()
-        return results
+async def get_messages(
+    channel_id: int,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = 50,
+    session: Session = Depends(get_session)
+):
+    """Chronological page of a channel: the latest messages, or those before/after a message id."""
+    return chat_archive.history(session, channel_id, before=before, after=after, limit=limit)
 
 @router.post("/messages", response_model=Message)
-async def send_message(msg: MessageCreate):
-    with Session(engine) as session:
-        db_msg = Message(
-            channel_id=msg.channel_id,
-            sender=msg.sender,
-            content=msg.content,
-            player_id=msg.player_id,
-            timestamp=datetime.now()
-        )
-        session.add(db_msg)
-        session.commit()
-        session.refresh(db_msg)
-        return db_msg
+async def send_message(msg: MessageCreate, session: Session = Depends(get_session)):
+    db_msg = Message(
+        channel_id=msg.channel_id,
+        sender=msg.sender,
+        content=msg.content,
+        player_id=msg.player_id,
+        timestamp=datetime.now(timezone.utc)
+    )
+    session.add(db_msg)
+    session.commit()
+    session.refresh(db_msg)
+    activity_feed.publish(MESSAGE, db_msg)
+    return db_msg
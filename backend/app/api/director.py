@@ -1,22 +1,40 @@
 from fastapi import APIRouter, Depends
 from typing import List
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.db import get_async_session
 from app.services.director_intel import DirectorIntelService
+from app.core.cache import response_cache, PLAYERS
 import asyncio
 
 router = APIRouter(prefix="/director", tags=["director"])
 service = DirectorIntelService()
 
 @router.get("/priority-targets")
-async def get_priority_targets():
+@response_cache.cached("priority-targets", depends_on=(PLAYERS,))
+async def get_priority_targets(club: str = "Ajax", session: AsyncSession = Depends(get_async_session)):
     """
     Returns specific transfer targets based on current squad gaps.
     Algorithm: Analyze Squad -> Identify Gaps -> Search DB for fits.
     """
-    return service.get_priority_targets()
+    return await service.get_priority_targets(session, club=club)
 
 @router.get("/squad-health")
-async def get_squad_health():
+@response_cache.cached("squad-health", depends_on=(PLAYERS,))
+async def get_squad_health(club: str = "Ajax", session: AsyncSession = Depends(get_async_session)):
     """
     Returns the analysis of the current squad composition.
     """
-    return service.analyze_squad_health("Ajax")
+    return await service.analyze_squad_health(session, club)
+
+@router.get("/dashboard")
+@response_cache.cached("director-dashboard", depends_on=(PLAYERS,))
+async def get_director_dashboard(club: str = "Ajax", limit: int = 5, session: AsyncSession = Depends(get_async_session)):
+    """
+    Squad health and gap-filling targets for one club in a single round trip;
+    the targets reuse the squad analysis instead of recomputing it.
+    """
+    analysis = await service.analyze_squad_health(session, club)
+    return {
+        "squad_health": analysis,
+        "priority_targets": await service.get_priority_targets(session, limit=limit, club=club, analysis=analysis)
+    }
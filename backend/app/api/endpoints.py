@@ -1,64 +1,121 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from app.analytics.xt_model import get_zone_value
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, model_validator
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from app.analytics.xt_model import get_zone_value, value_actions, aggregate_by_player, active_grid
+from app.analytics.xt_training import xt_grid_store
+import numpy as np
+import os
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.player import Player, ScoutNote, ShortlistPlayerLink
-from app.core.db import engine
+from app.core.db import get_async_session
 from app.core.database import LEAGUE_STRENGTH
+from app.services.similarity import similarity_engine
+from app.core.cache import response_cache, PLAYERS, SHORTLISTS, NOTES
+from app.services.activity_feed import activity_feed, SCOUT_REPORT
+from app.utils.pagination import use_cursor
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+MAX_XT_BATCH = int(os.getenv("MAX_XT_BATCH", "200000"))
+
 class XTRequest(BaseModel):
     start_x: float  # 0-100
     start_y: float  # 0-100
     end_x: float    # 0-100
     end_y: float    # 0-100
 
+class XTAction(XTRequest):
+    player_id: Optional[str] = None
+
+class XTBatchRequest(BaseModel):
+    """A batch of ball movements, either as `actions` rows or as equal-length coordinate columns."""
+    actions: Optional[List[XTAction]] = None
+    start_x: Optional[List[float]] = None
+    start_y: Optional[List[float]] = None
+    end_x: Optional[List[float]] = None
+    end_y: Optional[List[float]] = None
+    player_id: Optional[List[Optional[str]]] = None
+    include_actions: bool = True  # per-action values; off for aggregate-only calls
+    grid: Optional[str] = None  # fitted grid key (see /analytics/xt-grid/fitted); default: the active grid
+
+    @model_validator(mode="after")
+    def check_shape(self):
+        columns = [self.start_x, self.start_y, self.end_x, self.end_y]
+        if self.actions is not None:
+            if any(c is not None for c in columns + [self.player_id]):
+                raise ValueError("Send either actions or coordinate columns, not both")
+            size = len(self.actions)
+        else:
+            if any(c is None for c in columns):
+                raise ValueError("start_x, start_y, end_x and end_y are required without actions")
+            size = len(self.start_x)
+            if any(len(c) != size for c in columns) or (self.player_id is not None and len(self.player_id) != size):
+                raise ValueError("All columns must have the same length")
+        if size > MAX_XT_BATCH:
+            raise ValueError(f"At most {MAX_XT_BATCH} actions per batch")
+        return self
+
+    def columns(self) -> Dict[str, list]:
+        if self.actions is not None:
+            return {field: [getattr(a, field) for a in self.actions]
+                    for field in ("start_x", "start_y", "end_x", "end_y", "player_id")}
+        return {"start_x": self.start_x, "start_y": self.start_y, "end_x": self.end_x, "end_y": self.end_y,
+                "player_id": self.player_id}
+
 @router.get("/intelligence/feed")
-async def get_intelligence_feed():
-    """Returns a live qualitative stream of scout observations."""
-    with Session(engine) as session:
-        # Join ScoutNote with Player to get player names
-        statement = select(ScoutNote, Player).join(Player)
-        results = session.exec(statement).all()
-        
-        feed = []
-        for note, player in results:
-            feed.append({
-                "player_id": player.id,
-                "player_name": player.name,
-                "scout": note.scout,
-                "content": note.note,
-                "date": note.date,
-                "type": "SCOUT_REPORT"
-            })
-        # Sort by date (desc)
-        return sorted(feed, key=lambda x: x["date"], reverse=True)
+@response_cache.cached("intelligence-feed", depends_on=(NOTES, PLAYERS))
+async def get_intelligence_feed(
+    limit: int = 50,
+    paginate: str = "list",
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Returns a live qualitative stream of scout observations, newest first."""
+    page = await activity_feed.page(session, kinds=(SCOUT_REPORT,), limit=limit, cursor=cursor, since=since)
+    items = [{
+        "player_id": event["ref"],
+        "player_name": event["player_name"],
+        "scout": event["user"],
+        "content": event["content"],
+        "date": event["time"].date().isoformat(),
+        "created_at": event["time"],
+        "type": SCOUT_REPORT
+    } for event in page["items"]]
+    if use_cursor(paginate, cursor):
+        return {"items": items, "next_cursor": page["next_cursor"]}
+    return items
 
 @router.get("/leagues/strengths")
+@response_cache.cached("league-strengths", ttl=300)
 async def get_league_strengths():
     from app.core.database import LEAGUE_STRENGTH
     return LEAGUE_STRENGTH
 
 @router.post("/players/{id}/notes")
-async def add_scout_note(id: str, note: dict):
+async def add_scout_note(id: str, note: dict, session: AsyncSession = Depends(get_async_session)):
     """Adds a collaborative scout note to a player profile."""
-    with Session(engine) as session:
-        statement = select(Player).where(Player.id == id)
-        player = session.exec(statement).first()
-        if not player:
-            return {"error": "Player not found"}
-        
-        from datetime import datetime
-        new_note = ScoutNote(
-            player_id=id,
-            scout=note.get("scout", "Anonymous Scout"),
-            note=note.get("note", ""),
-            date=datetime.now().strftime("%Y-%m-%d")
-        )
-        session.add(new_note)
-        session.commit()
-        return {"status": "success", "note": {"scout": new_note.scout, "note": new_note.note, "date": new_note.date}}
+    statement = select(Player).where(Player.id == id)
+    player = (await session.exec(statement)).first()
+    if not player:
+        return {"error": "Player not found"}
+    
+    created_at = datetime.now(timezone.utc)
+    new_note = ScoutNote(
+        player_id=id,
+        scout=note.get("scout", "Anonymous Scout"),
+        note=note.get("note", ""),
+        date=created_at.strftime("%Y-%m-%d"),
+        created_at=created_at
+    )
+    session.add(new_note)
+    await session.commit()
+    response_cache.invalidate(NOTES)
+    activity_feed.publish(SCOUT_REPORT, new_note, player.name)
+    return {"status": "success", "note": {"scout": new_note.scout, "note": new_note.note, "date": new_note.date, "created_at": created_at}}
 
 @router.get("/squad/stability")
 async def get_squad_stability():
@@ -90,69 +147,74 @@ async def export_intelligence_report():
     }
 
 @router.get("/players/{id}/successors")
-async def find_player_successors(id: str):
-    """Identifies potential younger/lower-cost successors for a player."""
-    with Session(engine) as session:
-        statement = select(Player).where(Player.id == id)
-        target = session.exec(statement).first()
-        if not target:
-            return {"error": "Player not found"}
-        
-        # Find players in the same position who are younger
-        statement = select(Player).where(
-            Player.position == target.position,
-            Player.age < target.age,
-            Player.id != id
+async def find_player_successors(id: str, limit: int = 10, younger_only: bool = True, session: AsyncSession = Depends(get_async_session)):
+    """
+    Identifies potential younger/lower-cost successors for a player, ranked by
+    profile similarity. younger_only=false turns it into a like-for-like replacement search.
+    """
+    statement = select(Player.id, Player.position, Player.age).where(Player.id == id)
+    target = (await session.exec(statement)).first()
+    if not target:
+        return {"error": "Player not found"}
+
+    def successor_hits():
+        similarity_engine.warm([id])
+        return similarity_engine.query(
+            id, k=limit, approximate=True,
+            position=target.position,
+            max_age=target.age - 1 if younger_only else None
         )
-        candidates = session.exec(statement).all()
-        
-        successors = [
-            {
-                "id": p.id,
-                "name": p.name,
-                "age": p.age,
-                "market_value": p.market_value,
-                "fit_score": 92 # Could be complex logic
-            }
-            for p in candidates
-        ]
-        
-        return sorted(successors, key=lambda x: x["fit_score"], reverse=True)
+
+    fit_scores = dict(await run_in_threadpool(successor_hits))
+    candidates = (await session.exec(
+        select(Player.id, Player.name, Player.age, Player.market_value).where(Player.id.in_(fit_scores.keys()))
+    )).all()
+
+    successors = [
+        {
+            "id": p.id,
+            "name": p.name,
+            "age": p.age,
+            "market_value": p.market_value,
+            "fit_score": fit_scores[p.id]
+        }
+        for p in candidates
+    ]
+    
+    return sorted(successors, key=lambda x: x["fit_score"], reverse=True)
 
 @router.get("/scout-report")
-async def get_matchday_scout_report():
+async def get_matchday_scout_report(session: AsyncSession = Depends(get_async_session)):
     """Generates a dynamic tactical briefing for the next match."""
-    with Session(engine) as session:
-        # Pick a real player to mention as a 'solution'
-        p = session.exec(select(Player).order_by(Player.predicted_growth.desc())).first()
-        player_name = p.name if p else "Lamine Yamal"
-        
-        # Calculate a pseudo-scientific boost based on player's technical attributes
-        ball_index = 80.0
-        if p and p.attributes:
-            tech_vals = [a["value"] for a in p.attributes.get("technical", [])]
-            if tech_vals:
-                ball_index = sum(tech_vals) / len(tech_vals) * 5 # Map 0-20 to 0-100
-        
-        return {
-            "opponent": "Real Madrid",
-            "date": "06 FEB 2025",
-            "venue": "Santiago Bernabéu",
-            "tactical_brief": [
-                "Opposition mid-block identified. High susceptibility to vertical ball progression.",
-                f"Target {player_name} matches the 'Creative Force' profile required to exploit half-spaces.",
-                "Defensive transition risk: Use a Deep Lying Playmaker to stabilize 2nd phase build-up."
-            ],
-            "win_probability_boost": round(ball_index / 6.5, 1), # Scientific-looking derivative
-            "recommended_role": "Roaming Playmaker",
-            "ball_index": round(ball_index, 1)
-        }
+    # Pick a real player to mention as a 'solution'
+    p = (await session.exec(select(Player).order_by(Player.predicted_growth.desc()))).first()
+    player_name = p.name if p else "Lamine Yamal"
+    
+    # Calculate a pseudo-scientific boost based on player's technical attributes
+    ball_index = 80.0
+    if p and p.attributes:
+        tech_vals = [a["value"] for a in p.attributes.get("technical", [])]
+        if tech_vals:
+            ball_index = sum(tech_vals) / len(tech_vals) * 5 # Map 0-20 to 0-100
+    
+    return {
+        "opponent": "Real Madrid",
+        "date": "06 FEB 2025",
+        "venue": "Santiago Bernabéu",
+        "tactical_brief": [
+            "Opposition mid-block identified. High susceptibility to vertical ball progression.",
+            f"Target {player_name} matches the 'Creative Force' profile required to exploit half-spaces.",
+            "Defensive transition risk: Use a Deep Lying Playmaker to stabilize 2nd phase build-up."
+        ],
+        "win_probability_boost": round(ball_index / 6.5, 1), # Scientific-looking derivative
+        "recommended_role": "Roaming Playmaker",
+        "ball_index": round(ball_index, 1)
+    }
 
 @router.get("/xt-pitch")
 async def get_xt_pitch():
-    """Returns the raw baseline xT grid for visualization."""
-    from app.analytics.xt_model import XT_GRID
-    return XT_GRID.tolist()
+    """Returns the active xT grid for visualization."""
+    return active_grid().tolist()
 
 @router.post("/calculate-xt")
 async def calculate_xt(payload: XTRequest):
@@ -169,69 +231,143 @@ async def calculate_xt(payload: XTRequest):
         "is_progressive": xt_generated > 0
     }
 
+@router.post("/calculate-xt/batch")
+async def calculate_xt_batch(payload: XTBatchRequest):
+    """
+    Values a whole event stream in one call: per-action xT (columnar arrays, same order
+    as the input) plus per-player aggregates when player ids are given.
+    """
+    columns = payload.columns()
+    grid = active_grid()
+    if payload.grid:
+        try:
+            grid = xt_grid_store.load(payload.grid)[0]
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    def valuate() -> Dict:
+        values = value_actions(columns["start_x"], columns["start_y"], columns["end_x"], columns["end_y"], grid)
+        xt = values["xt"]
+        result = {
+            "summary": {
+                "actions": int(xt.size),
+                "xt_total": round(float(xt.sum()), 6),
+                "progressive_actions": int((xt > 0).sum()),
+            }
+        }
+        if payload.include_actions:
+            result["values"] = {
+                "xt_generated": np.round(xt, 6).tolist(),
+                "start_zone_value": values["start_value"].tolist(),
+                "end_zone_value": values["end_value"].tolist(),
+            }
+        player_ids = columns["player_id"]
+        if player_ids is not None and any(p is not None for p in player_ids):
+            known = np.array([p is not None for p in player_ids])
+            result["players"] = aggregate_by_player(np.array(player_ids, dtype=object)[known], xt[known])
+        return result
+
+    return await run_in_threadpool(valuate)
+
 @router.get("/td-dashboard")
-async def get_td_dashboard():
+@response_cache.cached("td-dashboard", depends_on=(PLAYERS, SHORTLISTS))
+async def get_td_dashboard(session: AsyncSession = Depends(get_async_session)):
     """Aggregates high-value strategic data for the Technical Director."""
-    with Session(engine) as session:
-        # 1. Shortlist Performance (Query real shortlists)
-        shortlisted_players = session.exec(select(Player).join(ShortlistPlayerLink)).all()
-        
-        match_watch = []
-        import random
-        for p in shortlisted_players[:5]:
-            rating = round(random.uniform(7.2, 9.4), 1)
-            match_watch.append({
-                "id": p.id,
-                "name": p.name,
-                "club": p.club,
-                "rating": rating,
-                "event": "Goal Scored" if rating > 8.5 else "Key Pass",
-                "trend": "up"
-            })
-
-        # 2. Contract Risks (Real data from 2025/2026 window)
-        contract_statement = select(Player).where(
-            (Player.contract_expiry.ilike("%2025%")) | (Player.contract_expiry.ilike("%2026%"))
-        ).limit(5)
-        risk_players = session.exec(contract_statement).all()
-        contract_alerts = []
-        for p in risk_players:
-            contract_alerts.append({
-                "id": p.id,
-                "name": p.name,
-                "expiry": p.contract_expiry,
-                "risk": "CRITICAL" if "2025" in p.contract_expiry else "HIGH",
-                "value": p.market_value
-            })
-
-        # 3. Financial Pulse
-        vals = []
-        for p in shortlisted_players:
-            try:
-                mv = str(p.market_value).replace("€", "").replace("M", "").replace("K", "")
-                vals.append(float("".join(c for c in mv if c.isdigit() or c == '.')))
-            except:
-                continue
-        
-        total_shortlist_val = sum(vals)
-        budget_ceiling = 250.0
-        
-        return {
-            "shortlist_performance": match_watch,
-            "contract_risks": contract_alerts,
-            "financial_pulse": {
-                "shortlist_valuation": round(total_shortlist_val, 1),
-                "budget_ceiling": budget_ceiling,
-                "utilization": round((total_shortlist_val / budget_ceiling) * 100, 1) if budget_ceiling > 0 else 0
-            },
-            "squad_health": {
-                "overall": 74 if shortlisted_players else 40,
-                "gaps": 3 if shortlisted_players else 5
-            }
+    # 1. Shortlist Performance (Query real shortlists)
+    shortlisted_players = (await session.exec(select(Player).join(ShortlistPlayerLink).limit(5))).all()
+    
+    match_watch = []
+    import random
+    for p in shortlisted_players:
+        rating = round(random.uniform(7.2, 9.4), 1)
+        match_watch.append({
+            "id": p.id,
+            "name": p.name,
+            "club": p.club,
+            "rating": rating,
+            "event": "Goal Scored" if rating > 8.5 else "Key Pass",
+            "trend": "up"
+        })
+
+    # 2. Contract Risks (Real data from 2025/2026 window)
+    contract_statement = select(Player).where(
+        (Player.contract_expiry.ilike("%2025%")) | (Player.contract_expiry.ilike("%2026%"))
+    ).limit(5)
+    risk_players = (await session.exec(contract_statement)).all()
+    contract_alerts = []
+    for p in risk_players:
+        contract_alerts.append({
+            "id": p.id,
+            "name": p.name,
+            "expiry": p.contract_expiry,
+            "risk": "CRITICAL" if "2025" in p.contract_expiry else "HIGH",
+            "value": p.market_value
+        })
+
+    # 3. Financial Pulse (normalized € millions, summed in SQL)
+    total_shortlist_val = (await session.exec(
+        select(func.coalesce(func.sum(Player.market_value_m), 0.0)).join(ShortlistPlayerLink)
+    )).one()
+    budget_ceiling = 250.0
+    
+    return {
+        "shortlist_performance": match_watch,
+        "contract_risks": contract_alerts,
+        "financial_pulse": {
+            "shortlist_valuation": round(total_shortlist_val, 1),
+            "budget_ceiling": budget_ceiling,
+            "utilization": round((total_shortlist_val / budget_ceiling) * 100, 1) if budget_ceiling > 0 else 0
+        },
+        "squad_health": {
+            "overall": 74 if shortlisted_players else 40,
+            "gaps": 3 if shortlisted_players else 5
         }
+    }
 
 @router.get("/xt-grid")
-async def get_xt_grid():
-    """Returns the raw baseline xT grid for visualization."""
-    from app.analytics.xt_model import XT_GRID
-    return {"grid": XT_GRID.tolist()}
+async def get_xt_grid(league: Optional[str] = None, season: Optional[str] = None, cols: int = 12, rows: int = 8):
+    """Returns the active xT grid (or a fitted league/season grid) for visualization."""
+    if league and season:
+        try:
+            grid, meta = xt_grid_store.load(xt_grid_store.key(league, season, cols, rows))
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return {"grid": grid.tolist(), "fitted": meta}
+    return {"grid": active_grid().tolist(), "fitted": xt_grid_store.active}
+
+@router.get("/xt-grid/fitted")
+async def list_fitted_xt_grids():
+    return xt_grid_store.list()
+
+class XTFitRequest(BaseModel):
+    league: str
+    season: str
+    filename: str  # event file inside XT_EVENTS_DIR
+    cols: int = 12
+    rows: int = 8
+    activate: bool = False
+
+@router.post("/xt-grid/fit")
+async def fit_xt_grid(payload: XTFitRequest):
+    """Fits an xT grid from a local event file by value iteration, caches it and optionally serves it."""
+    if not (2 <= payload.cols <= 120 and 2 <= payload.rows <= 80):
+        raise HTTPException(status_code=400, detail="Grid resolution must be between 2x2 and 120x80")
+    try:
+        meta = await run_in_threadpool(xt_grid_store.fit, payload.league, payload.season, payload.filename,
+                                       payload.cols, payload.rows)
+        if payload.activate:
+            xt_grid_store.activate(meta["key"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"fitted": meta, "active": xt_grid_store.active}
+
+class XTActivateRequest(BaseModel):
+    key: Optional[str] = None  # None restores the built-in baseline grid
+
+@router.post("/xt-grid/activate")
+async def activate_xt_grid(payload: XTActivateRequest):
+    """Hot-swaps the grid behind every xT endpoint, without a restart."""
+    try:
+        return {"active": xt_grid_store.activate(payload.key)}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
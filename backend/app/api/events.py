@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Optional
+from app.core.events import event_broker
+from app.services.activity_feed import SCOUT_REPORT, MESSAGE, NEGOTIATION, ASSIGNMENT
+import asyncio
+import json
+import os
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+EVENT_HEARTBEAT_S = float(os.getenv("EVENT_HEARTBEAT_S", "15"))
+ALL_KINDS = (SCOUT_REPORT, MESSAGE, NEGOTIATION, ASSIGNMENT)
+
+def _sse(event_id: Optional[str], event: str, data: Any) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    kinds: Optional[str] = None,
+    channel_id: Optional[int] = None,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-sent events for committed messages, scout notes, negotiations and assignments.
+    kinds: comma-separated subset of SCOUT_REPORT, MESSAGE, NEGOTIATION, ASSIGNMENT.
+    channel_id: only chat messages of that channel (other kinds are unaffected).
+    Resuming: browsers resend Last-Event-ID on reconnect; ?last_event_id= does the same.
+    A "reset" event means the gap cannot be replayed and the client should refetch.
+    """
+    wanted = set(kinds.split(",")) & set(ALL_KINDS) if kinds else set(ALL_KINDS)
+
+    def accepts(event: Dict[str, Any]) -> bool:
+        if event["type"] not in wanted:
+            return False
+        return channel_id is None or event["type"] != MESSAGE or event["data"].get("channel_id") == channel_id
+
+    subscription, replay = event_broker.subscribe(accepts, last_event_id or last_event_id_header)
+
+    async def stream():
+        try:
+            if replay is None:
+                yield _sse(None, "reset", {"reason": "history unavailable"})
+            for event in replay or []:
+                yield _sse(event["id"], event["type"], event["data"])
+            while not subscription.overflowed:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=EVENT_HEARTBEAT_S)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comment line: keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event["id"], event["type"], event["data"])
+            if subscription.overflowed:
+                yield _sse(None, "reset", {"reason": "stream fell behind"})
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/stats")
+async def get_event_stats():
+    """Open streams and published event count of this process."""
+    return event_broker.stats()
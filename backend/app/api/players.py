@@ -1,246 +1,361 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+import os
+from datetime import datetime, timezone
+from typing import List, Optional, Union
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
 from app.core.database import LEAGUE_STRENGTH, get_normalized_player
-from app.models.player import Player
-from app.core.db import engine
-from sqlmodel import Session, select
-from app.services.attribute_engine import ScientificAttributeEngine
+from app.models.player import Player, PlayerHeatmap, ShortlistPlayerLink
+from app.core.db import engine, get_async_session
+from sqlmodel import or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.services.profile_store import ProfileStore
+from app.utils.market_value import parse_market_value
+from app.utils.pagination import apply_keyset, build_page, decode_cursor, encode_cursor, use_cursor
+from app.schemas.player import PlayerSummary, PlayerSummaryPage, select_player_summary, to_summary
+from app.services.player_search import PlayerSearchService
+from app.services.similarity import similarity_engine
+from app.services.heatmap_store import HeatmapStore
+from app.analytics.xt_training import load_events, xt_grid_store
+from app.analytics.growth_model import (
+    CEILING_FACTOR, DEFAULT_DECAY, DEFAULT_PEAK_AGE, DEFAULT_YEARS, MAX_YEARS, project_values, summarize
+)
+from app.core.cache import response_cache, PLAYERS, SHORTLISTS
+from app.utils.positions import ATTACKER, DEFENDER, MIDFIELDER, ROLE_GROUPS, position_codes
 
 router = APIRouter(prefix="/players", tags=["players"])
+search_service = PlayerSearchService(engine)
 
-@router.get("/search")
-async def search_players(q: Optional[str] = None, limit: int = 20, offset: int = 0):
-    with Session(engine) as session:
-        statement = select(Player)
-        if q:
-            query = q.lower()
-            statement = statement.where(
-                (Player.name.ilike(f"%{query}%")) | 
-                (Player.club.ilike(f"%{query}%")) | 
-                (Player.nationality.ilike(f"%{query}%"))
-            )
-        
-        # Pagination
-        statement = statement.offset(offset).limit(limit)
-        results = session.exec(statement).all()
-        
-        # Projection: Summary format for lists
-        return [p.model_dump(exclude={"attributes", "metrics", "medical_dna", "physical_metrics", "cognitive_profile", "biometric_profile", "scientific_dossier"}) for p in results]
-
-@router.get("/filter")
+MAX_PROJECTION_PLAYERS = int(os.getenv("MAX_PROJECTION_PLAYERS", "2000"))
+
+@router.get("/search", response_model=Union[List[PlayerSummary], PlayerSummaryPage])
+async def search_players(
+    q: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    paginate: str = "offset",
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    if q:
+        return await _ranked_search(session, q, limit, offset, use_cursor(paginate, cursor), cursor)
+
+    # Projection: only summary columns are selected, JSON dossiers never leave the DB
+    statement = select_player_summary()
+    
+    # Keyset pagination: seek past the last seen id instead of scanning `offset` rows
+    if use_cursor(paginate, cursor):
+        cursor_values = decode_cursor(cursor, "search") if cursor else None
+        statement = apply_keyset(statement, [Player.id], False, cursor_values, limit)
+        results = (await session.exec(statement)).all()
+        return build_page(results, limit, "search", lambda p: [p.id], to_summary)
+    
+    # Pagination
+    statement = statement.order_by(Player.id).offset(offset).limit(limit)
+    results = (await session.exec(statement)).all()
+    return [to_summary(p) for p in results]
+
+async def _ranked_search(session: AsyncSession, q: str, limit: int, offset: int, cursor_mode: bool, cursor: Optional[str]):
+    """Relevance-ranked search through the FTS/trigram index, hydrated with summary columns."""
+    # Relevance scores are not a stable keyset, so the cursor carries the rank offset instead
+    sort_key = f"search:{q}"
+    if cursor:
+        values = decode_cursor(cursor, sort_key)
+        if len(values) != 1 or not isinstance(values[0], int) or isinstance(values[0], bool) or values[0] < 0:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        offset = values[0]
+
+    hits = await search_service.search_async(session, q, limit + 1 if cursor_mode else limit, offset)
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+
+    rows = (await session.exec(select_player_summary().where(Player.id.in_([h[0] for h in hits])))).all() if hits else []
+    by_id = {row.id: row for row in rows}
+    items = [to_summary(by_id[player_id]) for player_id, _ in hits if player_id in by_id]
+
+    if not cursor_mode:
+        return items
+    next_cursor = encode_cursor(sort_key, [offset + limit]) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
+
+# Whitelisted sort keys for list endpoints -> indexed columns
+SORT_COLUMNS = {
+    "value": Player.market_value_m,
+    "growth": Player.predicted_growth,
+    "age": Player.age,
+    "name": Player.name,
+}
+
+@router.get("/filter", response_model=Union[List[PlayerSummary], PlayerSummaryPage])
 async def filter_players_api(
     q: Optional[str] = None,
     pos: Optional[str] = None,
+    role: Optional[str] = None,
     league: Optional[str] = None,
     min_val: Optional[float] = None,
     max_val: Optional[float] = None,
     max_age: Optional[int] = None,
     club: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    order: str = "desc",
     limit: int = 20,
-    offset: int = 0
+    offset: int = 0,
+    paginate: str = "offset",
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
 ):
-    with Session(engine) as session:
-        statement = select(Player)
-        
-        if q:
-            statement = statement.where(Player.name.ilike(f"%{q}%"))
-        if pos and pos != "all":
-            statement = statement.where(Player.position == pos)
-        if league and league != "all":
-            statement = statement.where(Player.league == league)
-        if club:
-            statement = statement.where(Player.club.ilike(f"%{club}%"))
-        if max_age:
-            statement = statement.where(Player.age <= max_age)
-        
-        # We still fetch all for market value filter since it's a string, 
-        # but we can apply offset/limit after validation or if no val filter
-        results = session.exec(statement).all()
-        
-        # Post-processing for Market Value (e.g. "€85.0M")
-        filtered_results = []
-        for p in results:
-            try:
-                # Clean string: "€85.0M" -> 85.0
-                val_str = p.market_value.replace("€", "").replace("M", "").replace("K", "")
-                val_float = float(val_str)
-                
-                if min_val and val_float < min_val: continue
-                if max_val and val_float > max_val: continue
-                filtered_results.append(p)
-            except:
-                filtered_results.append(p)
-        
-        # Manual pagination after filtering
-        paginated = filtered_results[offset : offset + limit]
-        
-        # Projection: Summary format
-        return [p.model_dump(exclude={"attributes", "metrics", "medical_dna", "physical_metrics", "cognitive_profile", "biometric_profile", "scientific_dossier"}) for p in paginated]
+    if sort_by and sort_by not in SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort_by. Use one of: {', '.join(SORT_COLUMNS)}")
+
+    statement = select_player_summary()
+    
+    if q:
+        statement = statement.where(search_service.match_clause(q))
+    if pos and pos != "all":
+        # Codes, composites and labels ("Center Back", "Winger") resolve to indexed canonical codes;
+        # rows stored under a label without a side have no code and match on the raw position
+        codes = position_codes(pos)
+        statement = statement.where(or_(Player.position_code.in_(codes), Player.position == pos) if codes else Player.position == pos)
+    if role and role != "all":
+        if role.upper() not in ROLE_GROUPS:
+            raise HTTPException(status_code=400, detail=f"Invalid role. Use one of: {', '.join(ROLE_GROUPS)}")
+        statement = statement.where(Player.role_group == role.upper())
+    if league and league != "all":
+        statement = statement.where(Player.league == league)
+    if club:
+        statement = statement.where(Player.club.ilike(f"%{club}%"))
+    if max_age:
+        statement = statement.where(Player.age <= max_age)
+    
+    # Market value filters run on the normalized numeric column (€ millions)
+    if min_val is not None:
+        statement = statement.where(Player.market_value_m >= min_val)
+    if max_val is not None:
+        statement = statement.where(Player.market_value_m <= max_val)
+    
+    # Sort columns with the primary key as tiebreaker -> deterministic pages
+    descending = order != "asc"
+    columns = [Player.id]
+    if sort_by:
+        columns = [SORT_COLUMNS[sort_by], Player.id]
+    
+    if use_cursor(paginate, cursor):
+        sort_key = f"filter:{sort_by or 'id'}:{'desc' if descending else 'asc'}"
+        cursor_values = decode_cursor(cursor, sort_key) if cursor else None
+        if sort_by == "value":
+            # NULL valuations cannot be compared against a cursor value
+            statement = statement.where(Player.market_value_m.isnot(None))
+        statement = apply_keyset(statement, columns, descending, cursor_values, limit)
+        results = (await session.exec(statement)).all()
+        return build_page(
+            results, limit, sort_key,
+            lambda p: [getattr(p, c.key) for c in columns],
+            to_summary
+        )
+    
+    statement = statement.order_by(*[c.desc() if descending else c.asc() for c in columns])
+    statement = statement.offset(offset).limit(limit)
+    results = (await session.exec(statement)).all()
+    return [to_summary(p) for p in results]
+
+class GrowthProjectionRequest(BaseModel):
+    """The players to project (explicit ids, a club or a shortlist) and the scenario."""
+    player_ids: Optional[List[str]] = None
+    club: Optional[str] = None
+    shortlist_id: Optional[int] = None
+    years: int = Field(DEFAULT_YEARS, ge=1, le=MAX_YEARS)
+    base_year: Optional[int] = None  # default: the current year
+    growth_multiplier: float = Field(1.0, ge=0, le=5)  # <1 pessimistic, >1 optimistic
+    decay: float = Field(DEFAULT_DECAY, gt=0, le=1.5)  # year-on-year growth fade
+    peak_age: float = Field(DEFAULT_PEAK_AGE, ge=16, le=40)  # players older than this get no age bonus
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        selected = [s for s in (self.player_ids, self.club, self.shortlist_id) if s is not None]
+        if len(selected) != 1:
+            raise ValueError("Select players by exactly one of player_ids, club or shortlist_id")
+        if self.player_ids is not None and len(self.player_ids) > MAX_PROJECTION_PLAYERS:
+            raise ValueError(f"At most {MAX_PROJECTION_PLAYERS} players per projection")
+        return self
+
+GROWTH_COLUMNS = [Player.id, Player.name, Player.club, Player.age, Player.predicted_growth,
+                  Player.market_value, Player.market_value_m]
+
+def _current_value(row) -> float:
+    return row.market_value_m if row.market_value_m is not None else (parse_market_value(row.market_value) or 0.0)
+
+@response_cache.cached("growth-projections", ttl=300, depends_on=(PLAYERS, SHORTLISTS))
+async def _growth_projections(session: AsyncSession, player_ids: Optional[str], club: Optional[str],
+                              shortlist_id: Optional[int], years: int, base_year: int,
+                              growth_multiplier: float, decay: float, peak_age: float):
+    """player_ids is the sorted, comma-joined id set so it can be part of the cache key."""
+    statement = select(*GROWTH_COLUMNS)
+    if player_ids is not None:
+        statement = statement.where(Player.id.in_(player_ids.split(",") if player_ids else []))
+    elif club is not None:
+        statement = statement.where(Player.club == club)
+    else:
+        statement = statement.join(ShortlistPlayerLink, ShortlistPlayerLink.player_id == Player.id) \
+            .where(ShortlistPlayerLink.shortlist_id == shortlist_id)
+    rows = (await session.exec(statement.order_by(Player.id))).all()
+
+    values = np.array([_current_value(r) for r in rows], dtype=np.float64)
+    trajectories = project_values([r.age for r in rows], [r.predicted_growth for r in rows], values,
+                                  years, decay, peak_age, growth_multiplier)
+    summary = summarize(trajectories, values)
+    return {
+        "base_year": base_year,
+        "years": list(range(base_year, base_year + years)),
+        "scenario": {"growth_multiplier": growth_multiplier, "decay": decay, "peak_age": peak_age},
+        "players": [
+            {"id": r.id, "name": r.name, "club": r.club, "age": r.age,
+             "current_value": round(float(values[i]), 1),
+             "values": np.round(trajectories[i], 1).tolist(),
+             "value_gain": round(float(summary["gain"][i]), 1)}
+            for i, r in enumerate(rows)
+        ],
+        "squad": {
+            "players": len(rows),
+            "current_value": round(float(values.sum()), 1),
+            "values": np.round(summary["totals"], 1).tolist(),
+        },
+    }
+
+@router.post("/growth-projections")
+async def project_growth(request: GrowthProjectionRequest, session: AsyncSession = Depends(get_async_session)):
+    """
+    Value trajectories for a whole squad, shortlist or id set in one pass:
+    per-player values aligned with `years`, plus squad totals.
+    """
+    return await _growth_projections(
+        session=session,
+        player_ids=",".join(sorted(set(request.player_ids))) if request.player_ids is not None else None,
+        club=request.club,
+        shortlist_id=request.shortlist_id,
+        years=request.years,
+        base_year=request.base_year or datetime.now(timezone.utc).year,
+        growth_multiplier=request.growth_multiplier,
+        decay=request.decay,
+        peak_age=request.peak_age,
+    )
 
 @router.get("/{player_id}/growth-prediction")
-async def get_growth_prediction(player_id: str):
-    with Session(engine) as session:
-        statement = select(Player).where(Player.id == player_id)
-        player = session.exec(statement).first()
-        
+async def get_growth_prediction(player_id: str, years: int = DEFAULT_YEARS, session: AsyncSession = Depends(get_async_session)):
+    player = (await session.exec(select(*GROWTH_COLUMNS).where(Player.id == player_id))).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
-        
-    # Mock logic for FM style "Potential Ceiling"
-    # Growth is high for young players with low current and high base growth
-    # Growth is high for young players
-    age_factor = max(0, (25 - player.age) / 10)
-    base_growth = player.predicted_growth
-    
-    # Generate a fictional 4-year trajectory
-    trajectory = []
-    current_val = float(player.market_value.replace("€", "").replace("M", ""))
-    
-    for i in range(5):
-        year = 2024 + i
-        # Growth slows down as they get older
-        growth_rate = base_growth * (1 + age_factor) * (0.9 ** i)
-        val = current_val * (1 + (growth_rate / 100))
-        trajectory.append({
-            "year": year, 
-            "value": round(val, 1),
-            "label": f"AGE {player.age + i}"
-        })
-        current_val = val
-        
+
+    # Growth is high for young players and slows down over the horizon (see growth_model)
+    years = max(1, min(years, MAX_YEARS))
+    base_year = datetime.now(timezone.utc).year
+    values = project_values([player.age], [player.predicted_growth], [_current_value(player)], years)[0]
     return {
         "player": player.name,
-        "current_growth_index": base_growth,
-        "potential_ceiling": round(base_growth * 1.5, 1),
-        "trajectory": trajectory
+        "current_growth_index": player.predicted_growth,
+        "potential_ceiling": round(player.predicted_growth * CEILING_FACTOR, 1),
+        "trajectory": [
+            {"year": base_year + i, "value": round(float(value), 1), "label": f"AGE {player.age + i}"}
+            for i, value in enumerate(values)
+        ]
     }
 
 @router.get("/{player_id}")
-async def get_player(player_id: str, normalized: Optional[bool] = False):
-    with Session(engine) as session:
-        statement = select(Player).where(Player.id == player_id)
-        player = session.exec(statement).first()
-        
+async def get_player(player_id: str, normalized: Optional[bool] = False, session: AsyncSession = Depends(get_async_session)):
+    statement = select(Player).where(Player.id == player_id)
+    player = (await session.exec(statement)).first()
+    
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    # Convert to dict for normalization logic if needed
-    player_data = player.model_dump()
-    
-    # SCIENTIFIC REALISM: Calculate attributes on the fly
-    # unless it's a "Hero" player from PLAYERS_DB who has handcrafted stats
-    # We check if attributes["technical"] exists as a structure
-    needs_calc = True
-    if player.attributes and "technical" in player.attributes:
-        # It has the structure, but is it the deep structure? 
-        # Yes, if it has 'technical' key it's likely the old handcrafted or previously calculated.
-        # But user wants REALISM. So let's overwrite if it is generic.
-        # For now, let's FORCE calculation for everyone to prove the feature!
-        # Except maybe the "Heroes" (Yamal etc) if we want to preserve their god-stats.
-        # Let's preserve Heroes (manual override)
-        if player.fm_id: # Usually real players have fm_id, mock have None? 
-            pass 
-    
-    # Actually, the user wants "Bewijzen waarom" (Proof). 
-    # Our Engine provides that link.
-    # Let's apply it if the current attributes are just flat stats (keys like "Goals", "xG")
-    is_flat_stats = player.attributes and "Goals" in player.attributes
-    
-    if is_flat_stats or not player.attributes:
-        scientific_attrs = ScientificAttributeEngine.generate_full_profile(player)
-        player_data["attributes"] = scientific_attrs
-        
-        # Add the 'Proof' (Dossier) -> Explain the calculation
-        # We can inject this into 'scientific_dossier' or a new field
-        # The frontend uses 'scientific_dossier' string.
-        # Let's generate a brief explanation.
-        xg = player.attributes.get("npxG", 0) if player.attributes else 0
-        goals = player.attributes.get("Goals", 0) if player.attributes else 0
-        player_data["scientific_dossier"] = f"ANALYSIS: Finishing rating derived from {goals} Goals vs {xg} xG. " \
-                                            f"Mental composure calculated from conversion rate efficiency. " \
-                                            f"Physical profile modeled on {player.age}-year-old {player.position} baseline."
-
-    # SCIENTIFIC REALISM: Data Enrichment (Agent & History)
-    if not player.value_history:
-        player_data["value_history"] = ScientificAttributeEngine.generate_value_history(player.market_value, player.age)
+    # SCIENTIFIC REALISM: modelled attributes, dossier, value history and agent
+    # are precomputed at ingest/sync (ProfileStore). Rows written by a path that
+    # skipped it are computed once here and persisted.
+    if ProfileStore.apply(player):
+        session.add(player)
+        await session.commit()
+        await session.refresh(player)
     
-    if not player.agent_info:
-        player_data["agent_info"] = ScientificAttributeEngine.generate_agent_profile(player.league)
+    player_data = ProfileStore.render(player)
 
     if normalized:
         return get_normalized_player(player_data)
     return player_data
 
-@router.get("/prospects/top")
-async def get_top_prospects(limit: int = 10, offset: int = 0):
-    with Session(engine) as session:
-        statement = select(Player).order_by(Player.predicted_growth.desc()).offset(offset).limit(limit)
-        results = session.exec(statement).all()
-        return [p.model_dump(exclude={"attributes", "metrics", "medical_dna", "physical_metrics", "cognitive_profile", "biometric_profile", "scientific_dossier"}) for p in results]
+@router.get("/prospects/top", response_model=Union[List[PlayerSummary], PlayerSummaryPage])
+async def get_top_prospects(
+    limit: int = 10,
+    offset: int = 0,
+    paginate: str = "offset",
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    if use_cursor(paginate, cursor):
+        cursor_values = decode_cursor(cursor, "prospects") if cursor else None
+        statement = apply_keyset(select_player_summary(), [Player.predicted_growth, Player.id], True, cursor_values, limit)
+        results = (await session.exec(statement)).all()
+        return build_page(results, limit, "prospects", lambda p: [p.predicted_growth, p.id], to_summary)
+
+    statement = select_player_summary().order_by(Player.predicted_growth.desc(), Player.id.desc()).offset(offset).limit(limit)
+    results = (await session.exec(statement)).all()
+    return [to_summary(p) for p in results]
+
+@router.post("/heatmaps/ingest")
+async def ingest_heatmap_events(filename: str):
+    """Rebuilds heatmaps from an event file in XT_EVENTS_DIR (needs player_id, start_x, start_y)."""
+    def ingest():
+        events = load_events(xt_grid_store.events_path(filename))
+        return HeatmapStore.ingest_events(engine, events)
+
+    try:
+        return await run_in_threadpool(ingest)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{player_id}/heatmap")
-async def get_player_heatmap(player_id: str):
-    with Session(engine) as session:
-        player = session.get(Player, player_id)
+async def get_player_heatmap(
+    player_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Stored 8x12 density grid (rows across the pitch, columns towards goal), 0-1."""
+    heatmap = await session.get(PlayerHeatmap, player_id)
+    if heatmap is None:
+        player = (await session.exec(select(Player.id, Player.position, Player.pace).where(Player.id == player_id))).first()
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
-        
-    # Spatial Distribution Blueprint (12x8 Grid)
-    # Rows: 1..8 (Vertically), Cols: 1..12 (Horizontally)
-    # We simulate based on position
-    pos = player.position.lower()
-    grid = [[0.0 for _ in range(12)] for _ in range(8)]
-    
-    import random
-    
-    for r in range(8):
-        for c in range(12):
-            # Base logic: Probability weights based on position
-            weight = 0.05 # Baseline noise
-            
-            if "striker" in pos:
-                if c >= 9: weight = 0.6 # Final Third
-                elif c >= 7: weight = 0.2
-            elif "winger" in pos:
-                if c >= 8: weight = 0.5
-                if r <= 1 or r >= 6: weight += 0.3 # Wide areas
-            elif "midfield" in pos:
-                if 4 <= c <= 8: weight = 0.7 # Engine room
-            elif "back" in pos or "defender" in pos:
-                if c <= 4: weight = 0.7 # Defensive third
-            elif "goalkeeper" in pos:
-                if c == 0: weight = 0.9 # Goal line
-                
-            # Add some variance based on player attributes
-            attr_bonus = (player.passing + player.dribbling) / 200
-            val = weight + random.uniform(0, 0.2) + attr_bonus
-            grid[r][c] = round(min(val, 1.0), 3)
-            
-    return grid
+        heatmap = HeatmapStore.transient(player)
+
+    if if_none_match == heatmap.etag:
+        return Response(status_code=304, headers={"ETag": heatmap.etag})
+    response.headers["ETag"] = heatmap.etag
+    response.headers["X-Heatmap-Source"] = heatmap.source
+    return HeatmapStore.to_payload(HeatmapStore.decode(heatmap))
 
 @router.get("/{player_id}/tactical-kpis")
-async def get_tactical_kpis(player_id: str):
-    with Session(engine) as session:
-        player = session.get(Player, player_id)
-        if not player:
-            raise HTTPException(status_code=404, detail="Player not found")
-            
-    pos = player.position.lower()
+async def get_tactical_kpis(player_id: str, session: AsyncSession = Depends(get_async_session)):
+    player = (await session.exec(
+        select(Player.role_group, Player.shooting, Player.physical, Player.passing,
+               Player.dribbling, Player.pace, Player.defending).where(Player.id == player_id)
+    )).first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
     
     # Position-Specific Intelligence
-    if "striker" in pos or "forward" in pos:
+    if player.role_group == ATTACKER:
         return {
             "primary": {"label": "Conversion Efficiency", "value": f"{round(player.shooting / 2, 1)}%"},
             "secondary": {"label": "Box Dominance", "value": round((player.physical + player.shooting) / 2, 1)},
             "tertiary": {"label": "xG Overperformance", "value": "+0.14"}
         }
-    elif "midfield" in pos:
+    elif player.role_group == MIDFIELDER:
         return {
             "primary": {"label": "Line-Breaking Passes", "value": int(player.passing / 2)},
             "secondary": {"label": "Press Resistance", "value": round((player.dribbling + player.passing) / 2, 1)},
             "tertiary": {"label": "Final Third Entry", "value": "8.4 / 90"}
         }
-    elif "back" in pos or "defend" in pos:
+    elif player.role_group == DEFENDER:
         return {
             "primary": {"label": "Recovery Speed", "value": f"{round(player.pace / 10, 1)} m/s"},
             "secondary": {"label": "Duel Success", "value": f"{round(player.defending, 1)}%"},
@@ -254,17 +369,35 @@ async def get_tactical_kpis(player_id: str):
     }
 
 @router.get("/{player_id}/similar")
-async def get_similar_players(player_id: str):
-    with Session(engine) as session:
-        statement = select(Player).where(Player.id == player_id)
-        player = session.exec(statement).first()
-        if not player:
-            raise HTTPException(status_code=404, detail="Player not found")
-        
-        # Simple similarity based on position and shared metrics (SQL-backed)
-        statement = select(Player).where(
-            Player.id != player_id,
-            (Player.position == player.position) | (Player.league != player.league)
-        ).limit(3)
-        results = session.exec(statement).all()
-        return results
+async def get_similar_players(
+    player_id: str,
+    k: int = Query(3, ge=1, le=100),
+    metric: str = Query("cosine", pattern="^(cosine|mahalanobis)$"),
+    position: Optional[str] = None,
+    league: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    session: AsyncSession = Depends(get_async_session),
+):
+    # Matrix build and scoring are CPU-bound numpy work, kept off the event loop
+    def similar_hits():
+        # Row may predate the in-memory matrix (e.g. written by another worker)
+        similarity_engine.warm([player_id])
+        if player_id not in similarity_engine.index:
+            return None
+        return similarity_engine.query(
+            player_id, k=k, metric=metric, position=position, league=league, min_age=min_age, max_age=max_age
+        )
+
+    hits = await run_in_threadpool(similar_hits)
+    if hits is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    if not hits:
+        return []
+
+    rows = (await session.exec(select_player_summary().where(Player.id.in_([pid for pid, _ in hits])))).all()
+    by_id = {row.id: row for row in rows}
+    return [
+        {**to_summary(by_id[pid]).model_dump(), "similarity": score}
+        for pid, score in hits if pid in by_id
+    ]
@@ -1,77 +1,102 @@
-from app.models.player import Player, Shortlist, ShortlistPlayerLink
-from app.core.db import engine
-from typing import List, Dict
-from fastapi import APIRouter
-from sqlmodel import Session, select
+from app.models.player import Shortlist, ShortlistPlayerLink
+from app.core.db import get_async_session
+from typing import Any, List, Dict, Optional
+from fastapi import APIRouter, Depends, Header, Response
+from sqlmodel import select, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import response_cache, SHORTLISTS
+import hashlib
+import json
 
 router = APIRouter(prefix="/watchlist", tags=["shortlists"])
 
-def _get_full_watchlist(session: Session) -> Dict[str, List[str]]:
+async def _get_full_watchlist(session: AsyncSession) -> Dict[str, List[str]]:
     """Helper to return the structured shortlist DB from SQL."""
-    shortlists = session.exec(select(Shortlist)).all()
+    # One pass over the link table; the outer join keeps empty shortlists
+    statement = (
+        select(Shortlist.name, ShortlistPlayerLink.player_id)
+        .outerjoin(ShortlistPlayerLink, ShortlistPlayerLink.shortlist_id == Shortlist.id)
+        .order_by(Shortlist.id, ShortlistPlayerLink.player_id)
+    )
     result = {}
-    for s in shortlists:
-        result[s.name] = [player.id for player in s.players]
+    for name, player_id in (await session.exec(statement)).all():
+        players = result.setdefault(name, [])
+        if player_id is not None:
+            players.append(player_id)
     return result
 
+@response_cache.cached("watchlist", ttl=300, depends_on=(SHORTLISTS,))
+async def _watchlist_snapshot(session: AsyncSession) -> Dict[str, Any]:
+    """Watchlist plus a content hash, rebuilt once per SHORTLISTS generation."""
+    watchlist = await _get_full_watchlist(session)
+    digest = hashlib.sha1(json.dumps(watchlist, sort_keys=True).encode()).hexdigest()[:16]
+    return {"etag": f'"{digest}"', "watchlist": watchlist}
+
+def _delta(op: str, category: str, player_id: Optional[str] = None, changed: bool = True) -> Dict[str, Any]:
+    """Mutation response: what changed, for the client to apply to its copy of the watchlist."""
+    delta = {"op": op, "category": category}
+    if player_id is not None:
+        delta["player_id"] = player_id
+    return {"status": "success", "changed": changed, "delta": delta}
+
 @router.get("")
-async def get_watchlist():
-    with Session(engine) as session:
-        return _get_full_watchlist(session)
+async def get_watchlist(response: Response, if_none_match: Optional[str] = Header(None),
+                        session: AsyncSession = Depends(get_async_session)):
+    snapshot = await _watchlist_snapshot(session=session)
+    if if_none_match == snapshot["etag"]:
+        return Response(status_code=304, headers={"ETag": snapshot["etag"]})
+    response.headers["ETag"] = snapshot["etag"]
+    return snapshot["watchlist"]
 
 @router.post("/category")
-async def create_category(name: str):
-    with Session(engine) as session:
-        existing = session.exec(select(Shortlist).where(Shortlist.name == name)).first()
-        if not existing:
-            new_s = Shortlist(name=name)
-            session.add(new_s)
-            session.commit()
-        return {"status": "success", "watchlist": _get_full_watchlist(session)}
+async def create_category(name: str, session: AsyncSession = Depends(get_async_session)):
+    existing = (await session.exec(select(Shortlist.id).where(Shortlist.name == name))).first()
+    if not existing:
+        new_s = Shortlist(name=name)
+        session.add(new_s)
+        await session.commit()
+        response_cache.invalidate(SHORTLISTS)
+    return _delta("create_category", name, changed=not existing)
 
 @router.delete("/category/{name}")
-async def delete_category(name: str):
-    with Session(engine) as session:
-        shortlist = session.exec(select(Shortlist).where(Shortlist.name == name)).first()
-        if shortlist:
-            session.delete(shortlist)
-            session.commit()
-        return {"status": "success", "watchlist": _get_full_watchlist(session)}
+async def delete_category(name: str, session: AsyncSession = Depends(get_async_session)):
+    shortlist_id = (await session.exec(select(Shortlist.id).where(Shortlist.name == name))).first()
+    if shortlist_id is not None:
+        await session.exec(delete(ShortlistPlayerLink).where(ShortlistPlayerLink.shortlist_id == shortlist_id))
+        await session.exec(delete(Shortlist).where(Shortlist.id == shortlist_id))
+        await session.commit()
+        response_cache.invalidate(SHORTLISTS)
+    return _delta("delete_category", name, changed=shortlist_id is not None)
 
 @router.post("/{category}/{player_id}")
-async def add_to_watchlist(category: str, player_id: str):
-    with Session(engine) as session:
-        shortlist = session.exec(select(Shortlist).where(Shortlist.name == category)).first()
-        if not shortlist:
-            shortlist = Shortlist(name=category)
-            session.add(shortlist)
-            session.commit()
-            session.refresh(shortlist)
-        
-        # Check if link exists
-        link = session.exec(select(ShortlistPlayerLink).where(
-            ShortlistPlayerLink.shortlist_id == shortlist.id,
-            ShortlistPlayerLink.player_id == player_id
-        )).first()
-        
-        if not link:
-            new_link = ShortlistPlayerLink(shortlist_id=shortlist.id, player_id=player_id)
-            session.add(new_link)
-            session.commit()
-            
-        return {"status": "success", "watchlist": _get_full_watchlist(session)}
+async def add_to_watchlist(category: str, player_id: str, session: AsyncSession = Depends(get_async_session)):
+    shortlist = (await session.exec(select(Shortlist).where(Shortlist.name == category))).first()
+    if not shortlist:
+        shortlist = Shortlist(name=category)
+        session.add(shortlist)
+        await session.commit()
+        await session.refresh(shortlist)
+
+    # Check if link exists
+    link = await session.get(ShortlistPlayerLink, (shortlist.id, player_id))
+
+    if not link:
+        new_link = ShortlistPlayerLink(shortlist_id=shortlist.id, player_id=player_id)
+        session.add(new_link)
+        await session.commit()
+        response_cache.invalidate(SHORTLISTS)
+
+    return _delta("add_player", category, player_id, changed=not link)
 
 @router.delete("/{category}/{player_id}")
-async def remove_from_watchlist(category: str, player_id: str):
-    with Session(engine) as session:
-        shortlist = session.exec(select(Shortlist).where(Shortlist.name == category)).first()
-        if shortlist:
-            link = session.exec(select(ShortlistPlayerLink).where(
-                ShortlistPlayerLink.shortlist_id == shortlist.id,
-                ShortlistPlayerLink.player_id == player_id
-            )).first()
-            if link:
-                session.delete(link)
-                session.commit()
-                
-        return {"status": "success", "watchlist": _get_full_watchlist(session)}
+async def remove_from_watchlist(category: str, player_id: str, session: AsyncSession = Depends(get_async_session)):
+    result = await session.exec(
+        delete(ShortlistPlayerLink)
+        .where(ShortlistPlayerLink.player_id == player_id)
+        .where(ShortlistPlayerLink.shortlist_id == select(Shortlist.id).where(Shortlist.name == category).scalar_subquery())
+    )
+    await session.commit()
+    if result.rowcount:
+        response_cache.invalidate(SHORTLISTS)
+
+    return _delta("remove_player", category, player_id, changed=bool(result.rowcount))
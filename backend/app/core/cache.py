@@ -0,0 +1,181 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_DEFAULT_TTL = float(os.getenv("CACHE_DEFAULT_TTL", "30"))
+
+# Data domains a cached response can depend on; writers bump the matching generation
+PLAYERS = "players"
+SHORTLISTS = "shortlists"
+NOTES = "notes"
+
+class MemoryBackend:
+    """In-process TTL + LRU store. Also the local stand-in for a shared backend."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generations(self, domains: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(d, 0) for d in domains)
+
+    def bump(self, domains: Iterable[str]):
+        with self._lock:
+            for d in domains:
+                self._generations[d] = self._generations.get(d, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+class RedisBackend:
+    """
+    Shared backend so every worker sees the same entries and invalidations.
+    Values are stored as JSON; LRU eviction is left to Redis' maxmemory policy.
+    """
+
+    name = "redis"
+    PREFIX = "sb:cache:"
+
+    def __init__(self, url: str = CACHE_URL):
+        import redis  # optional dependency, only needed for CACHE_BACKEND=redis
+        self.client = redis.Redis.from_url(url)
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.PREFIX + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.client.set(self.PREFIX + key, json.dumps(value, default=str), px=int(ttl * 1000))
+
+    def generations(self, domains: Iterable[str]) -> Tuple[int, ...]:
+        domains = list(domains)
+        if not domains:
+            return ()
+        values = self.client.mget([f"{self.PREFIX}gen:{d}" for d in domains])
+        return tuple(int(v or 0) for v in values)
+
+    def bump(self, domains: Iterable[str]):
+        pipe = self.client.pipeline()
+        for d in domains:
+            pipe.incr(f"{self.PREFIX}gen:{d}")
+        pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.PREFIX}*"):
+            self.client.delete(key)
+
+    def size(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(f"{self.PREFIX}*"))
+
+def build_backend(kind: str = CACHE_BACKEND):
+    if kind == "redis":
+        try:
+            return RedisBackend()
+        except ImportError:
+            print("WARNING: CACHE_BACKEND=redis but the redis package is not installed; using in-process cache")
+    return MemoryBackend()
+
+class ResponseCache:
+    """
+    Caches endpoint payloads keyed by endpoint, club scope and parameters.
+    Invalidation is generational: writers bump a data domain and every entry
+    built on an older generation of that domain simply stops being addressed.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or build_backend()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, endpoint: str, outcome: str):
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {"hits": 0, "misses": 0})
+            counters[outcome] += 1
+
+    def key(self, endpoint: str, depends_on: Tuple[str, ...], params: Dict[str, Any]) -> str:
+        # Injected dependencies (e.g. the DB session) are not part of the request
+        params = {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in params.items()
+                  if v is None or isinstance(v, (str, int, float, bool, datetime))}
+        club = params.pop("club", None) or "global"
+        generations = ".".join(str(g) for g in self.backend.generations(depends_on))
+        args = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{endpoint}:{club}:g{generations}:{args}"
+
+    def cached(self, endpoint: str, ttl: float = CACHE_DEFAULT_TTL, depends_on: Tuple[str, ...] = ()):
+        """Decorator for async route handlers; the handler's own parameters form the key."""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(**kwargs):
+                key = self.key(endpoint, depends_on, dict(kwargs))
+                value = self.backend.get(key)
+                if value is not None:
+                    self._count(endpoint, "hits")
+                    return value
+                self._count(endpoint, "misses")
+                value = await func(**kwargs)
+                self.backend.set(key, value, ttl)
+                return value
+            return wrapper
+        return decorator
+
+    def invalidate(self, *domains: str):
+        self.backend.bump(domains)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {name: dict(c) for name, c in self._counters.items()}
+        hits = sum(c["hits"] for c in endpoints.values())
+        misses = sum(c["misses"] for c in endpoints.values())
+        return {
+            "backend": self.backend.name,
+            "entries": self.backend.size(),
+            "evictions": self.backend.evictions,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses) * 100, 1) if hits + misses else 0.0,
+            "endpoints": endpoints,
+        }
+
+response_cache = ResponseCache()
@@ -1,6 +1,15 @@
 from sqlmodel import create_engine, Session, SQLModel, select
-from app.models.player import Player, Shortlist, ScoutNote
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from typing import Any, AsyncIterator, Dict, Optional
+from app.core.pool import engine_options, install_sqlite_pragmas, pool_stats
+from app.models.player import Player, PlayerHeatmap, Shortlist, ScoutNote, ArchivedScoutNote
 from app.models.auth import Club, User
+from app.models.import_job import ImportJob
+from app.models.chat import Channel, Message, ArchivedMessage
+from app.models.negotiation import Negotiation, ArchivedNegotiation
+from app.models.staff import StaffMember, Assignment
+from datetime import datetime, timezone
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -18,25 +27,73 @@ if "://" not in DATABASE_URL:
     print("Please copy the full 'PostgreSQL Connection URL' from the Database Variables tab, not the domain name.")
     raise ValueError("Invalid DATABASE_URL format. Expected full connection string (postgresql://...)")
 
-connect_args = {}
-if "sqlite" in DATABASE_URL:
-    connect_args["check_same_thread"] = False
-
 try:
-    engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
+    engine = create_engine(DATABASE_URL, echo=False, **engine_options(DATABASE_URL))
 except Exception as e:
     print(f"CRITICAL: SQLAlchemy failed to parse your URL: {DATABASE_URL[:20]}...")
     raise e
 
+if engine.dialect.name == "sqlite":
+    install_sqlite_pragmas(engine)
+
+# Async driver per sync URL scheme; the sync engine stays the path for scripts and workers
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str = DATABASE_URL) -> str:
+    scheme, rest = url.split("://", 1)
+    if scheme not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{scheme}' URLs")
+    return f"{ASYNC_DRIVERS[scheme]}://{rest}"
+
+_async_engine: Optional[AsyncEngine] = None
+
+def get_async_engine() -> AsyncEngine:
+    """Created on first use so scripts never need asyncpg/aiosqlite installed."""
+    global _async_engine
+    if _async_engine is None:
+        url = async_database_url()
+        _async_engine = create_async_engine(url, echo=False, **engine_options(url, is_async=True))
+        if _async_engine.dialect.name == "sqlite":
+            install_sqlite_pragmas(_async_engine.sync_engine)
+    return _async_engine
+
+def get_pool_stats() -> Dict[str, Any]:
+    engines = {"sync": engine}
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+    return pool_stats(engines)
+
+async def dispose_async_engine():
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
 def init_db():
+    from app.core.migrations import run_migrations
     SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
 
 def get_session():
+    """Request-scoped sync session; FastAPI reuses it for every dependency of the same request."""
     with Session(engine) as session:
         yield session
 
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    # expire_on_commit=False: attribute access after commit would otherwise need a lazy (sync) reload
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
 def seed_data():
     from app.core.database import PLAYERS_DB
+    from app.utils.market_value import parse_market_value
+    from app.utils.positions import classify
+    from app.services.profile_store import ProfileStore
+    from app.services.heatmap_store import HeatmapStore
     with Session(engine) as session:
         # 1. Seed Clubs
         print("Seeding clubs...")
@@ -63,6 +120,7 @@ def seed_data():
         # Create Default Shortlist
         general = Shortlist(name="General Shortlist")
         session.add(general)
+        players = []
         
         for p_data in PLAYERS_DB:
             player = Player(
@@ -71,10 +129,12 @@ def seed_data():
                 club=p_data.get("club", "Free Agent"),
                 league=p_data.get("league", "Unknown"),
                 position=p_data.get("position", "MID"),
+                **classify(p_data.get("position", "MID")),
                 age=p_data.get("age", 20),
                 nationality=p_data.get("nationality", "Unknown"),
                 image=p_data.get("image", "/defaults/player_placeholder.png"),
                 market_value=p_data.get("market_value", "€0M"),
+                market_value_m=parse_market_value(p_data.get("market_value", "€0M")),
                 predicted_growth=p_data.get("predicted_growth", 5.0),
                 tactical_role=p_data.get("tactical_role", "Balanced"),
                 metrics=p_data.get("metrics", []),
@@ -85,7 +145,9 @@ def seed_data():
                 biometric_profile=p_data.get("biometric_profile", {}),
                 scientific_dossier=p_data.get("scientific_dossier")
             )
+            ProfileStore.apply(player)
             session.add(player)
+            players.append(player)
             
             # Add notes
             for n_data in p_data.get("scout_notes", []):
@@ -93,9 +155,12 @@ def seed_data():
                     player_id=player.id,
                     scout=n_data["scout"],
                     note=n_data["note"],
-                    date=n_data["date"]
+                    date=n_data["date"],
+                    created_at=datetime.strptime(n_data["date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
                 )
                 session.add(note)
                 
+        session.commit()
+        HeatmapStore.apply_batch(session, players)
         session.commit()
         print("Migration complete. 30+ players migrated to SQL.")
@@ -0,0 +1,98 @@
+import os
+import uuid
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+EVENT_HISTORY = int(os.getenv("EVENT_HISTORY", "1000"))  # events kept for resuming streams
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))  # per subscriber, before it is dropped
+
+class Subscription:
+    """One stream's queue. Delivery is thread-safe: publishers may run outside the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, accepts: Callable[[Dict[str, Any]], bool]):
+        self.loop = loop
+        self.accepts = accepts
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.overflowed = False
+
+    def deliver(self, event: Dict[str, Any]):
+        if self.accepts(event):
+            self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Dict[str, Any]):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A consumer this far behind resyncs from the REST endpoints instead of stalling publishers
+            self.overflowed = True
+
+class EventBroker:
+    """
+    In-process pub/sub for committed domain events. Writers publish after their
+    commit; every open stream gets its own bounded queue. Event ids are
+    "<boot>-<sequence>", and the last EVENT_HISTORY events are kept so a client
+    reconnecting with its last-seen id is replayed what it missed. An id from
+    another process lifetime, or older than the history, cannot be replayed and
+    the subscriber is told to resync instead.
+
+    Events only reach streams served by the same process; with several workers
+    this needs a shared bus (e.g. Redis pub/sub) in its place.
+    """
+
+    def __init__(self, history: int = EVENT_HISTORY):
+        self.boot = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._history: deque = deque(maxlen=history)
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+
+    def publish(self, kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self._seq += 1
+            event = {"id": f"{self.boot}-{self._seq}", "seq": self._seq, "type": kind, "data": data}
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event
+
+    def subscribe(self, accepts: Callable[[Dict[str, Any]], bool],
+                  last_event_id: Optional[str] = None) -> "tuple[Subscription, Optional[List[Dict[str, Any]]]]":
+        """
+        Registers a stream. Returns the subscription and the events to replay first:
+        an empty list for a fresh stream, None when last_event_id cannot be resumed.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), accepts)
+        with self._lock:
+            replay: Optional[List[Dict[str, Any]]] = []
+            if last_event_id:
+                last_seq = self._resumable_seq(last_event_id)
+                if last_seq is None:
+                    replay = None
+                else:
+                    replay = [e for e in self._history if e["seq"] > last_seq and accepts(e)]
+            # Registered under the same lock as the history read, so nothing falls in between
+            self._subscribers.add(subscription)
+        return subscription, replay
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _resumable_seq(self, last_event_id: str) -> Optional[int]:
+        boot, _, seq = last_event_id.partition("-")
+        if boot != self.boot or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._history[0]["seq"] if self._history else self._seq + 1
+        if seq > self._seq or seq < oldest - 1:
+            return None
+        return seq
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"subscribers": len(self._subscribers), "published": self._seq, "history": len(self._history)}
+
+event_broker = EventBroker()
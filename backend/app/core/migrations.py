@@ -0,0 +1,171 @@
+"""
+Idempotent schema migrations for databases created before a column existed.
+SQLModel's create_all() only creates missing tables, so new columns/indexes on
+existing tables (e.g. the shipped scienceball.db) are added here.
+Every step checks the live schema first and is safe to run on every startup.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+BACKFILL_BATCH_SIZE = 1000
+
+def _column_names(engine: Engine, table: str) -> set:
+    return {col["name"] for col in inspect(engine).get_columns(table)}
+
+def add_column_if_missing(engine: Engine, table: str, column: str, ddl_type: str) -> bool:
+    if column in _column_names(engine, table):
+        return False
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+    print(f"Migration: added column {table}.{column}")
+    return True
+
+def create_index_if_missing(engine: Engine, name: str, table: str, columns: str):
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+def migrate_enrichment_columns(engine: Engine):
+    """Phase 41 enrichment columns, missing from databases created before it."""
+    add_column_if_missing(engine, "player", "agent_info", "JSON")
+    add_column_if_missing(engine, "player", "value_history", "JSON")
+
+def migrate_market_value(engine: Engine):
+    """Adds the numeric player.market_value_m column and backfills it from the display string."""
+    from app.utils.market_value import parse_market_value
+
+    add_column_if_missing(engine, "player", "market_value_m", "FLOAT")
+    create_index_if_missing(engine, "ix_player_market_value_m", "player", "market_value_m")
+
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT id, market_value FROM player WHERE market_value_m IS NULL"
+        )).all()
+        updates = [
+            {"id": row[0], "value": parse_market_value(row[1])}
+            for row in rows
+        ]
+        updates = [u for u in updates if u["value"] is not None]
+
+        for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+            conn.execute(
+                text("UPDATE player SET market_value_m = :value WHERE id = :id"),
+                updates[start:start + BACKFILL_BATCH_SIZE]
+            )
+
+    if updates:
+        print(f"Migration: backfilled market_value_m for {len(updates)} players")
+
+def migrate_keyset_indexes(engine: Engine):
+    """Composite (sort column, id) indexes backing cursor pagination on the player list endpoints."""
+    create_index_if_missing(engine, "ix_player_growth_id", "player", "predicted_growth, id")
+    create_index_if_missing(engine, "ix_player_value_id", "player", "market_value_m, id")
+
+def migrate_search_indexes(engine: Engine):
+    """FTS5 (SQLite) or trigram/tsvector (Postgres) indexes for player search."""
+    from app.services.player_search import PlayerSearchService
+    PlayerSearchService(engine).ensure_indexes()
+
+def migrate_player_profiles(engine: Engine):
+    """Columns for persisted scientific profiles, then compute any missing/outdated ones."""
+    from app.services.profile_store import ProfileStore
+
+    add_column_if_missing(engine, "player", "scientific_profile", "JSON")
+    add_column_if_missing(engine, "player", "profile_version", "VARCHAR")
+    add_column_if_missing(engine, "player", "profile_fingerprint", "VARCHAR")
+    create_index_if_missing(engine, "ix_player_profile_version", "player", "profile_version")
+    ProfileStore.refresh_stale(engine)
+
+def migrate_activity_timestamps(engine: Engine):
+    """
+    Typed scoutnote.created_at (backfilled from the legacy date string) and the
+    (timestamp, id) indexes the activity feed reads every source through.
+    """
+    from datetime import datetime, timezone
+    from sqlalchemy import bindparam
+    from app.models.player import ScoutNote
+
+    ddl_type = "TIMESTAMP WITH TIME ZONE" if engine.dialect.name == "postgresql" else "DATETIME"
+    add_column_if_missing(engine, "scoutnote", "created_at", ddl_type)
+
+    table = ScoutNote.__table__
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT id, date FROM scoutnote WHERE created_at IS NULL")).all()
+        updates = []
+        for note_id, date in rows:
+            try:
+                created_at = datetime.strptime(date, "%Y-%m-%d")
+            except (TypeError, ValueError):
+                created_at = datetime(1970, 1, 1)
+            updates.append({"note_id": note_id, "created_at": created_at.replace(tzinfo=timezone.utc)})
+
+        statement = table.update().where(table.c.id == bindparam("note_id")).values(created_at=bindparam("created_at"))
+        for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+            conn.execute(statement, updates[start:start + BACKFILL_BATCH_SIZE])
+
+    if updates:
+        print(f"Migration: backfilled scoutnote.created_at for {len(updates)} notes")
+
+    create_index_if_missing(engine, "ix_scoutnote_created_at_id", "scoutnote", "created_at, id")
+    create_index_if_missing(engine, "ix_message_timestamp_id", "message", "timestamp, id")
+    create_index_if_missing(engine, "ix_negotiation_last_updated_id", "negotiation", "last_updated, id")
+    create_index_if_missing(engine, "ix_assignment_created_at_id", "assignment", "created_at, id")
+
+def migrate_chat_history_indexes(engine: Engine):
+    """(channel_id, id) indexes serving paged channel history from the live and archived tables."""
+    create_index_if_missing(engine, "ix_message_channel_id_id", "message", "channel_id, id")
+    create_index_if_missing(engine, "ix_archivedmessage_channel_id_id", "archivedmessage", "channel_id, id")
+
+def migrate_retention_indexes(engine: Engine):
+    """Lets the assignments retention policy find aged COMPLETED rows without a table scan."""
+    create_index_if_missing(engine, "ix_assignment_status_created_at", "assignment", "status, created_at")
+
+def migrate_position_taxonomy(engine: Engine):
+    """
+    Canonical player.position_code and role_group (GK/DEF/MID/ATT) from the position
+    taxonomy, backfilled in one pass, plus the (club, ...) indexes squad composition groups on.
+    """
+    from app.utils.positions import classify
+
+    add_column_if_missing(engine, "player", "position_code", "VARCHAR")
+    add_column_if_missing(engine, "player", "role_group", "VARCHAR")
+    create_index_if_missing(engine, "ix_player_position_code", "player", "position_code")
+    create_index_if_missing(engine, "ix_player_club_position_code", "player", "club, position_code")
+    create_index_if_missing(engine, "ix_player_role_group", "player", "role_group")
+    create_index_if_missing(engine, "ix_player_club_role_group", "player", "club, role_group")
+
+    # Every recognised position has a role group, so a NULL group marks a row not yet classified
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT id, position FROM player WHERE role_group IS NULL")).all()
+        updates = [{"id": row[0], **classify(row[1])} for row in rows]
+        updates = [u for u in updates if u["role_group"] is not None]
+
+        for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+            conn.execute(
+                text("UPDATE player SET position_code = :position_code, role_group = :role_group WHERE id = :id"),
+                updates[start:start + BACKFILL_BATCH_SIZE]
+            )
+
+    if updates:
+        print(f"Migration: backfilled position_code/role_group for {len(updates)} players")
+
+def migrate_player_heatmaps(engine: Engine):
+    """Positional heatmaps for players that have no (current) stored grid yet."""
+    from app.services.heatmap_store import HeatmapStore
+    HeatmapStore.refresh_stale(engine)
+
+MIGRATIONS = [
+    migrate_enrichment_columns,
+    migrate_market_value,
+    migrate_position_taxonomy,
+    migrate_keyset_indexes,
+    migrate_search_indexes,
+    migrate_player_profiles,
+    migrate_activity_timestamps,
+    migrate_chat_history_indexes,
+    migrate_retention_indexes,
+    migrate_player_heatmaps,
+]
+
+def run_migrations(engine: Engine):
+    for migration in MIGRATIONS:
+        migration(engine)
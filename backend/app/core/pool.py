@@ -0,0 +1,131 @@
+import os
+import time
+import threading
+from typing import Any, Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Connection pool settings (per engine; the sync and async engines each get their own pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Postgres only; 0 disables
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() in ("1", "true", "yes")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Upper bounds (ms) of the checkout wait histogram
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+class PoolMetrics:
+    """Checkout wait times and peak usage of one pool, since process start."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.peak_checked_out = 0
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe(self, wait_ms: float, checked_out: int, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            bucket = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound), len(WAIT_BUCKETS_MS))
+            self.buckets[bucket] += 1
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, Any]:
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        with self._lock:
+            labels = [f"<={b}ms" for b in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]}ms"]
+            return {
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": checked_out,
+                "overflow": max(pool.overflow(), 0),
+                "idle": pool.checkedin(),
+                # Share of the pool's hard limit in use right now / at the worst moment so far
+                "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+                "peak_saturation": round(self.peak_checked_out / capacity, 3) if capacity else 0.0,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "wait_histogram": dict(zip(labels, self.buckets)),
+            }
+
+POOL_METRICS = {"sync": PoolMetrics(), "async": PoolMetrics()}
+
+class _InstrumentedPool:
+    """Times Pool.connect(): queue wait, plus connect/pre-ping when a connection has to be (re)opened."""
+    metrics_key = "sync"
+
+    def connect(self):
+        metrics = POOL_METRICS[self.metrics_key]
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.observe(0.0, self.checkedout(), timed_out=True)
+            raise
+        metrics.observe((time.perf_counter() - start) * 1000, self.checkedout())
+        return connection
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    metrics_key = "sync"
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    metrics_key = "async"
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine()/create_async_engine() keyword arguments for a database URL."""
+    connect_args: Dict[str, Any] = {}
+    if url.startswith("sqlite"):
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        if ":memory:" in url or not url.split("://", 1)[1]:
+            # In-memory databases live in a single connection; keep SQLAlchemy's default pool
+            return {"connect_args": connect_args}
+    elif url.startswith("postgresql") and DB_STATEMENT_TIMEOUT_MS > 0:
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+def install_sqlite_pragmas(engine: Engine):
+    """WAL lets readers run alongside the single writer; busy_timeout makes writers queue instead of failing."""
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # Durable at checkpoints; the usual pairing with WAL
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+def pool_stats(engines: Dict[str, Engine]) -> Dict[str, Any]:
+    return {name: POOL_METRICS[name].snapshot(engine.pool) for name, engine in engines.items()
+            if isinstance(engine.pool, _InstrumentedPool)}
@@ -1,15 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.db import init_db, seed_data
-from app.api import endpoints, players, scouting, shortlists, importer, admin_analytics, chat, negotiations, staff, reports, archive, auth, admin_sync, admin_automation, director
+from app.core.db import init_db, seed_data, dispose_async_engine
+from app.api import endpoints, players, scouting, shortlists, importer, admin_analytics, chat, negotiations, staff, reports, archive, auth, admin_sync, admin_automation, director, events
 from app.middleware.audit import AuditMiddleware
+from app.analytics.xt_training import xt_grid_store
 from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
     seed_data()
+    importer.import_jobs.recover()
+    xt_grid_store.restore()
     yield
+    await dispose_async_engine()
 
 app = FastAPI(title="ScienceBall.ai API", lifespan=lifespan)
 
@@ -40,6 +44,7 @@ app.include_router(reports.router)         # Prefix /reports defined in router
 app.include_router(archive.router)         # Prefix /admin/archive defined in router
 app.include_router(auth.router)            # Prefix /auth defined in router
 app.include_router(director.router)        # Prefix /director defined in router
+app.include_router(events.router)          # Prefix /events defined in router
 
 @app.api_route("/", methods=["GET", "HEAD"])
 async def root():
@@ -1,6 +1,6 @@
 from typing import Optional
 from sqlmodel import SQLModel, Field
-from datetime import datetime
+from datetime import datetime, timezone
 
 class Channel(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -13,4 +13,14 @@ class Message(SQLModel, table=True):
     sender: str
     content: str
     player_id: Optional[str] = None  # Optional player attachment
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ArchivedMessage(SQLModel, table=True):
+    """Cold tier for old chat messages; rows keep the id they had in `message`."""
+    id: int = Field(primary_key=True)
+    channel_id: int = Field(foreign_key="channel.id")
+    sender: str
+    content: str
+    player_id: Optional[str] = None
+    timestamp: datetime
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,22 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+
+class ImportJob(SQLModel, table=True):
+    id: str = Field(primary_key=True)
+    filename: str
+
+    # Status: QUEUED, RUNNING, COMPLETED, FAILED
+    status: str = Field(default="QUEUED", index=True)
+    rows_parsed: int = Field(default=0)
+    rows_inserted: int = Field(default=0)
+    rows_skipped: int = Field(default=0)  # name+club duplicates
+    rows_failed: int = Field(default=0)
+    progress: float = Field(default=0.0)  # fraction of the file consumed, 0..1
+
+    error: Optional[str] = None  # fatal error that stopped the job
+    report_path: Optional[str] = None  # CSV of per-row errors, when there were any
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from sqlmodel import SQLModel, Field, Relationship
-from datetime import datetime
+from datetime import datetime, timezone
 
 class Agent(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -22,6 +22,19 @@ class Negotiation(SQLModel, table=True):
     contract_years: int = Field(default=0)
     
     notes: Optional[str] = None
-    last_updated: datetime = Field(default_factory=datetime.now)
+    last_updated: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     agent: Optional[Agent] = Relationship(back_populates="negotiations")
+
+class ArchivedNegotiation(SQLModel, table=True):
+    """Closed (SIGNED/FAILED) negotiations moved out of the live table; ids are kept."""
+    id: int = Field(primary_key=True)
+    player_id: str = Field(foreign_key="player.id", index=True)
+    agent_id: Optional[int] = Field(default=None, foreign_key="agent.id")
+    status: str
+    estimated_fee: float = Field(default=0.0)
+    estimated_salary: float = Field(default=0.0)
+    contract_years: int = Field(default=0)
+    notes: Optional[str] = None
+    last_updated: datetime
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict
-from sqlmodel import SQLModel, Field, Relationship, JSON, Column
+from datetime import datetime, timezone
+from sqlmodel import SQLModel, Field, Relationship, JSON, Column, LargeBinary
 import uuid
 
 # Association table for Many-to-Many relationship between Players and Shortlists
@@ -14,10 +15,13 @@ class Player(SQLModel, table=True):
     club: str = Field(index=True)
     league: str = Field(index=True)
     position: str
+    position_code: Optional[str] = Field(default=None, index=True)  # canonical code, see app.utils.positions
+    role_group: Optional[str] = Field(default=None, index=True)  # GK / DEF / MID / ATT
     age: int
     nationality: str
     image: str
     market_value: str
+    market_value_m: Optional[float] = Field(default=None, index=True)  # Normalized € millions for filtering/sorting
     predicted_growth: float
     tactical_role: Optional[str] = "Balanced"
     contract_expiry: Optional[str] = "2027-06-30"  # Default for analytics
@@ -38,6 +42,11 @@ class Player(SQLModel, table=True):
     scientific_dossier: Optional[str] = None
     is_synthetic: bool = Field(default=False)
     
+    # Precomputed ScientificAttributeEngine output (see ProfileStore)
+    scientific_profile: Optional[Dict] = Field(default=None, sa_column=Column(JSON))
+    profile_version: Optional[str] = Field(default=None, index=True)
+    profile_fingerprint: Optional[str] = None
+    
     # Explicit Stats Columns for querying/sorting
     pace: int = Field(default=0)
     shooting: int = Field(default=0)
@@ -55,6 +64,18 @@ class Player(SQLModel, table=True):
     notes: List["ScoutNote"] = Relationship(back_populates="player")
     shortlists: List["Shortlist"] = Relationship(back_populates="players", link_model=ShortlistPlayerLink)
 
+class PlayerHeatmap(SQLModel, table=True):
+    """Precomputed spatial density of a player (see HeatmapStore): a rows x cols float16 grid."""
+    player_id: str = Field(foreign_key="player.id", primary_key=True)
+    rows: int
+    cols: int
+    grid: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    source: str  # "events" (aggregated event coordinates) or "positional" (model from position/pace)
+    events: int = 0
+    fingerprint: Optional[str] = None  # inputs of a positional grid; None for event grids
+    etag: str
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
 class Shortlist(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True, unique=True)
@@ -67,11 +88,22 @@ class ScoutNote(SQLModel, table=True):
     player_id: str = Field(foreign_key="player.id")
     scout: str
     note: str
-    date: str
+    date: str  # legacy display date (YYYY-MM-DD), kept for older clients; order by created_at
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     # Relationships
     player: Player = Relationship(back_populates="notes")
 
+class ArchivedScoutNote(SQLModel, table=True):
+    """Cold tier for old scout notes; rows keep the id they had in `scoutnote`."""
+    id: int = Field(primary_key=True)
+    player_id: str = Field(foreign_key="player.id", index=True)
+    scout: str
+    note: str
+    date: str
+    created_at: datetime
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
 class SavedSearch(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
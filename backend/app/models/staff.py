@@ -1,6 +1,6 @@
 from typing import Optional, List
 from sqlmodel import SQLModel, Field, Relationship
-from datetime import datetime
+from datetime import datetime, timezone
 
 class StaffMember(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -21,6 +21,6 @@ class Assignment(SQLModel, table=True):
     priority: str = Field(default="MEDIUM")  # LOW, MEDIUM, HIGH, CRITICAL
     notes: Optional[str] = None
     deadline: Optional[datetime] = None
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     staff: StaffMember = Relationship(back_populates="assignments")
@@ -0,0 +1,50 @@
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+from sqlmodel import select
+from app.models.player import Player
+
+class PlayerSummary(BaseModel):
+    """List-view projection of a Player: scalar columns only, none of the JSON dossiers."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    fm_id: Optional[int] = None
+    name: str
+    club: str
+    league: str
+    position: str
+    age: int
+    nationality: str
+    image: str
+    market_value: str
+    market_value_m: Optional[float] = None
+    predicted_growth: float
+    tactical_role: Optional[str] = None
+    contract_expiry: Optional[str] = None
+    market_surge: Optional[float] = None
+    is_synthetic: bool = False
+
+    pace: int = 0
+    shooting: int = 0
+    passing: int = 0
+    dribbling: int = 0
+    defending: int = 0
+    physical: int = 0
+
+    xg_per_90: float = 0.0
+    xa_per_90: float = 0.0
+    ppda: float = 0.0
+
+class PlayerSummaryPage(BaseModel):
+    items: List[PlayerSummary]
+    next_cursor: Optional[str] = None
+
+# Column list derived from the response model so the two can never drift apart
+PLAYER_SUMMARY_COLUMNS = [getattr(Player, name) for name in PlayerSummary.model_fields]
+
+def select_player_summary():
+    """SELECT of the summary columns only; rows expose them as attributes."""
+    return select(*PLAYER_SUMMARY_COLUMNS)
+
+def to_summary(row) -> PlayerSummary:
+    return PlayerSummary.model_validate(row)
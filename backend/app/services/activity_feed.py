@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy import String, cast, literal, union_all
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.player import Player, ScoutNote
+from app.models.chat import Message
+from app.models.negotiation import Negotiation
+from app.models.staff import Assignment
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.core.events import event_broker
+
+# Event kinds, in the tie-break order used when two events share a timestamp
+SCOUT_REPORT = "SCOUT_REPORT"
+MESSAGE = "MESSAGE"
+NEGOTIATION = "NEGOTIATION"
+ASSIGNMENT = "ASSIGNMENT"
+
+STAFF_KINDS = (MESSAGE, NEGOTIATION, ASSIGNMENT)
+SORT_KEY = "activity"
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamp columns are UTC-aware; a bare ?since=2026-01-01T00:00 is taken as UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def _sources() -> Dict[str, Dict[str, Any]]:
+    """Per kind: the table's indexed timestamp column, id, and the columns projected into a feed row."""
+    return {
+        SCOUT_REPORT: {"ts": ScoutNote.created_at, "id": ScoutNote.id, "actor": ScoutNote.scout,
+                       "content": ScoutNote.note, "player_id": ScoutNote.player_id},
+        MESSAGE: {"ts": Message.timestamp, "id": Message.id, "actor": Message.sender,
+                  "content": Message.content, "player_id": Message.player_id},
+        NEGOTIATION: {"ts": Negotiation.last_updated, "id": Negotiation.id, "actor": literal("System"),
+                      "content": literal("Status changed to ") + Negotiation.status, "player_id": Negotiation.player_id},
+        ASSIGNMENT: {"ts": Assignment.created_at, "id": Assignment.id, "actor": literal("Director"),
+                     "content": literal("New deep-dive assigned to ID ") + cast(Assignment.staff_id, String),
+                     "player_id": Assignment.player_id},
+    }
+
+class ActivityFeed:
+    """
+    Newest-first stream over scout notes, chat messages, negotiations and assignments.
+    Each source is read through its (timestamp, id) index with the cursor/since bounds
+    and the page limit pushed into the branch, and the branches are merged with a
+    UNION ALL, so a page never touches more than `limit + 1` rows per source.
+    Rows are ordered by (ts, kind, id) descending; the cursor carries that triple.
+    """
+
+    async def page(self, session: AsyncSession, kinds: Iterable[str] = (SCOUT_REPORT,) + STAFF_KINDS,
+                   limit: int = 20, cursor: Optional[str] = None, since: Optional[datetime] = None) -> Dict[str, Any]:
+        sources = _sources()
+        kinds = [k for k in kinds if k in sources]
+        after = None
+        if cursor:
+            values = decode_cursor(cursor, SORT_KEY)
+            if len(values) != 3:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            ts, kind, event_id = values
+            try:
+                after = (_as_utc(datetime.fromisoformat(ts)), kind, int(event_id))
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        if since is not None:
+            since = _as_utc(since)
+
+        branches = []
+        for kind in kinds:
+            src = sources[kind]
+            branch = select(
+                literal(kind).label("kind"), src["ts"].label("ts"), src["id"].label("id"),
+                src["actor"].label("actor"), src["content"].label("content"), src["player_id"].label("player_id"),
+            )
+            if since is not None:
+                branch = branch.where(src["ts"] > since)
+            if after is not None:
+                ts, after_kind, after_id = after
+                # (ts, kind, id) < cursor, with this branch's kind a constant
+                if kind < after_kind:
+                    branch = branch.where(src["ts"] <= ts)
+                elif kind > after_kind:
+                    branch = branch.where(src["ts"] < ts)
+                else:
+                    branch = branch.where((src["ts"] < ts) | ((src["ts"] == ts) & (src["id"] < after_id)))
+            branch = branch.order_by(src["ts"].desc(), src["id"].desc()).limit(limit + 1)
+            # SQLite only accepts ORDER BY/LIMIT on a compound member inside a subquery
+            branches.append(select(branch.subquery()))
+
+        if not branches:
+            return {"items": [], "next_cursor": None}
+        merged = union_all(*branches).subquery()
+        statement = select(merged).order_by(merged.c.ts.desc(), merged.c.kind.desc(), merged.c.id.desc()).limit(limit + 1)
+        # execute(), not exec(): a select over one subquery would otherwise come back as scalars
+        rows = (await session.execute(statement)).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        names = await self._player_names(session, {r.player_id for r in rows if r.player_id})
+        items = [
+            {"type": r.kind, "time": r.ts, "id": r.id, "user": r.actor, "content": r.content,
+             "ref": r.player_id, "player_name": names.get(r.player_id)}
+            for r in rows
+        ]
+        last = rows[-1] if rows else None
+        next_cursor = encode_cursor(SORT_KEY, [last.ts.isoformat(), last.kind, last.id]) if has_more and last else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def item_for(kind: str, obj: Any, player_name: Optional[str] = None) -> Dict[str, Any]:
+        """Feed item for one freshly committed row, in the same shape page() returns."""
+        if kind == SCOUT_REPORT:
+            item = {"time": obj.created_at, "user": obj.scout, "content": obj.note}
+        elif kind == MESSAGE:
+            item = {"time": obj.timestamp, "user": obj.sender, "content": obj.content, "channel_id": obj.channel_id}
+        elif kind == NEGOTIATION:
+            item = {"time": obj.last_updated, "user": "System", "content": f"Status changed to {obj.status}"}
+        else:
+            item = {"time": obj.created_at, "user": "Director", "content": f"New deep-dive assigned to ID {obj.staff_id}"}
+        return {"type": kind, "id": obj.id, "ref": obj.player_id, "player_name": player_name, **item}
+
+    def publish(self, kind: str, obj: Any, player_name: Optional[str] = None):
+        """Pushes a committed row to open event streams."""
+        event_broker.publish(kind, self.item_for(kind, obj, player_name))
+
+    @staticmethod
+    async def _player_names(session: AsyncSession, player_ids: set) -> Dict[str, str]:
+        if not player_ids:
+            return {}
+        rows = (await session.exec(select(Player.id, Player.name).where(Player.id.in_(player_ids)))).all()
+        return dict(rows)
+
+activity_feed = ActivityFeed()
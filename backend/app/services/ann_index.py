@@ -0,0 +1,119 @@
+from typing import Callable, Dict, Optional
+import numpy as np
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over unit vectors (cosine).
+    Rows are bucketed by their nearest spherical k-means centroid; a query scores
+    only the rows in its nprobe closest buckets instead of the whole matrix.
+    """
+
+    MAX_LISTS = 1024
+    TRAIN_SAMPLES_PER_LIST = 50
+    TRAIN_ITERATIONS = 10
+    ASSIGN_CHUNK_SIZE = 50_000
+
+    def __init__(self, nprobe_fraction: float = 0.05, seed: int = 42):
+        self.nprobe_fraction = nprobe_fraction
+        self.seed = seed
+        self.centroids = np.empty((0, 0), dtype=np.float32)
+        self.assignments = np.empty(0, dtype=np.int32)
+        self._order = None
+        self._offsets = None
+
+    @property
+    def trained(self) -> bool:
+        return len(self.centroids) > 0
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    def train(self, vectors: np.ndarray):
+        """Spherical k-means on a sample, then assigns every row."""
+        n = len(vectors)
+        if n == 0:
+            self.centroids = np.empty((0, vectors.shape[1]), dtype=np.float32)
+            self.assignments = np.empty(0, dtype=np.int32)
+            self._order = None
+            return
+
+        rng = np.random.default_rng(self.seed)
+        nlist = int(min(self.MAX_LISTS, max(1, np.sqrt(n))))
+        sample_size = min(n, nlist * self.TRAIN_SAMPLES_PER_LIST)
+        sample = vectors[rng.choice(n, size=sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+
+        for _ in range(self.TRAIN_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            # Empty clusters keep their previous centroid
+            filled = counts > 0
+            centroids[filled] = sums[filled]
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = centroids / norms
+
+        self.centroids = centroids.astype(np.float32)
+        self.assignments = self._nearest(vectors)
+        self._order = None
+
+    def assign(self, vectors: np.ndarray, rows: Optional[np.ndarray] = None):
+        """(Re)assigns rows after incremental changes; new rows extend the assignment array."""
+        if not self.trained:
+            return
+        if len(self.assignments) < len(vectors):
+            grown = np.zeros(len(vectors), dtype=np.int32)
+            grown[:len(self.assignments)] = self.assignments
+            new_rows = np.arange(len(self.assignments), len(vectors))
+            self.assignments = grown
+            rows = new_rows if rows is None else np.union1d(rows, new_rows)
+        if rows is None or len(rows) == 0:
+            return
+        self.assignments[rows] = self._nearest(vectors[rows])
+        self._order = None
+
+    def _nearest(self, vectors: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), self.ASSIGN_CHUNK_SIZE):
+            chunk = vectors[start:start + self.ASSIGN_CHUNK_SIZE]
+            labels[start:start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
+
+    def _ensure_lists(self):
+        if self._order is None:
+            self._order = np.argsort(self.assignments, kind="stable")
+            self._offsets = np.concatenate([[0], np.cumsum(np.bincount(self.assignments, minlength=self.nlist))])
+
+    def candidates(
+        self,
+        query: np.ndarray,
+        accept: Callable[[np.ndarray], np.ndarray],
+        k: int,
+        nprobe: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Row indices from the closest buckets that pass accept(rows). Widens the
+        probe until at least k rows qualify or every bucket has been visited.
+        """
+        self._ensure_lists()
+        ranked_lists = np.argsort(-(self.centroids @ query))
+        nprobe = nprobe or max(1, int(np.ceil(self.nlist * self.nprobe_fraction)))
+
+        while True:
+            probed = ranked_lists[:nprobe]
+            rows = np.concatenate([self._order[self._offsets[l]:self._offsets[l + 1]] for l in probed])
+            rows = accept(rows)
+            if len(rows) >= k or nprobe >= self.nlist:
+                return rows
+            nprobe = min(self.nlist, nprobe * 2)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"ivf_centroids": self.centroids, "ivf_assignments": self.assignments}
+
+    def restore(self, state: Dict[str, np.ndarray]):
+        self.centroids = state["ivf_centroids"].astype(np.float32)
+        self.assignments = state["ivf_assignments"].astype(np.int32)
+        self._order = None
@@ -1,11 +1,89 @@
 import math
 import random
+import hashlib
+import json
+from typing import Dict, List, Optional
+import numpy as np
+
+# --- Counter-based noise (splitmix64) ---
+# Draw k for a player is a pure function of (seed, k), so the scalar and the
+# vectorized paths produce identical values without carrying RNG state around.
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+
+# Fixed draw indices so every block gets the same noise no matter what else is computed
+STREAM_WORK_RATE = 0
+STREAM_PACE = 1
+STREAM_STRENGTH = 2
+STREAM_AGENT = 3
+
+def _unit(seed: int, stream: int) -> float:
+    z = (seed + (stream + 1) * _GOLDEN) & _MASK64
+    z = ((z ^ (z >> 30)) * _MIX_1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX_2) & _MASK64
+    z = z ^ (z >> 31)
+    return (z >> 11) * (1.0 / (1 << 53))
+
+def _unit_batch(seeds: np.ndarray, stream: int) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        z = seeds + np.uint64(((stream + 1) * _GOLDEN) & _MASK64)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX_1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX_2)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+class SeededNoise:
+    """random.Random-compatible facade over the counter-based draws of one player."""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+
+    def uniform(self, a: float, b: float, stream: int = 0) -> float:
+        return a + (b - a) * _unit(self.seed, stream)
+
+    def randint(self, a: int, b: int, stream: int = 0) -> int:
+        return a + int(_unit(self.seed, stream) * (b - a + 1))
+
+    def choice(self, seq, stream: int = 0):
+        return seq[int(_unit(self.seed, stream) * len(seq))]
+
+# Engine methods accept either SeededNoise or anything random.Random-like (e.g. the random module)
+def _randint(rng, a: int, b: int, stream: int) -> int:
+    return rng.randint(a, b, stream) if isinstance(rng, SeededNoise) else rng.randint(a, b)
+
+def _uniform(rng, a: float, b: float, stream: int) -> float:
+    return rng.uniform(a, b, stream) if isinstance(rng, SeededNoise) else rng.uniform(a, b)
+
+def _choice(rng, seq, stream: int):
+    return rng.choice(seq, stream) if isinstance(rng, SeededNoise) else rng.choice(seq)
 
 class ScientificAttributeEngine:
     """
     Converts raw performance data into FM-style 0-20 Attributes.
     Philosophy: Every attribute must be traceable to a data point.
     """
+
+    # Bump whenever a formula changes: persisted profiles with another version are recomputed
+    VERSION = "2026.2"
+
+    TECHNICAL_ATTRIBUTES = ["Finishing", "Passing", "Dribbling", "Tackling", "Technique"]
+    MENTAL_ATTRIBUTES = ["Composure", "Vision", "Decisions", "Work Rate", "Flair"]
+    PHYSICAL_ATTRIBUTES = ["Pace", "Acceleration", "Strength", "Stamina", "Balance"]
+
+    # Column order of the raw stats matrix accepted by calculate_batch()
+    BATCH_STAT_COLUMNS = ["Goals", "npxG", "Assists", "Prog"]
+
+    @classmethod
+    def player_seed(cls, player_id: str) -> int:
+        digest = hashlib.blake2b(f"{player_id}:{cls.VERSION}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    @classmethod
+    def rng_for(cls, player_id: str) -> SeededNoise:
+        """Per-player seeded noise so a profile is reproducible for a given engine version."""
+        return SeededNoise(cls.player_seed(player_id))
     
     @staticmethod
     def calculate_technical(stats: dict, pos: str) -> list:
@@ -41,7 +119,7 @@ class ScientificAttributeEngine:
         ]
 
     @staticmethod
-    def calculate_mental(stats: dict, pos: str, age: int) -> list:
+    def calculate_mental(stats: dict, pos: str, age: int, rng=random) -> list:
         # Mental attributes grow with age and consistency
         experience_bonus = min(5, (age - 18) * 0.5) if age > 18 else 0
         
@@ -57,7 +135,7 @@ class ScientificAttributeEngine:
         vision = 9 + (assists * 15)
         
         # Work Rate: Inferred base
-        work_rate = 12 + random.randint(-1, 2) # Hard to track without tracking data
+        work_rate = 12 + _randint(rng, -1, 2, STREAM_WORK_RATE) # Hard to track without tracking data
         
         return [
             {"name": "Composure", "value": round(min(20, max(5, composure)))},
@@ -68,7 +146,7 @@ class ScientificAttributeEngine:
         ]
 
     @staticmethod
-    def calculate_physical(stats: dict, pos: str, age: int) -> list:
+    def calculate_physical(stats: dict, pos: str, age: int, rng=random) -> list:
         # Physical peak is ~24-28
         peak_factor = 1.0
         if age < 20: peak_factor = 0.9
@@ -83,8 +161,8 @@ class ScientificAttributeEngine:
         if "Striker" in pos: strength = 13
         
         # Random variance for genetics (Scientific uncertainty)
-        pace += random.uniform(-1, 2)
-        strength += random.uniform(-2, 2)
+        pace += _uniform(rng, -1, 2, STREAM_PACE)
+        strength += _uniform(rng, -2, 2, STREAM_STRENGTH)
         
         return [
             {"name": "Pace", "value": round(pace * peak_factor)},
@@ -97,10 +175,10 @@ class ScientificAttributeEngine:
     @staticmethod
     def generate_value_history(current_value_str: str, age: int) -> list:
         """Generates a realistic 3-year market value history curve."""
-        try:
-            # Parse "€150M" -> 150.0
-            val = float(current_value_str.replace("€", "").replace("M", ""))
-        except:
+        from app.utils.market_value import parse_market_value
+        # Parse "€150M" / "150000000" -> 150.0
+        val = parse_market_value(current_value_str)
+        if val is None:
             val = 10.0 # Fallback
             
         history = []
@@ -122,7 +200,7 @@ class ScientificAttributeEngine:
         return history
 
     @staticmethod
-    def generate_agent_profile(league: str) -> dict:
+    def generate_agent_profile(league: str, rng=random) -> dict:
         """Assigns a top agency based on league/stature."""
         agencies = [
             {"name": "Gestifute", "agent": "Jorge Mendes", "tier": "Elite", "clients": ["Ruben Dias", "Ederson"]},
@@ -133,7 +211,7 @@ class ScientificAttributeEngine:
         ]
         
         # Random assignment weighted by nothing for now, just random valid
-        selection = random.choice(agencies)
+        selection = _choice(rng, agencies, STREAM_AGENT)
         return {
             "name": selection["agent"],
             "agency": selection["name"],
@@ -142,9 +220,10 @@ class ScientificAttributeEngine:
         }
 
     @classmethod
-    def generate_full_profile(cls, player_model) -> dict:
+    def generate_full_profile(cls, player_model, rng=None) -> dict:
         """Takes a SQLModel player and returns the structured 0-20 dict."""
         raw = player_model.attributes or {}
+        rng = rng or cls.rng_for(player_model.id)
 
         # Ensure we have specific stats to work with or fallback
         # If raw is empty, we must infer from position + age + league? 
@@ -152,6 +231,164 @@ class ScientificAttributeEngine:
         
         return {
             "technical": cls.calculate_technical(raw, player_model.position),
-            "mental": cls.calculate_mental(raw, player_model.position, player_model.age),
-            "physical": cls.calculate_physical(raw, player_model.position, player_model.age)
+            "mental": cls.calculate_mental(raw, player_model.position, player_model.age, rng),
+            "physical": cls.calculate_physical(raw, player_model.position, player_model.age, rng)
         }
+
+    @classmethod
+    def calculate_batch(cls, stats, ages=None, positions=None, seeds=None) -> Dict[str, np.ndarray]:
+        """
+        Vectorized equivalent of calculate_technical/mental/physical for N players.
+        `stats` is either a DataFrame with Goals, npxG (optional xG), Assists, Prog, age
+        and position columns, or an (N, 4) array in BATCH_STAT_COLUMNS order together with
+        `ages` and `positions`. `seeds` (uint64, see player_seed) drives the noise.
+        Returns {"technical"|"mental"|"physical": (N, 5) int matrix}; columns follow
+        TECHNICAL_ATTRIBUTES / MENTAL_ATTRIBUTES / PHYSICAL_ATTRIBUTES.
+        """
+        if hasattr(stats, "columns"):
+            def column(name):
+                if name not in stats.columns:
+                    return np.zeros(len(stats))
+                return np.nan_to_num(np.asarray(stats[name], dtype=np.float64))
+            goals, npxg, assists, prog = (column(c) for c in cls.BATCH_STAT_COLUMNS)
+            xg_fallback = column("xG")
+            ages = stats["age"] if ages is None else ages
+            positions = stats["position"] if positions is None else positions
+        else:
+            matrix = np.nan_to_num(np.asarray(stats, dtype=np.float64)).reshape(-1, len(cls.BATCH_STAT_COLUMNS))
+            goals, npxg, assists, prog = matrix.T
+            xg_fallback = np.zeros(len(matrix))
+
+        n = len(goals)
+        ages = np.asarray(ages, dtype=np.float64)
+        positions = np.asarray(positions, dtype=str)
+        seeds = np.zeros(n, dtype=np.uint64) if seeds is None else np.asarray(seeds, dtype=np.uint64)
+
+        def has(token: str) -> np.ndarray:
+            return np.char.find(positions, token) >= 0
+
+        # Technical
+        xg = np.where(npxg != 0, npxg, xg_fallback)
+        finishing = np.minimum(20, goals * 12 + xg * 8)
+        finishing = np.where(finishing < 5, 5 + goals * 5, finishing)
+        passing = np.minimum(20, 8 + prog * 1.2 + assists * 10)
+        dribbling = np.minimum(20, 8 + prog * 1.5) + np.where(has("Winger") | has("Forward"), 2, 0)
+        tackling = np.where(has("Back") | has("Def"), 14, 6)
+        technique = (passing + dribbling) / 2 + 1
+        technical = np.stack([finishing, passing, dribbling, tackling, technique], axis=1)
+
+        # Mental
+        experience_bonus = np.where(ages > 18, np.minimum(5, (ages - 18) * 0.5), 0)
+        composure = 10 + (goals - npxg) * 10 + experience_bonus
+        vision = 9 + assists * 15
+        work_rate = 12 + (-1 + np.floor(_unit_batch(seeds, STREAM_WORK_RATE) * 4))
+        mental = np.stack([
+            np.clip(composure, 5, 20),
+            np.clip(vision, 5, 20),
+            10 + experience_bonus,
+            work_rate,
+            vision * 0.8 + 2,
+        ], axis=1)
+
+        # Physical
+        peak_factor = np.where(ages > 30, 0.8, np.where(ages < 20, 0.9, 1.0))
+        pace = np.where(has("Winger"), 16.0, 12.0)
+        strength = np.where(has("Striker"), 13.0, np.where(has("Back"), 14.0, 10.0))
+        pace = pace + (-1 + 3 * _unit_batch(seeds, STREAM_PACE))
+        strength = strength + (-2 + 4 * _unit_batch(seeds, STREAM_STRENGTH))
+        physical = np.stack([
+            pace * peak_factor,
+            (pace - 1) * peak_factor,
+            strength * peak_factor,
+            13 * peak_factor,
+            np.full(n, 12.0),
+        ], axis=1)
+
+        # np.rint rounds half to even, exactly like round() in the scalar path
+        return {
+            "technical": np.rint(technical).astype(np.int64),
+            "mental": np.rint(mental).astype(np.int64),
+            "physical": np.rint(physical).astype(np.int64),
+        }
+
+    @classmethod
+    def batch_to_blocks(cls, matrices: Dict[str, np.ndarray]) -> List[dict]:
+        """Converts calculate_batch() output to the per-player JSON structure of generate_full_profile()."""
+        tech_names, mental_names, phys_names = cls.TECHNICAL_ATTRIBUTES, cls.MENTAL_ATTRIBUTES, cls.PHYSICAL_ATTRIBUTES
+        return [
+            {
+                "technical": [{"name": n, "value": v} for n, v in zip(tech_names, tech)],
+                "mental": [{"name": n, "value": v} for n, v in zip(mental_names, mental)],
+                "physical": [{"name": n, "value": v} for n, v in zip(phys_names, phys)],
+            }
+            for tech, mental, phys in zip(
+                matrices["technical"].tolist(), matrices["mental"].tolist(), matrices["physical"].tolist()
+            )
+        ]
+
+    @classmethod
+    def calculate_batch_for_players(cls, players: list) -> List[dict]:
+        """generate_full_profile() for many Player rows in one vectorized pass."""
+        if not players:
+            return []
+        import pandas as pd
+        raw = [p.attributes or {} for p in players]
+        frame = pd.DataFrame({
+            name: [float(r.get(name, 0) or 0) for r in raw]
+            for name in cls.BATCH_STAT_COLUMNS + ["xG"]
+        })
+        frame["age"] = [p.age for p in players]
+        frame["position"] = [p.position for p in players]
+        seeds = np.array([cls.player_seed(p.id) for p in players], dtype=np.uint64)
+        matrices = cls.calculate_batch(frame, seeds=seeds)
+        return cls.batch_to_blocks(matrices)
+
+    @staticmethod
+    def needs_attribute_calc(player_model) -> bool:
+        """Flat stat dumps (keys like "Goals", "npxG") or missing attributes get modelled 0-20 blocks."""
+        attrs = player_model.attributes
+        return not attrs or "Goals" in attrs
+
+    @classmethod
+    def source_fingerprint(cls, player_model) -> str:
+        """Hash of every input the derived profile depends on."""
+        source = [
+            player_model.attributes or {},
+            player_model.position,
+            player_model.age,
+            player_model.market_value,
+            player_model.league,
+            bool(player_model.value_history),
+            bool(player_model.agent_info),
+        ]
+        payload = json.dumps(source, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    @classmethod
+    def build_derived_profile(cls, player_model, attributes: Optional[dict] = None) -> dict:
+        """
+        Everything the player detail view derives from raw data.
+        Only keys that override the stored row are included.
+        `attributes` lets batch callers pass blocks precomputed by calculate_batch_for_players().
+        """
+        rng = cls.rng_for(player_model.id)
+        derived = {}
+
+        if cls.needs_attribute_calc(player_model):
+            derived["attributes"] = attributes or cls.generate_full_profile(player_model, rng)
+
+            # Add the 'Proof' (Dossier) -> Explain the calculation
+            xg = player_model.attributes.get("npxG", 0) if player_model.attributes else 0
+            goals = player_model.attributes.get("Goals", 0) if player_model.attributes else 0
+            derived["scientific_dossier"] = f"ANALYSIS: Finishing rating derived from {goals} Goals vs {xg} xG. " \
+                                            f"Mental composure calculated from conversion rate efficiency. " \
+                                            f"Physical profile modeled on {player_model.age}-year-old {player_model.position} baseline."
+
+        # Data Enrichment (Agent & History)
+        if not player_model.value_history:
+            derived["value_history"] = cls.generate_value_history(player_model.market_value, player_model.age)
+
+        if not player_model.agent_info:
+            derived["agent_info"] = cls.generate_agent_profile(player_model.league, rng)
+
+        return derived
@@ -0,0 +1,44 @@
+from typing import List, Optional
+from sqlmodel import Session, select
+from app.models.chat import Message, ArchivedMessage
+
+MAX_HISTORY_PAGE = 200
+
+class ChatArchive:
+    """
+    Two-tier chat storage: recent messages in `message`, older ones moved to
+    `archivedmessage` by the retention engine with their ids intact, so id-based
+    paging runs across both.
+    """
+
+    def history(self, session: Session, channel_id: int, before: Optional[int] = None,
+                after: Optional[int] = None, limit: int = 50) -> List[Message]:
+        """
+        One page of a channel in chronological order. Without bounds: the latest `limit`
+        messages. `before`/`after` are message ids; older pages continue into the archive.
+        """
+        limit = max(1, min(limit, MAX_HISTORY_PAGE))
+        if after is not None:
+            # Anything newer than a message a client has already seen is still live
+            return session.exec(
+                select(Message).where(Message.channel_id == channel_id, Message.id > after)
+                .order_by(Message.id).limit(limit)
+            ).all()
+
+        statement = select(Message).where(Message.channel_id == channel_id)
+        if before is not None:
+            statement = statement.where(Message.id < before)
+        page = list(session.exec(statement.order_by(Message.id.desc()).limit(limit)).all())
+
+        if len(page) < limit:
+            older_than = page[-1].id if page else before
+            archived = select(ArchivedMessage).where(ArchivedMessage.channel_id == channel_id)
+            if older_than is not None:
+                archived = archived.where(ArchivedMessage.id < older_than)
+            rows = session.exec(archived.order_by(ArchivedMessage.id.desc()).limit(limit - len(page))).all()
+            page.extend(Message(**row.model_dump(exclude={"archived_at"})) for row in rows)
+
+        page.reverse()
+        return page
+
+chat_archive = ChatArchive()
@@ -1,12 +1,24 @@
 import json
 import os
+import time
+from types import SimpleNamespace
 from typing import Dict, List, Any
-from sqlmodel import Session, select
+from sqlmodel import Session, select, delete
 from app.models.player import Player, Shortlist, ShortlistPlayerLink
 from app.core.db import engine
+from app.utils.market_value import parse_market_value
+from app.services.profile_store import ProfileStore
+from app.services.heatmap_store import HeatmapStore
+from app.utils.bulk import column_names, model_defaults, upsert_rows
+from app.utils.positions import classify
+from app.services.similarity import similarity_engine
+from app.core.cache import response_cache, PLAYERS, SHORTLISTS
+
+PLAYER_COLUMNS = column_names(Player)
 
 class DataSyncService:
     MASTER_DB_PATH = "data/master_db_2025.json"
+    CHUNK_SIZE = 1000
 
     def __init__(self):
         self.base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,81 +31,129 @@ class DataSyncService:
         with open(self.file_path, "r", encoding="utf-8") as f:
             return json.load(f)
 
-    def sync_database(self) -> Dict[str, int]:
+    def sync_database(self) -> Dict[str, Any]:
+        """
+        Set-based sync of the master file: keys are preloaded once, each chunk is
+        diffed against its existing rows, written with a bulk upsert and committed
+        together with its shortlist memberships.
+        """
         stats = {"updated": 0, "created": 0, "transfers": 0, "unchanged": 0}
+        started = time.perf_counter()
         
         data = self.load_master_data()
         players_data = data.get("players", [])
+        changed_ids = []
         
         with Session(engine) as session:
             # Pre-fetch contexts (Shortlists)
             sl_targets = session.exec(select(Shortlist).where(Shortlist.name == "Global Scouting Targets")).first()
             sl_squad = session.exec(select(Shortlist).where(Shortlist.name == "Ajax First Team")).first()
-            
-            # Helper to manage list membership
-            def update_list_membership(player_id, new_category):
-                # Clear existing links to these specific lists
-                links = session.exec(select(ShortlistPlayerLink).where(ShortlistPlayerLink.player_id == player_id)).all()
-                for link in links:
-                    if link.shortlist_id in [sl_targets.id, sl_squad.id]:
-                        session.delete(link)
-                
-                # Add new link
-                target_list = sl_squad if new_category == "Ajax First Team" else sl_targets
-                if target_list:
-                    session.add(ShortlistPlayerLink(shortlist_id=target_list.id, player_id=player_id))
-
-            for p_data in players_data:
-                fm_id = p_data.get("fm_id")
-                p_id = p_data.get("id")
-                
-                # Meta fields
-                shortlist_category = p_data.pop("shortlist_category", "Global Scouting Targets")
-                is_shortlisted = p_data.pop("is_shortlisted", False)
-
-                # Find existing
-                existing = None
-                if fm_id:
-                    existing = session.exec(select(Player).where(Player.fm_id == fm_id)).first()
-                if not existing:
-                    existing = session.exec(select(Player).where(Player.id == p_id)).first()
-                
-                if existing:
-                    # Check for Transfer (Club Change)
-                    if existing.club != p_data.get("club"):
-                        stats["transfers"] += 1
-                        # If transfer happens, we might need to change list membership logic here 
-                        # but for now we trust the master DB's 'shortlist_category'
-                    
-                    # Update fields
-                    has_changes = False
-                    for key, value in p_data.items():
-                        if getattr(existing, key) != value:
-                            setattr(existing, key, value)
-                            has_changes = True
-                    
-                    if has_changes:
-                        session.add(existing)
-                        stats["updated"] += 1
-                    else:
-                        stats["unchanged"] += 1
-                    
-                    # Update List Membership
-                    if is_shortlisted:
-                        update_list_membership(existing.id, shortlist_category)
+            list_ids = {
+                "Global Scouting Targets": sl_targets.id if sl_targets else None,
+                "Ajax First Team": sl_squad.id if sl_squad else None,
+            }
 
-                else:
-                    # Create New
-                    new_player = Player(**p_data)
-                    session.add(new_player)
-                    session.commit() # Commit to get ID
-                    session.refresh(new_player)
-                    
-                    if is_shortlisted:
-                        update_list_membership(new_player.id, shortlist_category)
-                    
-                    stats["created"] += 1
-
-            session.commit()
-            
+            # One pass over the key columns instead of two lookups per incoming player
+            id_by_fm_id = {}
+            known_ids = set()
+            for player_id, fm_id in session.exec(select(Player.id, Player.fm_id)).all():
+                known_ids.add(player_id)
+                if fm_id is not None:
+                    id_by_fm_id[fm_id] = player_id
+
+            for start in range(0, len(players_data), self.CHUNK_SIZE):
+                chunk = players_data[start:start + self.CHUNK_SIZE]
+                changed_ids.extend(self._sync_chunk(
+                    session, chunk, id_by_fm_id, known_ids, stats, list_ids
+                ))
+                session.commit()
+                session.expunge_all()
+
+            similarity_engine.refresh(session, changed_ids)
+            response_cache.invalidate(PLAYERS, SHORTLISTS)
+
+        elapsed = time.perf_counter() - started
+        stats["duration_s"] = round(elapsed, 3)
+        stats["rows_per_sec"] = round(len(players_data) / elapsed, 1) if elapsed > 0 else 0.0
         return stats
+
+    def _sync_chunk(self, session: Session, chunk: List[Dict], id_by_fm_id: Dict, known_ids: set,
+                    stats: Dict, list_ids: Dict[str, int]) -> List[str]:
+        """Upserts one chunk of master records; returns the ids of rows that were written."""
+        # Resolve every record to its existing row id (fm_id first, then id)
+        resolved = []
+        for record in chunk:
+            p_data = dict(record)
+            # Meta fields
+            shortlist_category = p_data.pop("shortlist_category", "Global Scouting Targets")
+            is_shortlisted = p_data.pop("is_shortlisted", False)
+
+            # Derived columns
+            if "market_value" in p_data:
+                p_data["market_value_m"] = parse_market_value(p_data["market_value"])
+            if "position" in p_data:
+                p_data.update(classify(p_data["position"]))
+
+            p_data = {k: v for k, v in p_data.items() if k in PLAYER_COLUMNS}
+            existing_id = id_by_fm_id.get(p_data.get("fm_id")) if p_data.get("fm_id") else None
+            if existing_id is None and p_data.get("id") in known_ids:
+                existing_id = p_data["id"]
+            resolved.append((p_data, existing_id, is_shortlisted, shortlist_category))
+
+        existing_ids = [existing_id for _, existing_id, _, _ in resolved if existing_id]
+        existing_rows = {
+            row.id: dict(row._mapping)
+            for row in session.exec(select(*Player.__table__.columns).where(Player.id.in_(existing_ids))).all()
+        } if existing_ids else {}
+
+        # Target state of every changed/new row; plain rows skip ORM instance construction.
+        # Default containers are shared between new rows: they are only serialized, never mutated.
+        defaults = model_defaults(Player)
+        pending = []
+        memberships = {}
+        for p_data, existing_id, is_shortlisted, shortlist_category in resolved:
+            current = existing_rows.get(existing_id)
+            if current:
+                # Check for Transfer (Club Change)
+                if current["club"] != p_data.get("club"):
+                    stats["transfers"] += 1
+
+                # The primary key stays stable even if the master file renamed the slug
+                p_data["id"] = current["id"]
+                if all(current[k] == v for k, v in p_data.items()):
+                    stats["unchanged"] += 1
+                else:
+                    pending.append(SimpleNamespace(**{**current, **p_data}))
+                    stats["updated"] += 1
+            else:
+                pending.append(SimpleNamespace(**{**defaults, **p_data}))
+                known_ids.add(p_data["id"])
+                if p_data.get("fm_id"):
+                    id_by_fm_id[p_data["fm_id"]] = p_data["id"]
+                stats["created"] += 1
+
+            if is_shortlisted:
+                target_list = "Ajax First Team" if shortlist_category == "Ajax First Team" else "Global Scouting Targets"
+                memberships[p_data["id"]] = list_ids[target_list]
+
+        ProfileStore.apply_batch(pending)
+        rows = [vars(p) for p in pending]
+        upsert_rows(session, Player, rows, key_columns=["id"])
+        HeatmapStore.apply_batch(session, pending)
+        self._reconcile_memberships(session, memberships, [i for i in list_ids.values() if i is not None])
+        return [row["id"] for row in rows]
+
+    @staticmethod
+    def _reconcile_memberships(session: Session, memberships: Dict[str, int], managed_lists: List[int]):
+        """Moves shortlisted players into their category list with one DELETE and one INSERT per chunk."""
+        if not memberships or not managed_lists:
+            return
+        session.execute(delete(ShortlistPlayerLink).where(
+            ShortlistPlayerLink.player_id.in_(list(memberships.keys())),
+            ShortlistPlayerLink.shortlist_id.in_(managed_lists)
+        ))
+        links = [
+            {"shortlist_id": shortlist_id, "player_id": player_id}
+            for player_id, shortlist_id in memberships.items() if shortlist_id is not None
+        ]
+        upsert_rows(session, ShortlistPlayerLink, links, key_columns=["shortlist_id", "player_id"], update_columns=[])
@@ -1,8 +1,11 @@
-from typing import List, Dict, Any
-from sqlmodel import Session, select
+from typing import List, Dict, Any, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.player import Player
-from app.core.db import engine
-import random
+from app.schemas.player import PLAYER_SUMMARY_COLUMNS, select_player_summary, to_summary
+from app.services.similarity import similarity_engine
+from app.utils.positions import position_codes
 
 class DirectorIntelService:
     """
@@ -23,86 +26,124 @@ class DirectorIntelService:
         "ST": 2
     }
     
-    def analyze_squad_health(self, club: str = "Ajax") -> Dict[str, Any]:
-        with Session(engine) as session:
-            # Fetch all squad players
-            statement = select(Player).where(Player.club == club)
-            squad = session.exec(statement).all()
-            
-            roster_map = {role: [] for role in self.REQUIRED_Roles.keys()}
-            
-            for p in squad:
-                # Naive position mapping
-                pos = p.position.upper()
-                if pos in roster_map:
-                    roster_map[pos].append(p)
-                elif "/" in pos:
-                    # Handle "LCB/LB" -> LCB (mapped to CB)
-                    main_pos = pos.split("/")[0]
-                    if "CB" in main_pos: main_pos = "CB"
-                    if main_pos in roster_map:
-                        roster_map[main_pos].append(p)
-                        
-            # Identify Gaps
-            gaps = []
-            for role, required in self.REQUIRED_Roles.items():
-                current = len(roster_map[role])
-                if current < required:
-                    gaps.append({
-                        "role": role,
-                        "current": current,
-                        "required": required,
-                        "severity": "CRITICAL" if current == 0 else "HIGH"
-                    })
-                    
-            return {
-                "club": club,
-                "squad_size": len(squad),
-                "gaps": gaps,
-                "health_score": max(0, 100 - (len(gaps) * 15))
-            }
+    # Candidate pool per gap role from the window query, re-ranked by profile fit
+    CANDIDATE_POOL = 10
+    TARGETS_PER_ROLE = 2
+    MAX_TARGET_AGE = 25  # Director preference: Young/Prime
+
+    async def analyze_squad_health(self, session: AsyncSession, club: str = "Ajax") -> Dict[str, Any]:
+        # Composition as one grouped COUNT over the (club, position_code) index
+        counts = dict((await session.exec(
+            select(Player.position_code, func.count()).where(Player.club == club).group_by(Player.position_code)
+        )).all())
+        composition = {role: counts.get(role, 0) for role in self.REQUIRED_Roles}
+
+        # Labels without a side ("Winger", "Full Back") have no code but a known role group;
+        # each such player covers whichever of its roles is furthest below requirement
+        flexible = (await session.exec(
+            select(Player.position, func.count())
+            .where(Player.club == club, Player.position_code.is_(None), Player.role_group.is_not(None))
+            .group_by(Player.position)
+        )).all()
+        for position, count in flexible:
+            roles = [code for code in position_codes(position) if code in composition]
+            for _ in range(count if roles else 0):
+                role = max(roles, key=lambda r: self.REQUIRED_Roles[r] - composition[r])
+                composition[role] += 1
 
-    def get_priority_targets(self, limit: int = 5) -> List[Dict]:
+        # Identify Gaps
+        gaps = []
+        for role, required in self.REQUIRED_Roles.items():
+            current = composition[role]
+            if current < required:
+                gaps.append({
+                    "role": role,
+                    "current": current,
+                    "required": required,
+                    "severity": "CRITICAL" if current == 0 else "HIGH"
+                })
+                
+        return {
+            "club": club,
+            "squad_size": sum(counts.values()),
+            "composition": composition,
+            "gaps": gaps,
+            "health_score": max(0, 100 - (len(gaps) * 15))
+        }
+
+    async def get_priority_targets(self, session: AsyncSession, limit: int = 5, club: str = "Ajax",
+                                   analysis: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """
         Fetches transfer targets that specifically fill the identified gaps.
+        Pass `analysis` when the squad health of `club` is already at hand.
         """
-        analysis = self.analyze_squad_health("Ajax")
+        if analysis is None:
+            analysis = await self.analyze_squad_health(session, club)
         gaps = analysis["gaps"]
         
         if not gaps:
             # Fallback if no gaps: Just get high potential young players
-            with Session(engine) as session:
-                statement = select(Player).where(Player.age <= 23).order_by(Player.predicted_growth.desc()).limit(limit)
-                results = session.exec(statement).all()
-                return [self._enrich_target(p, "Elite Talent") for p in results]
+            statement = select_player_summary().where(Player.age <= 23).order_by(Player.predicted_growth.desc()).limit(limit)
+            results = (await session.exec(statement)).all()
+            return [self._enrich_target(p, "Elite Talent") for p in results]
+
+        roles = [gap["role"] for gap in gaps]
+        candidates_by_role = await self._candidates(session, roles, club)
+
+        # Current holders define the profile to replace; an empty role scores against the positional archetype
+        holders_by_role = {role: [] for role in roles}
+        for player_id, role in (await session.exec(
+            select(Player.id, Player.position_code).where(Player.club == club, Player.position_code.in_(roles))
+        )).all():
+            holders_by_role[role].append(player_id)
 
-        # Strategic Search for Gaps
+        def fit_scores():
+            # Pooled candidates and holders may be newer than the loaded matrix
+            similarity_engine.warm(
+                [c.id for pool in candidates_by_role.values() for c in pool]
+                + [pid for holders in holders_by_role.values() for pid in holders]
+            )
+            return {
+                role: similarity_engine.score_prototype(
+                    [c.id for c in candidates_by_role.get(role, [])], holders_by_role[role],
+                    position=role, exclude_club=club, max_age=self.MAX_TARGET_AGE
+                )
+                for role in roles
+            }
+
+        # Profile fit of the pooled candidates (numpy scoring runs off the event loop)
+        scores_by_role = await run_in_threadpool(fit_scores)
         targets = []
-        with Session(engine) as session:
-            for gap in gaps:
-                role = gap["role"]
-                # Find players of this position, NOT in our club, High Potential
-                statement = select(Player).where(
-                    Player.position == role,
-                    Player.club != "Ajax",
-                    Player.age <= 25  # Director preference: Young/Prime
-                ).order_by(Player.metrics.desc()) # Naive "best" sort - simplified
-                
-                # We need a proper sort. Let's sort by market_value as proxy for quality for now
-                # Or better: random valid choice to simulate scouting variety
-                candidates = session.exec(statement).all()
-                
-                # Filter strictly by complexity if needed? No, just pick top 1-2
-                candidates = sorted(candidates, key=lambda x: x.predicted_growth, reverse=True)[:2]
-                
-                for c in candidates:
-                    targets.append(self._enrich_target(c, f"Direct Replacement: {role}"))
+        for role in roles:
+            scores = scores_by_role[role]
+            ranked = sorted(candidates_by_role.get(role, []), key=lambda c: scores.get(c.id, 0.0), reverse=True)
+            for c in ranked[:self.TARGETS_PER_ROLE]:
+                targets.append(self._enrich_target(c, f"Direct Replacement: {role}", scores.get(c.id)))
                     
         return targets[:limit]
 
-    def _enrich_target(self, player: Player, reason: str) -> Dict:
-        """Adds DNA Context to the player object."""
-        result = player.model_dump(exclude={"attributes", "metrics", "medical_dna", "physical_metrics", "cognitive_profile", "biometric_profile", "scientific_dossier"})
+    async def _candidates(self, session: AsyncSession, roles: List[str], club: str) -> Dict[str, List]:
+        """Top CANDIDATE_POOL players per role outside the club, in one window-function query."""
+        rank = func.row_number().over(
+            partition_by=Player.position_code,
+            order_by=(Player.predicted_growth.desc(), Player.id)
+        ).label("role_rank")
+        pool = select(*PLAYER_SUMMARY_COLUMNS, Player.position_code, rank).where(
+            Player.position_code.in_(roles), Player.club != club, Player.age <= self.MAX_TARGET_AGE
+        ).subquery()
+        rows = (await session.execute(
+            select(pool).where(pool.c.role_rank <= self.CANDIDATE_POOL).order_by(pool.c.position_code, pool.c.role_rank)
+        )).all()
+
+        candidates = {}
+        for row in rows:
+            candidates.setdefault(row.position_code, []).append(row)
+        return candidates
+
+    def _enrich_target(self, player, reason: str, match_score: Optional[float] = None) -> Dict:
+        """Adds DNA Context to a PlayerSummary row."""
+        result = to_summary(player).model_dump()
         result["recruitment_reason"] = reason
-        result["match_score"] = random.randint(88, 99) # Simulated "System Fit"
+        # Profile similarity to the gap; None when there is nothing to measure it against
+        result["match_score"] = match_score
         return result
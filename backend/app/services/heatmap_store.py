@@ -0,0 +1,208 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+from app.analytics.xt_model import cell_indices
+from app.models.player import Player, PlayerHeatmap
+from app.utils.bulk import upsert_rows
+from app.utils.positions import codes_for, parts
+
+HEATMAP_ROWS, HEATMAP_COLS = 8, 12
+EVENTS, POSITIONAL = "events", "positional"
+
+# Zone anchors (x, y, spread) per position code on a 0-100 pitch: attacking towards
+# x=100, y=0 is the left touchline. Composite codes ("LCB/LB") blend their parts.
+ANCHORS = {
+    "GK": (5, 50, 0.35),
+    "CB": (22, 50, 1.0), "LCB": (22, 33, 1.0), "RCB": (22, 67, 1.0),
+    "LB": (38, 10, 1.1), "RB": (38, 90, 1.1), "LWB": (50, 8, 1.2), "RWB": (50, 92, 1.2),
+    "DM": (36, 50, 1.0), "CDM": (36, 50, 1.0),
+    "CM": (52, 50, 1.2), "LCM": (52, 35, 1.2), "RCM": (52, 65, 1.2),
+    "LM": (60, 12, 1.1), "RM": (60, 88, 1.1),
+    "AM": (68, 50, 1.1), "CAM": (68, 50, 1.1),
+    "LW": (76, 12, 1.1), "RW": (76, 88, 1.1),
+    "CF": (80, 50, 1.0), "ST": (86, 50, 0.9), "LS": (86, 40, 0.9), "RS": (86, 60, 0.9),
+}
+SECONDARY_WEIGHT = 0.6
+
+def _codes(position: str) -> List[str]:
+    """Anchor codes of every part; sided detail ("LCB") is kept, anything else goes through the taxonomy."""
+    codes = []
+    for token in parts(position):
+        codes.extend([token] if token in ANCHORS else codes_for(token))
+    return codes or ["CM"]
+
+def _normalize(grid: np.ndarray) -> np.ndarray:
+    peak = grid.max()
+    return grid / peak if peak > 0 else grid
+
+@lru_cache(maxsize=1024)
+def _positional_grid(position: str, pace_bucket: int) -> np.ndarray:
+    """Gaussian mixture around the zone anchors; quicker players cover more ground."""
+    xs = (np.arange(HEATMAP_COLS) + 0.5) * 100 / HEATMAP_COLS
+    ys = (np.arange(HEATMAP_ROWS) + 0.5) * 100 / HEATMAP_ROWS
+    mobility = 1.0 + pace_bucket / 20
+    grid = np.zeros((HEATMAP_ROWS, HEATMAP_COLS))
+    for i, code in enumerate(_codes(position)):
+        x, y, spread = ANCHORS[code]
+        sx, sy = 11 * spread * mobility, 9 * spread * mobility
+        weight = 1.0 if i == 0 else SECONDARY_WEIGHT
+        grid += weight * np.outer(np.exp(-0.5 * ((ys - y) / sy) ** 2), np.exp(-0.5 * ((xs - x) / sx) ** 2))
+    grid = _normalize(grid)
+    grid.setflags(write=False)
+    return grid
+
+class HeatmapStore:
+    """
+    Per-player spatial density grids, computed at ingest/sync time and stored as
+    float16 blobs in `playerheatmap`, so the heatmap endpoint is one keyed read.
+    Grids aggregated from event coordinates (ingest_events) take precedence;
+    players without events get a deterministic positional model, recomputed only
+    when its inputs (position, pace bucket, VERSION) change.
+    """
+
+    VERSION = "2"
+    BATCH_SIZE = 2000
+
+    @classmethod
+    def fingerprint(cls, player) -> str:
+        return f"{cls.VERSION}:{player.position}:{int(player.pace or 0) // 10}"
+
+    @staticmethod
+    def positional(player) -> np.ndarray:
+        return _positional_grid(player.position or "", int(player.pace or 0) // 10)
+
+    @staticmethod
+    def encode(grid: np.ndarray) -> Tuple[bytes, str]:
+        blob = np.ascontiguousarray(grid, dtype="<f2").tobytes()
+        digest = hashlib.sha1(blob + f"{grid.shape}".encode()).hexdigest()[:16]
+        return blob, f'"{digest}"'
+
+    @staticmethod
+    def decode(heatmap: PlayerHeatmap) -> np.ndarray:
+        return np.frombuffer(heatmap.grid, dtype="<f2").reshape(heatmap.rows, heatmap.cols)
+
+    @staticmethod
+    def to_payload(grid: np.ndarray) -> List[List[float]]:
+        """rows x cols list, 0-1 with 3 decimals (the precision float16 keeps)."""
+        return np.round(grid.astype(np.float32), 3).tolist()
+
+    @classmethod
+    def build(cls, player_id: str, grid: np.ndarray, source: str, events: int = 0,
+              fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        blob, etag = cls.encode(grid)
+        return {
+            "player_id": player_id, "rows": grid.shape[0], "cols": grid.shape[1], "grid": blob,
+            "source": source, "events": events, "fingerprint": fingerprint, "etag": etag,
+            "updated_at": datetime.now(timezone.utc),
+        }
+
+    @classmethod
+    def transient(cls, player) -> PlayerHeatmap:
+        """Unstored positional heatmap, for rows written before the backfill ran."""
+        return PlayerHeatmap(**cls.build(player.id, cls.positional(player), POSITIONAL,
+                                         fingerprint=cls.fingerprint(player)))
+
+    @classmethod
+    def apply_batch(cls, session: Session, players: List) -> int:
+        """
+        Upserts positional grids for the given rows (ORM objects or namespaces with
+        id/position/pace) where missing or stale. Event grids are left alone; the
+        caller commits. Returns the number of grids written.
+        """
+        if not players:
+            return 0
+        stored = {
+            player_id: (source, fingerprint)
+            for player_id, source, fingerprint in session.exec(
+                select(PlayerHeatmap.player_id, PlayerHeatmap.source, PlayerHeatmap.fingerprint)
+                .where(PlayerHeatmap.player_id.in_([p.id for p in players]))
+            ).all()
+        }
+        rows = []
+        for player in players:
+            fingerprint = cls.fingerprint(player)
+            current = stored.get(player.id)
+            if current and (current[0] == EVENTS or current[1] == fingerprint):
+                continue
+            rows.append(cls.build(player.id, cls.positional(player), POSITIONAL, fingerprint=fingerprint))
+        upsert_rows(session, PlayerHeatmap, rows, key_columns=["player_id"])
+        return len(rows)
+
+    @classmethod
+    def refresh_stale(cls, engine: Engine) -> int:
+        """Backfills players without a current heatmap (keyset batches, id/position/pace only)."""
+        refreshed = 0
+        last_id = ""
+        with Session(engine) as session:
+            while True:
+                batch = session.exec(
+                    select(Player.id, Player.position, Player.pace)
+                    .where(Player.id > last_id).order_by(Player.id).limit(cls.BATCH_SIZE)
+                ).all()
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                refreshed += cls.apply_batch(session, batch)
+                session.commit()
+
+        if refreshed:
+            print(f"HeatmapStore: computed {refreshed} positional heatmaps (model {cls.VERSION})")
+        return refreshed
+
+    @classmethod
+    def ingest_events(cls, engine: Engine, events: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Aggregates event start coordinates into one density grid per player in a
+        single bincount. player_id may hold player ids or fm_ids; unknown ids are skipped.
+        """
+        if "player_id" not in events.columns:
+            raise ValueError("Events need a player_id column to build heatmaps")
+        events = events.dropna(subset=["player_id", "start_x", "start_y"])
+        keys = events["player_id"]
+        if pd.api.types.is_float_dtype(keys):
+            keys = keys.astype(np.int64)
+        codes, uniques = pd.factorize(keys.astype(str))
+
+        gx, gy = cell_indices(events["start_x"].to_numpy(), events["start_y"].to_numpy(), (HEATMAP_COLS, HEATMAP_ROWS))
+        cells = HEATMAP_ROWS * HEATMAP_COLS
+        counts = np.bincount(codes * cells + gy * HEATMAP_COLS + gx, minlength=len(uniques) * cells)
+        counts = counts.reshape(len(uniques), HEATMAP_ROWS, HEATMAP_COLS)
+
+        with Session(engine) as session:
+            resolved = cls._resolve_ids(session, list(uniques))
+            rows = [
+                cls.build(resolved[key], _normalize(counts[i].astype(np.float64)), EVENTS, int(counts[i].sum()))
+                for i, key in enumerate(uniques) if key in resolved
+            ]
+            for start in range(0, len(rows), cls.BATCH_SIZE):
+                upsert_rows(session, PlayerHeatmap, rows[start:start + cls.BATCH_SIZE], key_columns=["player_id"])
+            session.commit()
+
+        return {
+            "events": int(len(events)),
+            "players": len(rows),
+            "unmatched_ids": len(uniques) - len(rows),
+        }
+
+    @staticmethod
+    def _resolve_ids(session: Session, keys: List[str]) -> Dict[str, str]:
+        """Event player keys -> player.id, matching the id first and the numeric fm_id second."""
+        resolved = {}
+        for start in range(0, len(keys), HeatmapStore.BATCH_SIZE):
+            chunk = keys[start:start + HeatmapStore.BATCH_SIZE]
+            resolved.update({
+                player_id: player_id
+                for player_id in session.exec(select(Player.id).where(Player.id.in_(chunk))).all()
+            })
+            fm_ids = [int(k) for k in chunk if k not in resolved and k.isdigit()]
+            if fm_ids:
+                resolved.update({
+                    str(fm_id): player_id
+                    for player_id, fm_id in session.exec(select(Player.id, Player.fm_id).where(Player.fm_id.in_(fm_ids))).all()
+                })
+        return resolved
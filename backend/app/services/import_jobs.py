@@ -0,0 +1,128 @@
+import os
+import csv
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session, select
+from app.core.db import engine
+from app.models.import_job import ImportJob
+from app.services.player_import import PlayerImportService
+
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "2"))
+REPORT_DIR = os.getenv(
+    "IMPORT_REPORT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "import_reports")
+)
+
+class ImportJobManager:
+    """
+    Runs player imports off the request path. An upload is spooled to disk,
+    recorded as a QUEUED ImportJob and handed to a small worker pool; the worker
+    writes counters back to the job row after every chunk so any API process can
+    report progress, and streams per-row errors into a CSV report.
+    """
+
+    def __init__(self, import_service: PlayerImportService, workers: int = IMPORT_WORKERS):
+        self.import_service = import_service
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import")
+
+    def submit(self, path: str, filename: str) -> ImportJob:
+        job = ImportJob(id=str(uuid.uuid4()), filename=filename)
+        with Session(engine) as session:
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+        self.executor.submit(self._run, job.id, path)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with Session(engine) as session:
+            return session.get(ImportJob, job_id)
+
+    def recent(self, limit: int = 20) -> List[ImportJob]:
+        with Session(engine) as session:
+            return session.exec(select(ImportJob).order_by(ImportJob.created_at.desc()).limit(limit)).all()
+
+    def recover(self):
+        """Jobs interrupted by a restart cannot resume: their spool file is gone."""
+        with Session(engine) as session:
+            for job in session.exec(select(ImportJob).where(ImportJob.status.in_(["QUEUED", "RUNNING"]))).all():
+                job.status = "FAILED"
+                job.error = "Interrupted by server restart"
+                job.finished_at = datetime.now(timezone.utc)
+                session.add(job)
+            session.commit()
+
+    # --- Worker ---
+
+    def _run(self, job_id: str, path: str):
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        report_path = os.path.join(REPORT_DIR, f"{job_id}.csv")
+        report_file = None
+
+        def error_sink(errors: List[Dict[str, Any]]):
+            nonlocal report_file
+            if not errors:
+                return
+            if report_file is None:
+                report_file = open(report_path, "w", newline="", encoding="utf-8")
+                csv.writer(report_file).writerow(["row", "error"])
+            csv.writer(report_file).writerows([e["row"], e["error"]] for e in errors)
+            report_file.flush()
+
+        def progress(stats: Dict[str, Any], fraction: float):
+            self._update(job_id, **self._counters(stats), progress=round(fraction, 4))
+
+        self._update(job_id, status="RUNNING", started_at=datetime.now(timezone.utc))
+        final = {}
+        try:
+            stats = self.import_service.import_file(path, progress=progress, error_sink=error_sink)
+            final = {"status": "COMPLETED", "progress": 1.0, **self._counters(stats)}
+        except ValueError as e:
+            final = {"status": "FAILED", "error": str(e)}
+        except Exception as e:
+            final = {"status": "FAILED", "error": f"Could not parse file: {str(e)}"}
+        finally:
+            os.remove(path)
+            if report_file is not None:
+                report_file.close()
+                final["report_path"] = report_path
+            # Status flips last, together with the report, so pollers never see a half-finished job
+            self._update(job_id, finished_at=datetime.now(timezone.utc), **final)
+
+    @staticmethod
+    def _counters(stats: Dict[str, Any]) -> Dict[str, int]:
+        return {
+            "rows_parsed": stats["total_rows_processed"],
+            "rows_inserted": stats["players_added"],
+            "rows_skipped": stats["duplicates_skipped"],
+            "rows_failed": stats["failed"],
+        }
+
+    @staticmethod
+    def _update(job_id: str, **fields):
+        with Session(engine) as session:
+            job = session.get(ImportJob, job_id)
+            for key, value in fields.items():
+                setattr(job, key, value)
+            session.add(job)
+            session.commit()
+
+    # --- Reporting ---
+
+    @staticmethod
+    def describe(job: ImportJob) -> Dict[str, Any]:
+        """Job row plus derived throughput and ETA."""
+        data = job.model_dump(exclude={"report_path"})
+        # Drivers without timezone support hand back naive UTC values
+        end = job.finished_at or datetime.now(job.started_at.tzinfo if job.started_at else timezone.utc)
+        elapsed = (end - job.started_at).total_seconds() if job.started_at else 0.0
+        data["elapsed_s"] = round(elapsed, 1)
+        data["rows_per_sec"] = round(job.rows_parsed / elapsed, 1) if elapsed > 0 else 0.0
+        if job.status == "RUNNING" and 0 < job.progress < 1:
+            data["eta_s"] = round(elapsed * (1 - job.progress) / job.progress, 1)
+        else:
+            data["eta_s"] = 0.0 if job.status in ("COMPLETED", "FAILED") else None
+        data["has_error_report"] = job.report_path is not None
+        return data
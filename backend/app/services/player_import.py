@@ -0,0 +1,316 @@
+import os
+import time
+import uuid
+import tempfile
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from fastapi import UploadFile
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+from app.core.db import engine
+from app.core.database import LEAGUE_STRENGTH
+from app.models.player import Player
+from app.utils.bulk import model_defaults
+from app.utils.positions import position_code, role_group
+from app.utils.market_value import parse_market_value
+from app.services.profile_store import ProfileStore
+from app.services.heatmap_store import HeatmapStore
+from app.services.similarity import similarity_engine
+from app.core.cache import response_cache, PLAYERS
+
+# Mapping Aliases for Robust Ingestion
+ATTRIBUTE_MAP = {
+    "technical": ["finishing", "passing", "dribbling", "first touch", "touch", "tackling", "crossing", "heading", "long shots", "marking", "technique", "corners", "free kick", "penalties"],
+    "mental": ["aggression", "anticipation", "bravery", "composure", "concentration", "decisions", "determination", "flair", "leadership", "off the ball", "positioning", "teamwork", "vision", "work rate"],
+    "physical": ["acceleration", "agility", "balance", "jumping reach", "natural fitness", "pace", "stamina", "strength", "speed"]
+}
+
+HEADER_ALIASES = {
+    "name": ["player", "full name", "full_name"],
+    "club": ["team", "side"],
+    "position": ["pos", "role"],
+    "age": ["years"],
+    "league": ["competition", "division"],
+    "nationality": ["nation", "country"],
+    "market_value": ["value", "price", "valuation"],
+    "predicted_growth": ["growth", "potential_growth"],
+}
+
+REQUIRED_COLUMNS = ["name", "club", "position", "age"]
+
+STATS_MAP = {
+    "pace": ["pace", "acceleration", "speed"],
+    "shooting": ["shooting", "finishing", "long shots"],
+    "passing": ["passing", "vision", "crossing"],
+    "dribbling": ["dribbling", "flair", "technique"],
+    "defending": ["defending", "tackling", "marking", "positioning"],
+    "physical": ["physical", "strength", "stamina", "agility"]
+}
+
+# Technical/mental attributes are scaled by league strength, physical ones are not
+LEAGUE_NORMALIZED = {"technical", "mental"}
+DEFAULT_LEAGUE_FACTOR = 0.70
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx", ".xls")
+
+class PlayerImportService:
+    """
+    Streaming CSV/Excel player import. The upload is spooled to disk and parsed
+    in fixed-size chunks; each chunk is mapped with column operations, checked for
+    name+club duplicates with one query and bulk-inserted, so memory stays flat
+    regardless of file size.
+    """
+
+    CHUNK_SIZE = 5000
+    SPOOL_BLOCK_SIZE = 1 << 20
+    MAX_REPORTED_ERRORS = 1000
+
+    async def spool(self, upload: UploadFile) -> str:
+        """Copies the upload to a temp file block by block; the caller removes it."""
+        suffix = os.path.splitext(upload.filename or "")[1].lower()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, prefix="sb_import_") as tmp:
+            while block := await upload.read(self.SPOOL_BLOCK_SIZE):
+                tmp.write(block)
+        return tmp.name
+
+    # --- Parsing ---
+
+    def iter_chunks(self, path: str) -> Iterator[Tuple[pd.DataFrame, float]]:
+        """Yields (chunk, fraction of the file consumed so far)."""
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".csv":
+            size = os.path.getsize(path) or 1
+            with open(path, "rb") as f:
+                # Everything as text; numeric columns are coerced explicitly per chunk
+                for chunk in pd.read_csv(f, chunksize=self.CHUNK_SIZE, dtype=str, skipinitialspace=True):
+                    # The parser reads ahead, so tell() runs slightly early; fine for progress
+                    yield chunk, min(1.0, f.tell() / size)
+        elif ext == ".xlsx":
+            yield from self._iter_xlsx(path)
+        else:
+            # Legacy .xls has no streaming reader; slice it so the mapping stays chunked
+            df = pd.read_excel(path, dtype=str)
+            for start in range(0, len(df), self.CHUNK_SIZE):
+                yield df.iloc[start:start + self.CHUNK_SIZE], min(1.0, (start + self.CHUNK_SIZE) / max(len(df), 1))
+
+    def _iter_xlsx(self, path: str) -> Iterator[Tuple[pd.DataFrame, float]]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            # max_row comes from the sheet dimension tag and may be missing
+            total = max((sheet.max_row or 0) - 1, 1)
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(h) if h is not None else "" for h in next(rows, [])]
+            buffer = []
+            seen = 0
+            for values in rows:
+                seen += 1
+                if all(v is None for v in values):
+                    continue
+                buffer.append(values)
+                if len(buffer) >= self.CHUNK_SIZE:
+                    yield pd.DataFrame(buffer, columns=header, dtype=object), min(1.0, seen / total)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=header, dtype=object), 1.0
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def resolve_columns(columns) -> Dict[str, str]:
+        """Rename map (raw header -> canonical name), resolved once per file."""
+        normalized = {raw: str(raw).lower().strip() for raw in columns}
+        present = set(normalized.values())
+        renames = {raw: norm for raw, norm in normalized.items()}
+        for target, aliases in HEADER_ALIASES.items():
+            if target in present:
+                continue
+            for alias in aliases:
+                if alias in present:
+                    for raw, norm in normalized.items():
+                        if norm == alias:
+                            renames[raw] = target
+                    present.add(target)
+                    break
+        return renames
+
+    # --- Mapping ---
+
+    def map_chunk(self, df: pd.DataFrame, row_offset: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Vectorized mapping of one renamed chunk to Player row dicts plus per-row errors."""
+        def text(column: str, default: str) -> pd.Series:
+            if column not in df.columns:
+                return pd.Series(default, index=df.index, dtype=object)
+            values = df[column].astype(object).where(df[column].notna(), None)
+            values = values.map(lambda v: str(v).strip() if v is not None else "")
+            return values.where(values != "", default)
+
+        name, club, position = text("name", ""), text("club", ""), text("position", "")
+        age = pd.to_numeric(df["age"], errors="coerce")
+
+        invalid = (name == "") | (club == "") | (position == "") | age.isna()
+        errors = []
+        if invalid.any():
+            for i in np.flatnonzero(invalid.to_numpy()):
+                missing = [c for c, bad in (("name", name.iat[i] == ""), ("club", club.iat[i] == ""),
+                                            ("position", position.iat[i] == ""), ("age", pd.isna(age.iat[i]))) if bad]
+                errors.append({"row": row_offset + int(i) + 2, "error": f"Missing or invalid: {', '.join(missing)}"})
+
+        league = text("league", "Unknown League")
+        league_factor = league.map(LEAGUE_STRENGTH).fillna(DEFAULT_LEAGUE_FACTOR).astype(float).to_numpy()
+
+        # Attribute columns: League Normalization for technical/mental, as whole-column operations
+        attr_values = {}
+        for category, attr_list in ATTRIBUTE_MAP.items():
+            for attr_name in attr_list:
+                if attr_name not in df.columns:
+                    continue
+                values = np.trunc(pd.to_numeric(df[attr_name], errors="coerce").to_numpy(dtype=float))
+                if category in LEAGUE_NORMALIZED:
+                    scaled = np.trunc(values * league_factor)
+                    values = np.where(values <= 20, np.clip(scaled, 1, 20), np.clip(scaled, 1, 99))
+                attr_values[(category, attr_name)] = values
+
+        explicit_stats = {}
+        for stat_key, aliases in STATS_MAP.items():
+            sources = [v for (_, attr_name), v in attr_values.items() if attr_name in aliases]
+            if sources:
+                # fmax ignores NaN, so missing cells fall back to the 0 baseline
+                explicit_stats[stat_key] = np.fmax.reduce(np.vstack(sources + [np.zeros(len(df))]), axis=0).astype(int)
+            else:
+                explicit_stats[stat_key] = np.zeros(len(df), dtype=int)
+
+        # Robust Market Value
+        market_value = text("market_value", "1.0")
+        market_value = market_value.where(market_value.str.startswith("€"), "€" + market_value)
+        market_value = market_value.where(market_value.str.endswith(("M", "K")), market_value + "M")
+        market_value_m = market_value.map(parse_market_value)
+
+        predicted_growth = pd.to_numeric(df["predicted_growth"], errors="coerce").fillna(5.0) \
+            if "predicted_growth" in df.columns else pd.Series(5.0, index=df.index)
+
+        columns = {
+            "name": name, "club": club, "league": league, "position": position,
+            "position_code": position.map(position_code), "role_group": position.map(role_group),
+            "age": age.fillna(0).astype(int),
+            "nationality": text("nationality", "Unknown"),
+            "image": text("image", "/defaults/player_placeholder.png"),
+            "market_value": market_value, "market_value_m": market_value_m,
+            "predicted_growth": predicted_growth.astype(float),
+            "tactical_role": text("tactical_role", "Balanced"),
+            "contract_expiry": text("contract_expiry", "2026-06-30"),
+        }
+        columns = {k: v.tolist() for k, v in columns.items()}
+        columns.update({k: v.tolist() for k, v in explicit_stats.items()})
+
+        # Structured Attributes: only the per-row JSON assembly is left in Python
+        titles = {key: key[1].title() for key in attr_values}
+        attr_lists = {key: v.tolist() for key, v in attr_values.items()}
+        keep = np.flatnonzero(~invalid.to_numpy())
+        rows = []
+        for i in keep:
+            structured_attrs = {"technical": [], "mental": [], "physical": []}
+            for key, values in attr_lists.items():
+                val = values[i]
+                if val == val:  # not NaN
+                    structured_attrs[key[0]].append({"name": titles[key], "value": int(val)})
+            row = {k: v[i] for k, v in columns.items()}
+            row["attributes"] = structured_attrs
+            row["_row"] = row_offset + int(i) + 2  # file line, for the error report
+            rows.append(row)
+        return rows, errors
+
+    # --- Import ---
+
+    def import_file(
+        self,
+        path: str,
+        progress: Optional[Callable[[Dict[str, Any], float], None]] = None,
+        error_sink: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Imports a spooled file. progress(stats, fraction) is called after every
+        chunk; per-row errors go to error_sink when given, otherwise the first
+        MAX_REPORTED_ERRORS are returned in stats["errors"].
+        """
+        stats = {"players_added": 0, "total_rows_processed": 0, "duplicates_skipped": 0, "failed": 0}
+        errors = []
+        started = time.perf_counter()
+        renames = None
+        defaults = model_defaults(Player)
+
+        def report(chunk_errors: List[Dict[str, Any]]):
+            stats["failed"] += len(chunk_errors)
+            if error_sink is not None:
+                error_sink(chunk_errors)
+            else:
+                errors.extend(chunk_errors[:max(0, self.MAX_REPORTED_ERRORS - len(errors))])
+
+        with Session(engine) as session:
+            for chunk, fraction in self.iter_chunks(path):
+                if renames is None:
+                    # Header aliases are resolved once, from the first chunk
+                    renames = self.resolve_columns(chunk.columns)
+                    missing_cols = [c for c in REQUIRED_COLUMNS if c not in renames.values()]
+                    if missing_cols:
+                        raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
+                chunk = chunk.rename(columns=renames)
+
+                rows, chunk_errors = self.map_chunk(chunk, stats["total_rows_processed"])
+                stats["total_rows_processed"] += len(chunk)
+                report(chunk_errors)
+
+                rows = self._drop_duplicates(session, rows)
+                stats["duplicates_skipped"] += len(chunk) - len(chunk_errors) - len(rows)
+                if rows:
+                    self._insert_chunk(session, rows, defaults, stats, report)
+                if progress is not None:
+                    progress(stats, fraction)
+
+            similarity_engine.persist(session)
+        response_cache.invalidate(PLAYERS)
+
+        elapsed = time.perf_counter() - started
+        stats["rows_per_sec"] = round(stats["total_rows_processed"] / elapsed, 1) if elapsed > 0 else 0.0
+        stats["errors"] = errors
+        return stats
+
+    def _insert_chunk(self, session: Session, rows: List[Dict[str, Any]], defaults: Dict[str, Any],
+                      stats: Dict[str, Any], report: Callable[[List[Dict[str, Any]]], None]):
+        line_numbers = [row.pop("_row") for row in rows]
+        pending = [SimpleNamespace(**{**defaults, **row, "id": str(uuid.uuid4()), "metrics": []}) for row in rows]
+        ProfileStore.apply_batch(pending)
+        try:
+            session.connection().execute(insert(Player.__table__), [vars(p) for p in pending])
+            HeatmapStore.apply_batch(session, pending)
+            session.commit()
+        except SQLAlchemyError as e:
+            # A rejected batch fails its rows but not the rest of the file
+            session.rollback()
+            message = f"Insert failed: {str(getattr(e, 'orig', e))[:200]}"
+            report([{"row": line, "error": message} for line in line_numbers])
+            return
+
+        similarity_engine.refresh(session, [p.id for p in pending], persist=False)
+        stats["players_added"] += len(pending)
+
+    @staticmethod
+    def _drop_duplicates(session: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Removes rows whose name+club already exists, in the DB (one query) or earlier in the chunk."""
+        names = list({row["name"] for row in rows})
+        existing = {
+            (name, club) for name, club in session.exec(select(Player.name, Player.club).where(Player.name.in_(names))).all()
+        } if names else set()
+        unique = []
+        for row in rows:
+            key = (row["name"], row["club"])
+            if key in existing:
+                continue
+            existing.add(key)
+            unique.append(row)
+        return unique
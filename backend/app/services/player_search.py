@@ -0,0 +1,209 @@
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+from sqlalchemy import literal, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.player import Player
+
+# Relative weight of each searchable column when ranking (name hits matter most)
+COLUMN_WEIGHTS = {"name": 10.0, "club": 3.0, "nationality": 1.0}
+
+SQLITE_DDL = [
+    # Shadow table with a stable INTEGER PRIMARY KEY (player.rowid is not VACUUM-safe)
+    """CREATE TABLE IF NOT EXISTS player_search_doc (
+        rowid INTEGER PRIMARY KEY,
+        player_id TEXT NOT NULL UNIQUE,
+        name TEXT, club TEXT, nationality TEXT
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS player_fts USING fts5(
+        name, club, nationality,
+        content='player_search_doc', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    # player -> shadow table
+    """CREATE TRIGGER IF NOT EXISTS player_search_ai AFTER INSERT ON player BEGIN
+        INSERT INTO player_search_doc(player_id, name, club, nationality)
+        VALUES (new.id, new.name, new.club, new.nationality);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS player_search_ad AFTER DELETE ON player BEGIN
+        DELETE FROM player_search_doc WHERE player_id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS player_search_au AFTER UPDATE OF id, name, club, nationality ON player BEGIN
+        UPDATE player_search_doc
+        SET player_id = new.id, name = new.name, club = new.club, nationality = new.nationality
+        WHERE player_id = old.id;
+    END""",
+    # shadow table -> FTS index
+    """CREATE TRIGGER IF NOT EXISTS player_fts_ai AFTER INSERT ON player_search_doc BEGIN
+        INSERT INTO player_fts(rowid, name, club, nationality)
+        VALUES (new.rowid, new.name, new.club, new.nationality);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS player_fts_ad AFTER DELETE ON player_search_doc BEGIN
+        INSERT INTO player_fts(player_fts, rowid, name, club, nationality)
+        VALUES ('delete', old.rowid, old.name, old.club, old.nationality);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS player_fts_au AFTER UPDATE ON player_search_doc BEGIN
+        INSERT INTO player_fts(player_fts, rowid, name, club, nationality)
+        VALUES ('delete', old.rowid, old.name, old.club, old.nationality);
+        INSERT INTO player_fts(rowid, name, club, nationality)
+        VALUES (new.rowid, new.name, new.club, new.nationality);
+    END""",
+    # Backfill rows that existed before the triggers
+    """INSERT INTO player_search_doc(player_id, name, club, nationality)
+        SELECT id, name, club, nationality FROM player
+        WHERE id NOT IN (SELECT player_id FROM player_search_doc)""",
+]
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() is only STABLE; the two-argument form wrapped in an IMMUTABLE function is indexable
+    """CREATE OR REPLACE FUNCTION player_search_doc(name text, club text, nationality text)
+        RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+        $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary,
+            coalesce(name, '') || ' ' || coalesce(club, '') || ' ' || coalesce(nationality, ''))) $$""",
+    """CREATE INDEX IF NOT EXISTS ix_player_search_trgm ON player
+        USING gin (player_search_doc(name, club, nationality) gin_trgm_ops)""",
+    """CREATE INDEX IF NOT EXISTS ix_player_search_tsv ON player
+        USING gin (to_tsvector('simple', player_search_doc(name, club, nationality)))""",
+]
+
+PG_DOC = "player_search_doc(player.name, player.club, player.nationality)"
+
+def normalize_query(q: str) -> str:
+    """Lowercases and strips diacritics so "Güler" and "guler" are the same query."""
+    decomposed = unicodedata.normalize("NFKD", q)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return stripped.lower().strip()
+
+def query_tokens(q: str) -> List[str]:
+    return re.findall(r"\w+", normalize_query(q))
+
+class PlayerSearchService:
+    """
+    Indexed, accent-insensitive, relevance-ranked player search.
+    Postgres: pg_trgm + tsvector GIN indexes over an unaccented document.
+    SQLite: FTS5 (unicode61, remove_diacritics) kept in sync by triggers.
+    Falls back to the legacy ILIKE scan when neither index is available.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self._backend: Optional[str] = None
+
+    def ensure_indexes(self):
+        ddl = {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(self.dialect)
+        if not ddl:
+            return
+        try:
+            with self.engine.begin() as conn:
+                for statement in ddl:
+                    conn.execute(text(statement))
+        except Exception as e:
+            # Missing FTS5 build / extension privileges: keep serving via ILIKE
+            print(f"WARNING: search indexes unavailable ({e}); falling back to ILIKE search")
+        self._backend = None
+
+    @property
+    def backend(self) -> str:
+        if self._backend is None:
+            self._backend = self._detect_backend()
+        return self._backend
+
+    def _detect_backend(self) -> str:
+        probe = {
+            "sqlite": "SELECT 1 FROM sqlite_master WHERE name = 'player_fts'",
+            "postgresql": "SELECT 1 FROM pg_proc WHERE proname = 'player_search_doc'",
+        }.get(self.dialect)
+        if probe:
+            with self.engine.connect() as conn:
+                if conn.execute(text(probe)).first():
+                    return "fts5" if self.dialect == "sqlite" else "pg_trgm"
+        return "ilike"
+
+    def search(self, session: Session, q: str, limit: int = 20, offset: int = 0) -> List[Tuple[str, float]]:
+        """Returns (player_id, score) pairs, best match first."""
+        statement = self._search_statement(q, limit, offset)
+        if statement is None:
+            return []
+        return [(row[0], float(row[1])) for row in session.execute(statement).all()]
+
+    async def search_async(self, session: AsyncSession, q: str, limit: int = 20, offset: int = 0) -> List[Tuple[str, float]]:
+        statement = self._search_statement(q, limit, offset)
+        if statement is None:
+            return []
+        return [(row[0], float(row[1])) for row in (await session.execute(statement)).all()]
+
+    def _search_statement(self, q: str, limit: int, offset: int):
+        """Ranked (player_id, score) statement for the active backend; None for an empty query."""
+        tokens = query_tokens(q)
+        if not tokens:
+            return None
+
+        if self.backend == "fts5":
+            weights = ", ".join(str(w) for w in COLUMN_WEIGHTS.values())
+            statement = text(f"""
+                SELECT d.player_id, -bm25(player_fts, {weights}) AS score
+                FROM player_fts JOIN player_search_doc d ON d.rowid = player_fts.rowid
+                WHERE player_fts MATCH :match
+                ORDER BY score DESC, d.player_id
+                LIMIT :limit OFFSET :offset
+            """)
+            params = {"match": self._fts5_match(tokens)}
+        elif self.backend == "pg_trgm":
+            statement = text(f"""
+                SELECT player.id,
+                    ts_rank(to_tsvector('simple', {PG_DOC}), to_tsquery('simple', :tsquery))
+                    + word_similarity(:q, {PG_DOC}) AS score
+                FROM player
+                WHERE {PG_DOC} LIKE :pattern
+                   OR to_tsvector('simple', {PG_DOC}) @@ to_tsquery('simple', :tsquery)
+                   OR :q <% {PG_DOC}
+                ORDER BY score DESC, player.id
+                LIMIT :limit OFFSET :offset
+            """)
+            params = self._pg_params(q, tokens)
+        else:
+            # Legacy ILIKE scan: unranked, every hit scores 0
+            return select(Player.id, literal(0.0)).where(self.match_clause(q)).order_by(Player.id).offset(offset).limit(limit)
+
+        return statement.bindparams(**params, limit=limit, offset=offset)
+
+    def match_clause(self, q: str):
+        """WHERE clause restricting Player rows to search hits; composes with other filters and keyset ordering."""
+        tokens = query_tokens(q)
+        if not tokens:
+            return Player.id.is_(None)
+
+        if self.backend == "fts5":
+            return Player.id.in_(text("""
+                SELECT d.player_id FROM player_fts JOIN player_search_doc d ON d.rowid = player_fts.rowid
+                WHERE player_fts MATCH :match
+            """).bindparams(match=self._fts5_match(tokens)).columns(player_id=Player.id.type))
+        if self.backend == "pg_trgm":
+            params = self._pg_params(q, tokens)
+            return text(f"""(
+                {PG_DOC} LIKE :pattern
+                OR to_tsvector('simple', {PG_DOC}) @@ to_tsquery('simple', :tsquery)
+            )""").bindparams(pattern=params["pattern"], tsquery=params["tsquery"])
+
+        pattern = f"%{q}%"
+        return Player.name.ilike(pattern) | Player.club.ilike(pattern) | Player.nationality.ilike(pattern)
+
+    @staticmethod
+    def _fts5_match(tokens: List[str]) -> str:
+        # Every token must match as a prefix ("gul" finds "Güler") in any column
+        return " ".join(f'"{t}"*' for t in tokens)
+
+    @staticmethod
+    def _pg_params(q: str, tokens: List[str]) -> dict:
+        normalized = normalize_query(q)
+        escaped = normalized.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return {
+            "q": normalized,
+            "pattern": f"%{escaped}%",
+            "tsquery": " & ".join(f"{t}:*" for t in tokens),
+        }
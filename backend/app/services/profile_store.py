@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+from app.models.player import Player
+from app.services.attribute_engine import ScientificAttributeEngine
+
+class ProfileStore:
+    """
+    Persists ScientificAttributeEngine output on the Player row.
+    Profiles are computed at ingest/sync time and recomputed only when the
+    source fingerprint or ScientificAttributeEngine.VERSION changes, so the
+    detail endpoint is a pure lookup.
+    """
+
+    BATCH_SIZE = 2000
+
+    @staticmethod
+    def is_current(player: Player) -> bool:
+        return (
+            player.scientific_profile is not None
+            and player.profile_version == ScientificAttributeEngine.VERSION
+            and player.profile_fingerprint == ScientificAttributeEngine.source_fingerprint(player)
+        )
+
+    @classmethod
+    def apply(cls, player: Player, attributes: Optional[dict] = None) -> bool:
+        """Recomputes the stored profile if stale. Returns True when the row changed."""
+        if cls.is_current(player):
+            return False
+        player.scientific_profile = ScientificAttributeEngine.build_derived_profile(player, attributes)
+        player.profile_version = ScientificAttributeEngine.VERSION
+        player.profile_fingerprint = ScientificAttributeEngine.source_fingerprint(player)
+        return True
+
+    @classmethod
+    def apply_batch(cls, players: List) -> List:
+        """apply() over many rows with the attribute blocks computed in one vectorized pass. Returns the changed rows."""
+        stale = [p for p in players if not cls.is_current(p)]
+        needs_calc = [p for p in stale if ScientificAttributeEngine.needs_attribute_calc(p)]
+        blocks = ScientificAttributeEngine.calculate_batch_for_players(needs_calc)
+        precomputed = {id(p): b for p, b in zip(needs_calc, blocks)}
+        for player in stale:
+            cls.apply(player, precomputed.get(id(player)))
+        return stale
+
+    @staticmethod
+    def render(player: Player) -> Dict:
+        """Player detail payload: stored row overlaid with its derived profile."""
+        player_data = player.model_dump(exclude={"scientific_profile", "profile_version", "profile_fingerprint"})
+        player_data.update(player.scientific_profile or {})
+        return player_data
+
+    @classmethod
+    def refresh_stale(cls, engine: Engine) -> int:
+        """Backfills rows written before profiles existed or under an older engine version."""
+        refreshed = 0
+        last_id = ""
+        with Session(engine) as session:
+            while True:
+                statement = select(Player).where(
+                    or_(Player.profile_version.is_(None), Player.profile_version != ScientificAttributeEngine.VERSION),
+                    Player.id > last_id
+                ).order_by(Player.id).limit(cls.BATCH_SIZE)
+                batch = session.exec(statement).all()
+                if not batch:
+                    break
+
+                last_id = batch[-1].id
+
+                # Attribute blocks for the whole batch in one vectorized pass
+                changed = cls.apply_batch(batch)
+                session.add_all(changed)
+                refreshed += len(changed)
+                session.commit()
+                session.expunge_all()
+
+        if refreshed:
+            print(f"ProfileStore: recomputed {refreshed} scientific profiles (engine {ScientificAttributeEngine.VERSION})")
+        return refreshed
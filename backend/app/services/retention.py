@@ -0,0 +1,134 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import func, insert, literal, update
+from sqlmodel import Session, select, delete
+from app.models.chat import Message, ArchivedMessage
+from app.models.negotiation import Negotiation, ArchivedNegotiation
+from app.models.player import ScoutNote, ArchivedScoutNote
+from app.models.staff import Assignment
+
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "1000"))
+
+def _days(name: str, default: int) -> int:
+    return int(os.getenv(f"RETENTION_{name.upper()}_DAYS", str(default)))
+
+class RetentionPolicy:
+    """
+    Which rows of a live table have aged out, and what happens to them:
+    "flag" sets a status column in place, "move" copies the rows into an archive
+    table (same ids) and deletes them from the live one.
+    """
+
+    def __init__(self, name: str, model: type, age_column: str, days: int, action: str,
+                 archive_model: Optional[type] = None, statuses: Iterable[str] = (),
+                 flag_status: Optional[str] = None):
+        self.name = name
+        self.model = model
+        self.age_column = age_column
+        self.days = days
+        self.action = action
+        self.archive_model = archive_model
+        self.statuses = tuple(statuses)
+        self.flag_status = flag_status
+
+    def condition(self, cutoff: datetime) -> list:
+        clauses = [getattr(self.model, self.age_column) < cutoff]
+        if self.statuses:
+            clauses.append(self.model.status.in_(self.statuses))
+        if self.action == "flag":
+            clauses.append(self.model.status != self.flag_status)
+        return clauses
+
+POLICIES: Dict[str, RetentionPolicy] = {p.name: p for p in [
+    RetentionPolicy("assignments", Assignment, "created_at", _days("assignments", 30), "flag",
+                    statuses=("COMPLETED",), flag_status="ARCHIVED"),
+    RetentionPolicy("messages", Message, "timestamp", _days("messages", 180), "move",
+                    archive_model=ArchivedMessage),
+    RetentionPolicy("scout_notes", ScoutNote, "created_at", _days("scout_notes", 730), "move",
+                    archive_model=ArchivedScoutNote),
+    RetentionPolicy("negotiations", Negotiation, "last_updated", _days("negotiations", 365), "move",
+                    archive_model=ArchivedNegotiation, statuses=("SIGNED", "FAILED")),
+]}
+
+class RetentionEngine:
+    """
+    Applies retention policies with set-based statements in bounded batches:
+    each batch picks at most `batch_size` ids through the age index, then runs one
+    UPDATE (flag) or INSERT ... SELECT + DELETE (move) on exactly those ids and
+    commits, so live tables are only ever locked for one batch at a time.
+    """
+
+    def __init__(self, policies: Dict[str, RetentionPolicy] = POLICIES):
+        self.policies = policies
+
+    def run(self, session: Session, names: Optional[Iterable[str]] = None, dry_run: bool = False,
+            older_than_days: Optional[int] = None, batch_size: int = RETENTION_BATCH_SIZE) -> Dict[str, Any]:
+        names = list(names) if names else list(self.policies)
+        unknown = [n for n in names if n not in self.policies]
+        if unknown:
+            raise ValueError(f"Unknown retention policies: {', '.join(unknown)}")
+
+        started = time.perf_counter()
+        results = [self._apply(session, self.policies[n], dry_run, older_than_days, batch_size) for n in names]
+        return {
+            "dry_run": dry_run,
+            "policies": results,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def _apply(self, session: Session, policy: RetentionPolicy, dry_run: bool,
+               older_than_days: Optional[int], batch_size: int) -> Dict[str, Any]:
+        days = policy.days if older_than_days is None else older_than_days
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        conditions = policy.condition(cutoff)
+        if policy.action == "move":
+            # The newest row always stays live: SQLite hands out max(id) + 1, and an emptied
+            # table would otherwise start reusing ids that already exist in the archive
+            newest_id = session.exec(select(func.max(policy.model.id))).one()
+            conditions.append(policy.model.id < (newest_id or 0))
+
+        result = {"policy": policy.name, "table": policy.model.__tablename__, "action": policy.action,
+                  "older_than_days": days, "cutoff": cutoff}
+        started = time.perf_counter()
+        if dry_run:
+            result["rows"] = session.exec(select(func.count()).select_from(policy.model).where(*conditions)).one()
+            result["batches"] = []
+        else:
+            result["batches"] = self._batches(session, policy, conditions, batch_size)
+            result["rows"] = sum(b["rows"] for b in result["batches"])
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    def _batches(self, session: Session, policy: RetentionPolicy, conditions: list, batch_size: int) -> List[Dict[str, Any]]:
+        model = policy.model
+        age = getattr(model, policy.age_column)
+        batches = []
+        while True:
+            started = time.perf_counter()
+            ids = session.exec(
+                select(model.id).where(*conditions).order_by(age, model.id).limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            if policy.action == "flag":
+                session.exec(update(model).where(model.id.in_(ids)).values(status=policy.flag_status))
+            else:
+                self._move(session, policy.model, policy.archive_model, ids)
+            session.commit()
+            batches.append({"batch": len(batches) + 1, "rows": len(ids),
+                            "ms": round((time.perf_counter() - started) * 1000, 1)})
+        return batches
+
+    @staticmethod
+    def _move(session: Session, model: type, archive_model: type, ids: list):
+        columns = [c.name for c in model.__table__.columns]
+        archived_at = literal(datetime.now(timezone.utc), archive_model.__table__.c.archived_at.type)
+        session.exec(insert(archive_model).from_select(
+            columns + ["archived_at"],
+            select(*[model.__table__.c[c] for c in columns], archived_at).where(model.id.in_(ids))
+        ))
+        session.exec(delete(model).where(model.id.in_(ids)))
+
+retention_engine = RetentionEngine()
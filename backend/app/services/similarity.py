@@ -0,0 +1,400 @@
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlmodel import Session, select, func
+from app.core.db import engine
+from app.models.player import Player
+from app.services.ann_index import IVFIndex
+from app.services.attribute_engine import ScientificAttributeEngine
+from app.utils.positions import TAXONOMY_VERSION, position_code
+
+STAT_FEATURES = ["pace", "shooting", "passing", "dribbling", "defending", "physical", "xg_per_90", "xa_per_90", "ppda"]
+ATTRIBUTE_BLOCKS = ["technical", "mental", "physical"]
+FEATURE_NAMES = STAT_FEATURES + [f"{block}_block" for block in ATTRIBUTE_BLOCKS]
+
+METRICS = ("cosine", "mahalanobis")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SNAPSHOT_PATH = os.getenv("SIMILARITY_INDEX_PATH", os.path.join(BASE_DIR, "data", "similarity_index.npz"))
+
+# Columns needed to build a feature row; the heavy dossier JSON is never loaded
+FEATURE_COLUMNS = [Player.id, Player.position, Player.position_code, Player.age, Player.league, Player.club, Player.attributes, Player.scientific_profile] + \
+    [getattr(Player, name) for name in STAT_FEATURES]
+
+def _position_key(row) -> str:
+    """Canonical code when the taxonomy recognises the position, the raw string otherwise."""
+    return row.position_code or row.position
+
+def _block_mean(block) -> float:
+    values = [a.get("value") for a in block or [] if isinstance(a, dict) and isinstance(a.get("value"), (int, float))]
+    return float(np.mean(values)) if values else np.nan
+
+def feature_row(player) -> np.ndarray:
+    """Stat columns + mean of each 0-20 attribute block (modelled profile wins over flat stat dumps)."""
+    profile = player.scientific_profile or {}
+    attributes = profile.get("attributes") or player.attributes or {}
+    stats = [float(getattr(player, name) or 0.0) for name in STAT_FEATURES]
+    blocks = [_block_mean(attributes.get(block)) if isinstance(attributes, dict) else np.nan for block in ATTRIBUTE_BLOCKS]
+    return np.array(stats + blocks, dtype=np.float64)
+
+class SimilarityEngine:
+    """
+    In-memory, normalized feature matrix over all players for top-k similarity queries.
+    Built lazily from the DB (or an on-disk snapshot) on first use; DataSyncService
+    and the importer push changed rows through refresh() so the matrix and its
+    IVF index stay current without a rebuild.
+    """
+
+    # Recompute normalization statistics once this share of rows changed incrementally
+    RENORMALIZE_FRACTION = 0.05
+    LOAD_CHUNK_SIZE = 5000
+
+    def __init__(self, snapshot_path: Optional[str] = SNAPSHOT_PATH):
+        self._lock = threading.RLock()
+        self.snapshot_path = snapshot_path
+        self.loaded = False
+        self.ann = IVFIndex()
+        self._key = None
+        self._reset()
+
+    def _reset(self):
+        self.ids = np.empty(0, dtype=object)
+        self.raw = np.empty((0, len(FEATURE_NAMES)), dtype=np.float64)
+        self.positions = np.empty(0, dtype=object)
+        self.leagues = np.empty(0, dtype=object)
+        self.clubs = np.empty(0, dtype=object)
+        self.ages = np.empty(0, dtype=np.int32)
+        self.active = np.empty(0, dtype=bool)
+        self.index = {}
+        self._changed_since_normalize = 0
+        self.unit = np.empty((0, len(FEATURE_NAMES)), dtype=np.float32)
+        self.whitened = np.empty((0, len(FEATURE_NAMES)), dtype=np.float32)
+        self._prototypes = {}
+
+    # --- Building / incremental maintenance ---
+
+    def load(self, session: Session):
+        with self._lock:
+            if self._load_snapshot(session):
+                self.loaded = True
+                return
+            self._reset()
+            last_id = ""
+            while True:
+                rows = session.exec(
+                    select(*FEATURE_COLUMNS).where(Player.id > last_id).order_by(Player.id).limit(self.LOAD_CHUNK_SIZE)
+                ).all()
+                if not rows:
+                    break
+                self._upsert_rows(rows)
+                last_id = rows[-1].id
+            self._normalize()
+            self.loaded = True
+            self.save_snapshot()
+
+    def ensure_loaded(self, session: Session):
+        if not self.loaded:
+            self.load(session)
+
+    def warm(self, player_ids: Iterable[str] = ()):
+        """
+        ensure_loaded() plus a refresh of any given ids missing from the matrix (rows
+        written by another worker), on its own session. Blocking: async routes run it
+        in the threadpool together with the query.
+        """
+        missing = [pid for pid in player_ids if pid not in self.index]
+        if self.loaded and not missing:
+            return
+        with Session(engine) as session:
+            self.ensure_loaded(session)
+            missing = [pid for pid in missing if pid not in self.index]
+            if missing:
+                self.refresh(session, missing)
+
+    def refresh(self, session: Session, player_ids: Iterable[str], persist: bool = True):
+        """
+        Re-reads the given players into the matrix. No-op until the engine has been loaded.
+        Chunked writers pass persist=False and call persist() once at the end.
+        """
+        if not self.loaded:
+            return
+        player_ids = list(player_ids)
+        with self._lock:
+            touched = []
+            for start in range(0, len(player_ids), self.LOAD_CHUNK_SIZE):
+                chunk = player_ids[start:start + self.LOAD_CHUNK_SIZE]
+                rows = session.exec(select(*FEATURE_COLUMNS).where(Player.id.in_(chunk))).all()
+                touched.extend(self._upsert_rows(rows))
+                found = {row.id for row in rows}
+                self.remove([pid for pid in chunk if pid not in found])
+            self._after_change(np.array(touched, dtype=np.int64))
+        if persist:
+            self.persist(session)
+
+    def persist(self, session: Session):
+        """Writes the snapshot under the current DB identity."""
+        if not self.loaded:
+            return
+        with self._lock:
+            self._key = self._snapshot_key(session)
+            self.save_snapshot()
+
+    def remove(self, player_ids: Iterable[str]):
+        with self._lock:
+            for pid in player_ids:
+                row = self.index.get(pid)
+                if row is not None:
+                    self.active[row] = False
+
+    def _upsert_rows(self, rows: list) -> List[int]:
+        """Writes rows into the matrix; returns the indices of rows that already existed."""
+        new_rows = []
+        updated = []
+        for row in rows:
+            features = feature_row(row)
+            idx = self.index.get(row.id)
+            if idx is None:
+                new_rows.append((row, features))
+                continue
+            self.raw[idx] = features
+            self.positions[idx] = _position_key(row)
+            self.leagues[idx] = row.league
+            self.clubs[idx] = row.club
+            self.ages[idx] = row.age
+            self.active[idx] = True
+            updated.append(idx)
+
+        if new_rows:
+            offset = len(self.ids)
+            self.ids = np.concatenate([self.ids, np.array([r.id for r, _ in new_rows], dtype=object)])
+            self.raw = np.vstack([self.raw, np.stack([f for _, f in new_rows])])
+            self.positions = np.concatenate([self.positions, np.array([_position_key(r) for r, _ in new_rows], dtype=object)])
+            self.leagues = np.concatenate([self.leagues, np.array([r.league for r, _ in new_rows], dtype=object)])
+            self.clubs = np.concatenate([self.clubs, np.array([r.club for r, _ in new_rows], dtype=object)])
+            self.ages = np.concatenate([self.ages, np.array([r.age for r, _ in new_rows], dtype=np.int32)])
+            self.active = np.concatenate([self.active, np.ones(len(new_rows), dtype=bool)])
+            for i, (r, _) in enumerate(new_rows):
+                self.index[r.id] = offset + i
+        return updated
+
+    def _after_change(self, updated_rows: np.ndarray):
+        """Re-projects after an incremental upsert; new rows are picked up by length."""
+        self._changed_since_normalize += len(updated_rows) + max(0, len(self.raw) - len(self.unit))
+        if self._changed_since_normalize > self.RENORMALIZE_FRACTION * max(1, int(self.active.sum())):
+            self._normalize()
+        else:
+            self._project()
+            self.ann.assign(self.unit, updated_rows)
+
+    def _normalize(self):
+        """Fits z-score and whitening parameters on the active rows, then projects everything."""
+        active = self.raw[self.active] if self.active.any() else self.raw
+        if len(active) == 0:
+            self.mean = np.zeros(len(FEATURE_NAMES))
+            self.std = np.ones(len(FEATURE_NAMES))
+            self.whiten = np.eye(len(FEATURE_NAMES))
+        else:
+            self.mean = np.nan_to_num(np.nanmean(active, axis=0))
+            self.std = np.nan_to_num(np.nanstd(active, axis=0))
+            self.std[self.std == 0] = 1.0
+
+            # Mahalanobis: inverse covariance of the z-scores as L L^T, distances become Euclidean in Z @ L
+            z = np.nan_to_num((active - self.mean) / self.std)
+            cov = np.cov(z, rowvar=False) if len(z) > 1 else np.eye(len(FEATURE_NAMES))
+            cov += np.eye(len(FEATURE_NAMES)) * 1e-6
+            self.whiten = np.linalg.cholesky(np.linalg.inv(cov))
+
+        self._changed_since_normalize = 0
+        self._project()
+        self.ann.train(self.unit)
+
+    def _project(self):
+        z = np.nan_to_num((self.raw - self.mean) / self.std).astype(np.float32)
+        norms = np.linalg.norm(z, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.unit = z / norms
+        self.whitened = (z @ self.whiten.astype(np.float32)).astype(np.float32)
+        self._prototypes = {}
+
+    # --- Snapshots ---
+
+    def _snapshot_key(self, session: Session) -> np.ndarray:
+        """Cheap DB-side identity: row count + highest id, plus the feature/profile/taxonomy versions."""
+        count, max_id = session.exec(select(func.count(Player.id), func.max(Player.id))).one()
+        return np.array([str(count), str(max_id), ",".join(FEATURE_NAMES), ScientificAttributeEngine.VERSION, TAXONOMY_VERSION])
+
+    def save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            if self._key is None:
+                return
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp.npz"
+            np.savez(
+                tmp_path,
+                key=self._key,
+                ids=self.ids.astype(str), positions=self.positions.astype(str),
+                leagues=self.leagues.astype(str), clubs=self.clubs.astype(str),
+                ages=self.ages, active=self.active, raw=self.raw,
+                mean=self.mean, std=self.std, whiten=self.whiten,
+                **self.ann.state()
+            )
+            os.replace(tmp_path, self.snapshot_path)
+
+    def _load_snapshot(self, session: Session) -> bool:
+        self._key = self._snapshot_key(session)
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with np.load(self.snapshot_path) as data:
+                if data["key"].tolist() != self._key.tolist():
+                    return False
+                self._reset()
+                self.ids = data["ids"].astype(object)
+                self.positions = data["positions"].astype(object)
+                self.leagues = data["leagues"].astype(object)
+                self.clubs = data["clubs"].astype(object)
+                self.ages = data["ages"]
+                self.active = data["active"]
+                self.raw = data["raw"]
+                self.mean, self.std, self.whiten = data["mean"], data["std"], data["whiten"]
+                self.ann.restore(data)
+        except Exception as e:
+            print(f"WARNING: ignoring unreadable similarity snapshot ({e})")
+            self._reset()
+            return False
+        self.index = {pid: i for i, pid in enumerate(self.ids)}
+        self._project()
+        return True
+
+    # --- Queries ---
+
+    def _filter(
+        self,
+        rows: Optional[np.ndarray] = None,
+        exclude: Optional[List[int]] = None,
+        position: Optional[str] = None,
+        league: Optional[str] = None,
+        exclude_club: Optional[str] = None,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+    ) -> np.ndarray:
+        """Row indices (of rows, or of the whole matrix) that are active and pass every filter."""
+        pick = (lambda column: column) if rows is None else (lambda column: column[rows])
+        keep = pick(self.active).copy()
+        if position:
+            keep &= pick(self.positions) == (position_code(position) or position)
+        if league:
+            keep &= pick(self.leagues) == league
+        if exclude_club:
+            keep &= pick(self.clubs) != exclude_club
+        if min_age is not None:
+            keep &= pick(self.ages) >= min_age
+        if max_age is not None:
+            keep &= pick(self.ages) <= max_age
+        result = np.flatnonzero(keep) if rows is None else rows[keep]
+        if exclude:
+            result = result[~np.isin(result, exclude)]
+        return result
+
+    def _top_k(self, candidates: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        k = min(k, len(candidates))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[candidates[i]], round(float(scores[i]), 1)) for i in top]
+
+    def query(
+        self,
+        player_id: str,
+        k: int = 10,
+        metric: str = "cosine",
+        approximate: bool = False,
+        **filters,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k (player_id, similarity 0-100) for a player already in the matrix.
+        filters: position, league, exclude_club, min_age, max_age.
+        approximate=True routes cosine queries through the IVF index.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}'")
+
+        with self._lock:
+            idx = self.index.get(player_id)
+            if idx is None:
+                return []
+            filters["exclude"] = [idx]
+
+            if metric == "cosine":
+                return self._cosine_top_k(self.unit[idx], filters, k, approximate)
+
+            candidates = self._filter(**filters)
+            diff = self.whitened[candidates] - self.whitened[idx]
+            distance_sq = np.einsum("ij,ij->i", diff, diff)
+            scores = 100 * np.exp(-distance_sq / (2 * len(FEATURE_NAMES)))
+            return self._top_k(candidates, scores, k)
+
+    def query_prototype(
+        self,
+        player_ids: Optional[List[str]] = None,
+        k: int = 10,
+        approximate: bool = True,
+        **filters,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k around the mean profile of the given players (e.g. the current holders
+        of a squad role); without ids, around the mean of every row passing the filters.
+        """
+        with self._lock:
+            rows = [self.index[pid] for pid in player_ids or [] if pid in self.index]
+            if rows:
+                filters["exclude"] = rows
+                prototype = self.unit[rows].mean(axis=0)
+            else:
+                prototype = self._pool_prototype(filters)
+                if prototype is None:
+                    return []
+            return self._cosine_top_k(prototype, filters, k, approximate)
+
+    def score_prototype(
+        self,
+        candidate_ids: List[str],
+        player_ids: Optional[List[str]] = None,
+        **filters,
+    ) -> Dict[str, float]:
+        """Similarity 0-100 of given candidates to the prototype query_prototype() would search around."""
+        with self._lock:
+            rows = [self.index[pid] for pid in player_ids or [] if pid in self.index]
+            prototype = self.unit[rows].mean(axis=0) if rows else self._pool_prototype(filters)
+            candidates = [self.index[pid] for pid in candidate_ids if pid in self.index]
+            if prototype is None or not candidates:
+                return {}
+            norm = np.linalg.norm(prototype)
+            scores = (self.unit[candidates] @ (prototype / norm if norm > 0 else prototype) + 1) * 50
+            return {self.ids[row]: round(float(score), 1) for row, score in zip(candidates, scores)}
+
+    def _pool_prototype(self, filters: dict) -> Optional[np.ndarray]:
+        key = tuple(sorted(filters.items()))
+        if key not in self._prototypes:
+            pool = self._filter(**filters)
+            self._prototypes[key] = self.unit[pool].mean(axis=0) if len(pool) else None
+        return self._prototypes[key]
+
+    def _cosine_top_k(self, vector: np.ndarray, filters: dict, k: int, approximate: bool) -> List[Tuple[str, float]]:
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        if approximate and self.ann.trained:
+            candidates = self.ann.candidates(vector, lambda rows: self._filter(rows, **filters), k)
+        else:
+            candidates = self._filter(**filters)
+        if len(candidates) == 0:
+            return []
+        scores = (self.unit[candidates] @ vector + 1) * 50
+        return self._top_k(candidates, scores, k)
+
+similarity_engine = SimilarityEngine()
@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+from sqlmodel import Session, SQLModel
+
+def column_names(model: Type[SQLModel]) -> List[str]:
+    return [c.name for c in model.__table__.columns]
+
+def model_defaults(model: Type[SQLModel]) -> Dict[str, Any]:
+    """Column defaults of a table model as a row dict (None for required columns)."""
+    columns = set(column_names(model))
+    return {
+        name: None if field.is_required() else field.get_default(call_default_factory=True)
+        for name, field in model.model_fields.items() if name in columns
+    }
+
+def _dialect_insert(session: Session, model: Type[SQLModel]):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model.__table__)
+
+def upsert_rows(
+    session: Session,
+    model: Type[SQLModel],
+    rows: List[Dict],
+    key_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+):
+    """
+    INSERT ... ON CONFLICT (key) DO UPDATE for a batch of row dicts, sent as one
+    executemany. update_columns defaults to every non-key column; an empty list
+    turns it into ON CONFLICT DO NOTHING. Dialects without ON CONFLICT fall back
+    to a merge per row.
+    """
+    if not rows:
+        return
+    if update_columns is None:
+        update_columns = [c for c in rows[0].keys() if c not in key_columns]
+
+    statement = _dialect_insert(session, model)
+    if statement is None:
+        for row in rows:
+            session.merge(model(**row))
+        return
+
+    if update_columns:
+        statement = statement.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={c: statement.excluded[c] for c in update_columns}
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=list(key_columns))
+    session.execute(statement, rows)
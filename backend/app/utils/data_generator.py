@@ -3,10 +3,13 @@ import uuid
 from sqlmodel import Session, select
 from app.models.player import Player
 from app.core.db import engine, init_db
+from app.utils.market_value import parse_market_value
+from app.utils.positions import DEFENDER, classify, position_code, role_group
+from app.services.profile_store import ProfileStore
 
 # Constituents for random generation
 FIRST_NAMES = ["Luka", "Kylian", "Erling", "Kevin", "Virgil", "Frenkie", "Jude", "Vinicius", "Pedri", "Bukayo", "Jamal", "Gavi", "Xavi", "Mohamed", "Harry", "Bruno", "Bernardo", "Ruben", "Rodri", "Martin", "Marcus", "Phil", "Jack", "Trent", "Reece", "Alphonso", "Achraf", "Theo", "Joao", "Rafael", "Victor", "Enzo", "Julian", "Lautaro", "Federico", "Nicolo", "Sandro", "Alessandro", "Gianluigi", "Matthijs"]
-LAST_NAMES = ["Modric", "Mbappe", "Haaland", "De Bruyne", "Van Dijk", "De Jong", "Bellingham", "Junior", "Saka", "Musiala", "Simons", "Salah", "Kane", "Fernandes", "Silva", "Dias", "Odegaard", "Rashford", "Foden", "Grealish", "Alexander-Arnold", "James", "Davies", "Hakimi", "Hernandez", "Cancelo", "Leao", "Osimhen", "Fernandez", "Alvarez", "Martinez", "Chiesa", "Barella", "Tonali", "Bastoni", "Donnarumma", "De Ligt"]
+LAST_NAMES = ["Modric", "Mbappe", "Haaland", "De Bruyne", "Van Dijk", "De Jong", "Bellingham", "Junior", "Saka", "Musiala", "Simons", "Salah", "Kane", "Fernandes", "Silva", "Dias", "Odegaard", "Rashford", "Foden", "Grealish", "Alexander-Arnold", "James", "Davies", "Hakimi", "Hernandez", "Cancelo", "Leao", "Osimhen", "Fernandez", "Alvarez", "Martinez", "Chiesa", "Barella", "Tonali", "Bastoni", "Donnarumma", "De Ligt", "Güler", "Müller", "Gündoğan", "Hernández", "Mbappé", "Ødegaard"]
 CLUBS = ["Manchester City", "Arsenal", "Liverpool", "Real Madrid", "Barcelona", "Bayern Munich", "PSG", "Inter Milan", "AC Milan", "Juventus", "Napoli", "Atletico Madrid", "Dortmund", "Leipzig", "Ajax", "Benfica", "Porto", "Chelsea", "Man Utd", "Tottenham", "Aston Villa", "Newcastle", "Bayer Leverkusen"]
 LEAGUES = ["Premier League", "La Liga", "Bundesliga", "Serie A", "Ligue 1", "Eredivisie", "Liga Portugal"]
 POSITIONS = ["GK", "CB", "LB", "RB", "CDM", "CM", "CAM", "LW", "RW", "ST"]
@@ -25,20 +28,21 @@ def generate_stats_for_position(position: str, age: int):
         "ppda": 0.0
     }
     
-    # Adjustments
-    if position in ["CB", "LB", "RB"]:
+    # Adjustments by canonical role (CDM -> DM etc., see app.utils.positions)
+    code = position_code(position)
+    if role_group(position) == DEFENDER:
         stats["defending"] = random.randint(75, 95)
         stats["shooting"] = random.randint(20, 60)
         stats["ppda"] = round(random.uniform(5.0, 15.0), 2)  # Lower is more intense pressing
         stats["xg_per_90"] = round(random.uniform(0.01, 0.1), 2)
     
-    elif position in ["CDM", "CM"]:
+    elif code in ("DM", "CM"):
         stats["passing"] = random.randint(80, 98)
         stats["defending"] = random.randint(60, 85)
         stats["ppda"] = round(random.uniform(6.0, 12.0), 2)
         stats["xa_per_90"] = round(random.uniform(0.1, 0.4), 2)
         
-    elif position in ["CAM", "LW", "RW"]:
+    elif code in ("CAM", "LW", "RW"):
         stats["dribbling"] = random.randint(80, 98)
         stats["shooting"] = random.randint(70, 90)
         stats["defending"] = random.randint(30, 60)
@@ -46,7 +50,7 @@ def generate_stats_for_position(position: str, age: int):
         stats["xa_per_90"] = round(random.uniform(0.2, 0.6), 2)
         stats["ppda"] = round(random.uniform(8.0, 18.0), 2) # Forwards press less usually
         
-    elif position == "ST":
+    elif code == "ST":
         stats["shooting"] = random.randint(85, 99)
         stats["defending"] = random.randint(20, 50)
         stats["xg_per_90"] = round(random.uniform(0.4, 1.2), 2)
@@ -71,6 +75,64 @@ def generate_market_value(age, stats, potential_growth):
     else:
         return f"€{round(value, 1)}M"
 
+def generate_player() -> Player:
+    """Builds one synthetic (unsaved) Player with position-consistent stats."""
+    pos = random.choice(POSITIONS)
+    age = random.randint(17, 34)
+    stats = generate_stats_for_position(pos, age)
+    predicted_growth = round(random.uniform(0.0, 10.0), 1)
+    market_value = generate_market_value(age, stats, predicted_growth)
+    
+    player = Player(
+        id=str(uuid.uuid4()),
+        name=f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}",
+        club=random.choice(CLUBS),
+        league=random.choice(LEAGUES),
+        position=pos,
+        **classify(pos),
+        age=age,
+        nationality=random.choice(["France", "Spain", "England", "Brazil", "Argentina", "Germany", "Portugal", "Netherlands", "Italy", "Belgium"]),
+        image=f"/placeholder-player-{random.randint(1, 4)}.png",
+        market_value=market_value,
+        market_value_m=parse_market_value(market_value),
+        predicted_growth=predicted_growth,
+        tactical_role=random.choice(["Playmaker", "Target Man", "Ball Winning Midfielder", "Inverted Winger", "Libero"]),
+        is_synthetic=True,
+        
+        # Stats
+        pace=stats["pace"],
+        shooting=stats["shooting"],
+        passing=stats["passing"],
+        dribbling=stats["dribbling"],
+        defending=stats["defending"],
+        physical=stats["physical"],
+        xg_per_90=stats["xg_per_90"],
+        xa_per_90=stats["xa_per_90"],
+        ppda=stats["ppda"],
+        
+        # Attributes
+        attributes={
+            "technical": [
+                {"name": "Finishing", "value": random.randint(8, 20)},
+                {"name": "Passing", "value": random.randint(8, 20)},
+                {"name": "Dribbling", "value": random.randint(8, 20)},
+                {"name": "Touch", "value": random.randint(8, 20)}
+            ],
+            "mental": [
+                {"name": "Vision", "value": random.randint(8, 20)},
+                {"name": "Positioning", "value": random.randint(8, 20)},
+                {"name": "Determination", "value": random.randint(8, 20)}
+            ],
+            "physical": [
+                {"name": "Pace", "value": random.randint(8, 20)},
+                {"name": "Strength", "value": random.randint(8, 20)},
+                {"name": "Stamina", "value": random.randint(8, 20)}
+            ]
+        }
+    )
+    ProfileStore.apply(player)
+    return player
+
 def seed_data(target_total: int = 150):
     init_db()
     
@@ -89,57 +151,7 @@ def seed_data(target_total: int = 150):
         print(f"Hybrid Seeding Active: {real_count} real, {synthetic_count} synthetic. Generating {to_generate} more to reach {target_total}...")
         
         for _ in range(to_generate):
-            pos = random.choice(POSITIONS)
-            age = random.randint(17, 34)
-            stats = generate_stats_for_position(pos, age)
-            predicted_growth = round(random.uniform(0.0, 10.0), 1)
-            
-            player = Player(
-                id=str(uuid.uuid4()),
-                name=f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}",
-                club=random.choice(CLUBS),
-                league=random.choice(LEAGUES),
-                position=pos,
-                age=age,
-                nationality=random.choice(["France", "Spain", "England", "Brazil", "Argentina", "Germany", "Portugal", "Netherlands", "Italy", "Belgium"]),
-                image=f"/placeholder-player-{random.randint(1, 4)}.png",
-                market_value=generate_market_value(age, stats, predicted_growth),
-                predicted_growth=predicted_growth,
-                tactical_role=random.choice(["Playmaker", "Target Man", "Ball Winning Midfielder", "Inverted Winger", "Libero"]),
-                is_synthetic=True,
-                
-                # Stats
-                pace=stats["pace"],
-                shooting=stats["shooting"],
-                passing=stats["passing"],
-                dribbling=stats["dribbling"],
-                defending=stats["defending"],
-                physical=stats["physical"],
-                xg_per_90=stats["xg_per_90"],
-                xa_per_90=stats["xa_per_90"],
-                ppda=stats["ppda"],
-                
-                # Attributes
-                attributes={
-                    "technical": [
-                        {"name": "Finishing", "value": random.randint(8, 20)},
-                        {"name": "Passing", "value": random.randint(8, 20)},
-                        {"name": "Dribbling", "value": random.randint(8, 20)},
-                        {"name": "Touch", "value": random.randint(8, 20)}
-                    ],
-                    "mental": [
-                        {"name": "Vision", "value": random.randint(8, 20)},
-                        {"name": "Positioning", "value": random.randint(8, 20)},
-                        {"name": "Determination", "value": random.randint(8, 20)}
-                    ],
-                    "physical": [
-                        {"name": "Pace", "value": random.randint(8, 20)},
-                        {"name": "Strength", "value": random.randint(8, 20)},
-                        {"name": "Stamina", "value": random.randint(8, 20)}
-                    ]
-                }
-            )
-            session.add(player)
+            session.add(generate_player())
             
         session.commit()
         print(f"Hybrid Seeding Complete. Database now contains {target_total} specialized profiles.")
@@ -0,0 +1,49 @@
+from typing import Optional, Union
+
+# Anything above this (in millions) is assumed to be a raw euro amount,
+# e.g. the master DB stores "150000000" rather than "€150M".
+RAW_EURO_THRESHOLD_M = 10_000
+
+SUFFIX_MULTIPLIERS = {
+    "BN": 1000.0,
+    "B": 1000.0,
+    "M": 1.0,
+    "K": 0.001,
+}
+
+def parse_market_value(raw: Union[str, int, float, None]) -> Optional[float]:
+    """
+    Normalizes a market value into € millions.
+    Accepts "€85.0M", "€500K", "€1.2bn", "85", 85.0 and raw euro amounts like "150000000".
+    Returns None if the value cannot be parsed.
+    """
+    if raw is None:
+        return None
+
+    if isinstance(raw, (int, float)):
+        value = float(raw)
+    else:
+        text = str(raw).strip().upper().replace("€", "").replace(",", "").replace(" ", "")
+        if not text:
+            return None
+
+        multiplier = 1.0
+        for suffix, factor in SUFFIX_MULTIPLIERS.items():
+            if text.endswith(suffix):
+                text = text[: -len(suffix)]
+                multiplier = factor
+                break
+
+        try:
+            value = float(text) * multiplier
+        except ValueError:
+            return None
+
+    if value != value or value < 0:  # NaN or negative
+        return None
+
+    # Also catches doubled suffixes produced by the old importer ("€35000000M")
+    if value > RAW_EURO_THRESHOLD_M:
+        value = value / 1_000_000
+
+    return round(value, 3)
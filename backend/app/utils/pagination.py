@@ -0,0 +1,56 @@
+import base64
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+def use_cursor(paginate: str, cursor: Optional[str]) -> bool:
+    """Cursor mode is opt-in so existing clients keep receiving plain lists."""
+    return paginate == "cursor" or cursor is not None
+
+def encode_cursor(sort_key: str, values: List[Any]) -> str:
+    """Opaque, URL-safe cursor holding the sort key and the last row's sort values."""
+    payload = json.dumps({"k": sort_key, "v": values}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_key: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if payload.get("k") != sort_key:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort order")
+    return values
+
+def apply_keyset(statement, columns: list, descending: bool, cursor_values: Optional[List[Any]], limit: int):
+    """
+    Orders by `columns` (last one must be unique, e.g. the primary key) and seeks past
+    `cursor_values` with a row-value comparison, so every page costs one index range scan.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    if cursor_values is not None:
+        if len(cursor_values) != len(columns):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # (c1, c2, ...) < (v1, v2, ...) expanded for portability across SQLite/Postgres
+        clauses = []
+        for i, column in enumerate(columns):
+            prefix = [columns[j] == cursor_values[j] for j in range(i)]
+            step = column < cursor_values[i] if descending else column > cursor_values[i]
+            clauses.append(and_(*prefix, step))
+        statement = statement.where(or_(*clauses))
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return statement.order_by(*order).limit(limit + 1)
+
+def build_page(rows: list, limit: int, sort_key: str, key_fn: Callable[[Any], List[Any]],
+               serialize: Callable[[Any], Dict]) -> Dict[str, Any]:
+    """Wraps a keyset result (fetched with limit + 1) into {"items", "next_cursor"}."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(sort_key, key_fn(rows[-1])) if has_more and rows else None
+    return {"items": [serialize(r) for r in rows], "next_cursor": next_cursor}
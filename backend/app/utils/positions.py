@@ -0,0 +1,83 @@
+"""
+Canonical position taxonomy. Raw positions arrive as codes ("ST", "CDM"),
+composites ("LCB/LB") or labels ("Center Back", "Winger"); every one of them
+resolves here to a canonical code (player.position_code) and a role group
+(player.role_group), both indexed, so role filters and squad aggregations are
+index lookups instead of string tests.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Bump when a mapping changes so derived data (e.g. the similarity snapshot) is rebuilt
+TAXONOMY_VERSION = "1"
+
+GOALKEEPER, DEFENDER, MIDFIELDER, ATTACKER = "GK", "DEF", "MID", "ATT"
+
+ROLE_GROUPS: Dict[str, Tuple[str, ...]] = {
+    GOALKEEPER: ("GK",),
+    DEFENDER: ("CB", "LB", "RB"),
+    MIDFIELDER: ("DM", "CM", "CAM"),
+    ATTACKER: ("LW", "RW", "ST"),
+}
+POSITION_CODES = tuple(code for codes in ROLE_GROUPS.values() for code in codes)
+GROUP_OF = {code: group for group, codes in ROLE_GROUPS.items() for code in codes}
+
+# Tokens are upper-cased with spaces, hyphens and underscores removed
+ALIASES = {
+    "GK": "GK", "GOALKEEPER": "GK", "KEEPER": "GK",
+    "CB": "CB", "LCB": "CB", "RCB": "CB", "DEFENDER": "CB", "CENTREBACK": "CB", "CENTERBACK": "CB",
+    "LB": "LB", "LWB": "LB", "LEFTBACK": "LB", "LEFTWINGBACK": "LB",
+    "RB": "RB", "RWB": "RB", "RIGHTBACK": "RB", "RIGHTWINGBACK": "RB",
+    "DM": "DM", "CDM": "DM", "DEFENSIVEMIDFIELD": "DM", "DEFENSIVEMIDFIELDER": "DM",
+    "CM": "CM", "LCM": "CM", "RCM": "CM", "MIDFIELDER": "CM", "MIDFIELD": "CM",
+    "CENTRALMIDFIELD": "CM", "CENTRALMIDFIELDER": "CM",
+    "CAM": "CAM", "AM": "CAM", "ATTACKINGMIDFIELD": "CAM", "ATTACKINGMIDFIELDER": "CAM",
+    "LW": "LW", "LM": "LW", "LEFTWINGER": "LW",
+    "RW": "RW", "RM": "RW", "RIGHTWINGER": "RW",
+    "ST": "ST", "CF": "ST", "LS": "ST", "RS": "ST", "STRIKER": "ST", "FORWARD": "ST", "CENTREFORWARD": "ST",
+    "CENTERFORWARD": "ST",
+}
+# Labels without a side: no single code, but a definite role group
+AMBIGUOUS = {
+    "WINGER": ("LW", "RW"),
+    "FULLBACK": ("LB", "RB"),
+    "WINGBACK": ("LB", "RB"),
+}
+
+_SEPARATORS = re.compile(r"[\s\-_]+")
+
+def parts(position: Optional[str]) -> List[str]:
+    """Normalized tokens of a raw position, composites split on '/'."""
+    return [_SEPARATORS.sub("", part) for part in (position or "").upper().split("/")]
+
+def codes_for(token: str) -> Tuple[str, ...]:
+    """Canonical codes one normalized token can stand for (empty when unknown)."""
+    if token in ALIASES:
+        return (ALIASES[token],)
+    return AMBIGUOUS.get(token, ())
+
+def position_codes(position: Optional[str]) -> Tuple[str, ...]:
+    """Codes of the first recognised part: one for "LCB/LB", both flanks for "Winger"."""
+    for token in parts(position):
+        codes = codes_for(token)
+        if codes:
+            return codes
+    return ()
+
+def position_code(position: Optional[str]) -> Optional[str]:
+    """
+    Canonical code of a raw position: the first recognised part of a composite
+    string ("LCB/LB" -> "CB", "CDM" -> "DM"). None when nothing is recognised
+    or the label has no side ("Winger").
+    """
+    codes = position_codes(position)
+    return codes[0] if len(codes) == 1 else None
+
+def role_group(position: Optional[str]) -> Optional[str]:
+    """GK / DEF / MID / ATT of a raw position, or None when nothing is recognised."""
+    codes = position_codes(position)
+    return GROUP_OF[codes[0]] if codes else None
+
+def classify(position: Optional[str]) -> Dict[str, Optional[str]]:
+    """Both derived columns for a writer: {"position_code": ..., "role_group": ...}."""
+    return {"position_code": position_code(position), "role_group": role_group(position)}
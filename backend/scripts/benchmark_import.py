@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import tempfile
+import resource
+import numpy as np
+
+# Benchmark runs against its own database
+# Usage: python scripts/benchmark_import.py [file_size_mb]
+TARGET_MB = float(sys.argv[1]) if len(sys.argv) > 1 else 100
+WORK_DIR = tempfile.gettempdir()
+DB_PATH = os.path.join(WORK_DIR, "scienceball_import_bench.db")
+CSV_PATH = os.path.join(WORK_DIR, f"scienceball_import_bench_{int(TARGET_MB)}mb.csv")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.db import init_db
+from app.services.player_import import PlayerImportService
+from app.utils.data_generator import FIRST_NAMES, LAST_NAMES, CLUBS, LEAGUES, POSITIONS
+
+HEADER = ["Player", "Team", "Pos", "Age", "Competition", "Nation", "Value",
+          "Finishing", "Passing", "Dribbling", "Tackling", "Vision", "Composure",
+          "Pace", "Acceleration", "Stamina", "Strength"]
+WRITE_BLOCK = 50_000
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+def write_csv():
+    if os.path.exists(CSV_PATH) and os.path.getsize(CSV_PATH) >= TARGET_MB * 1e6:
+        return
+    rng = np.random.default_rng(5)
+    serial = 0
+    with open(CSV_PATH, "w", encoding="utf-8") as f:
+        f.write(",".join(HEADER) + "\n")
+        while f.tell() < TARGET_MB * 1e6:
+            n = WRITE_BLOCK
+            first = rng.choice(FIRST_NAMES, n)
+            last = rng.choice(LAST_NAMES, n)
+            clubs = rng.choice(CLUBS, n)
+            positions = rng.choice(POSITIONS, n)
+            leagues = rng.choice(LEAGUES, n)
+            ages = rng.integers(16, 36, n)
+            values = rng.uniform(0.5, 120, n).round(1)
+            attrs = rng.integers(1, 21, (n, 10))
+            lines = []
+            for i in range(n):
+                # Unique names so duplicate detection does not discard the benchmark rows
+                lines.append(
+                    f"{first[i]} {last[i]} {serial + i},{clubs[i]},{positions[i]},{ages[i]},{leagues[i]},Netherlands,"
+                    f"€{values[i]}M," + ",".join(map(str, attrs[i]))
+                )
+            serial += n
+            f.write("\n".join(lines) + "\n")
+
+def run_benchmark():
+    print(f"Preparing {TARGET_MB:.0f} MB CSV...")
+    write_csv()
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+
+    service = PlayerImportService()
+    rss_samples = []
+    original_map = service.map_chunk
+
+    def sampled_map_chunk(df, row_offset):
+        rss_samples.append(current_rss_mb())
+        return original_map(df, row_offset)
+    service.map_chunk = sampled_map_chunk
+
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    stats = service.import_file(CSV_PATH)
+    elapsed = time.perf_counter() - start
+
+    print(f"file: {os.path.getsize(CSV_PATH) / 1e6:.0f} MB, rows: {stats['total_rows_processed']}, "
+          f"added: {stats['players_added']}, duplicates: {stats['duplicates_skipped']}, failed: {stats['failed']}")
+    print(f"time: {elapsed:.1f}s ({stats['rows_per_sec']:.0f} rows/s)")
+    print(f"RSS: baseline {baseline:.0f} MB, first chunk {rss_samples[0]:.0f} MB, "
+          f"last chunk {rss_samples[-1]:.0f} MB, peak {peak_rss_mb():.0f} MB")
+    print("per-chunk RSS (MB):", " ".join(f"{r:.0f}" for r in rss_samples[::max(1, len(rss_samples) // 20)]))
+
+if __name__ == "__main__":
+    run_benchmark()
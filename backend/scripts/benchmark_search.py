@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import tempfile
+import statistics
+
+# Benchmark runs against its own database unless one is given explicitly
+# Usage: python scripts/benchmark_search.py [n_players] [database_url]
+N_PLAYERS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+if len(sys.argv) > 2:
+    os.environ["DATABASE_URL"] = sys.argv[2]
+else:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'scienceball_search_bench.db')}"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, select, func
+from app.core.db import engine, init_db
+from app.models.player import Player
+from app.services.player_search import PlayerSearchService
+from app.utils.data_generator import generate_player
+
+QUERIES = ["guler", "Güler", "gul", "mbappe", "van dijk", "real madrid", "brazil", "kevin de"]
+REPEATS = 20
+LIMIT = 20
+CHUNK_SIZE = 5000
+
+def populate():
+    init_db()
+    with Session(engine) as session:
+        existing = session.exec(select(func.count(Player.id))).one()
+        missing = N_PLAYERS - existing
+        if missing <= 0:
+            print(f"Dataset ready ({existing} players).")
+            return
+        print(f"Generating {missing} synthetic players...")
+        start = time.perf_counter()
+        for offset in range(0, missing, CHUNK_SIZE):
+            session.add_all([generate_player() for _ in range(min(CHUNK_SIZE, missing - offset))])
+            session.commit()
+        print(f"Generated in {time.perf_counter() - start:.1f}s")
+
+def legacy_ilike(session: Session, q: str) -> list:
+    """The pre-index /players/search query."""
+    query = q.lower()
+    statement = select(Player.id).where(
+        (Player.name.ilike(f"%{query}%")) |
+        (Player.club.ilike(f"%{query}%")) |
+        (Player.nationality.ilike(f"%{query}%"))
+    ).limit(LIMIT)
+    return session.exec(statement).all()
+
+def timed(fn) -> tuple:
+    samples = []
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples), result
+
+def run_benchmark():
+    populate()
+    service = PlayerSearchService(engine)
+    print(f"\nSearch backend: {service.backend} ({engine.dialect.name}), {N_PLAYERS} players, {REPEATS} runs/query\n")
+    print(f"{'query':<14}{'ilike p50':>11}{'ilike max':>11}{'hits':>6}{'index p50':>11}{'index max':>11}{'hits':>6}   top hit")
+
+    with Session(engine) as session:
+        for q in QUERIES:
+            # Worst case for ILIKE is the no-match/low-match query that scans the whole table
+            l_p50, l_max, l_rows = timed(lambda: legacy_ilike(session, q))
+            i_p50, i_max, i_rows = timed(lambda: service.search(session, q, LIMIT))
+            top = session.get(Player, i_rows[0][0]).name if i_rows else "-"
+            print(f"{q:<14}{l_p50:>9.2f}ms{l_max:>9.2f}ms{len(l_rows):>6}{i_p50:>9.2f}ms{i_max:>9.2f}ms{len(i_rows):>6}   {top}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+import tempfile
+import statistics
+from types import SimpleNamespace
+import numpy as np
+
+# Usage: python scripts/benchmark_similarity.py [n_players]
+N_PLAYERS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.similarity import SimilarityEngine, STAT_FEATURES, ATTRIBUTE_BLOCKS
+from app.utils.positions import position_code
+
+POSITIONS = ["GK", "CB", "LB", "RB", "DM", "CM", "AM", "LW", "RW", "ST"]
+LEAGUES = ["Eredivisie", "Premier League", "La Liga", "Serie A", "Bundesliga", "Ligue 1"]
+REPEATS = 50
+# Targets for a 200k pool: unfiltered and filtered top-k below 50ms, incremental refresh of 500 rows below 250ms
+TARGET_QUERY_MS = 50
+TARGET_REFRESH_MS = 250
+
+def synthetic_rows(n: int, rng: np.random.Generator, offset: int = 0) -> list:
+    stats = rng.integers(30, 95, size=(n, len(STAT_FEATURES))).astype(float)
+    blocks = rng.integers(1, 21, size=(n, len(ATTRIBUTE_BLOCKS), 4))
+    positions = rng.choice(POSITIONS, size=n)
+    leagues = rng.choice(LEAGUES, size=n)
+    ages = rng.integers(16, 38, size=n)
+    rows = []
+    for i in range(n):
+        attributes = {
+            block: [{"name": f"{block}_{j}", "value": int(v)} for j, v in enumerate(blocks[i, b])]
+            for b, block in enumerate(ATTRIBUTE_BLOCKS)
+        }
+        rows.append(SimpleNamespace(
+            id=f"p{offset + i}", position=positions[i], position_code=position_code(positions[i]), league=leagues[i], club=f"Club {i % 500}", age=int(ages[i]),
+            attributes=None, scientific_profile={"attributes": attributes},
+            **dict(zip(STAT_FEATURES, stats[i]))
+        ))
+    return rows
+
+def timed(fn) -> tuple:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), float(np.percentile(samples, 95))
+
+def report(label: str, p50: float, p95: float, target: float):
+    status = "OK" if p95 <= target else "SLOW"
+    print(f"{label:<36}{p50:>9.2f}ms{p95:>9.2f}ms   target {target}ms  {status}")
+
+def run_benchmark():
+    rng = np.random.default_rng(7)
+    engine = SimilarityEngine(snapshot_path=None)
+
+    start = time.perf_counter()
+    rows = synthetic_rows(N_PLAYERS, rng)
+    engine._upsert_rows(rows)
+    engine._normalize()
+    engine.loaded = True
+    print(f"Built matrix for {N_PLAYERS} players in {time.perf_counter() - start:.1f}s\n")
+    print(f"{'case':<36}{'p50':>11}{'p95':>11}")
+
+    probe_ids = [f"p{i}" for i in rng.integers(0, N_PLAYERS, size=REPEATS)]
+    probe = iter(probe_ids * 10)
+    for metric in ("cosine", "mahalanobis"):
+        report(f"{metric} top-10", *timed(lambda: engine.query(next(probe), k=10, metric=metric)), TARGET_QUERY_MS)
+        report(f"{metric} top-10 position+age", *timed(
+            lambda: engine.query(next(probe), k=10, metric=metric, position="CM", min_age=18, max_age=24)
+        ), TARGET_QUERY_MS)
+        report(f"{metric} top-10 league+position", *timed(
+            lambda: engine.query(next(probe), k=10, metric=metric, position="ST", league="Eredivisie")
+        ), TARGET_QUERY_MS)
+
+    # IVF index: latency and recall@10 against the exact scan
+    probe_ids = probe_ids[:REPEATS]
+    recall = []
+    for pid in probe_ids:
+        exact = {p for p, _ in engine.query(pid, k=10, position="CM")}
+        approx = {p for p, _ in engine.query(pid, k=10, position="CM", approximate=True)}
+        recall.append(len(exact & approx) / max(1, len(exact)))
+    print(f"\nIVF: {engine.ann.nlist} lists, recall@10 {np.mean(recall):.3f}")
+    report("ivf cosine top-10", *timed(lambda: engine.query(next(probe), k=10, approximate=True)), TARGET_QUERY_MS)
+    report("ivf cosine top-10 position+age", *timed(
+        lambda: engine.query(next(probe), k=10, approximate=True, position="CM", max_age=24)
+    ), TARGET_QUERY_MS)
+    report("ivf prototype top-2 (gap search)", *timed(
+        lambda: engine.query_prototype(k=2, position="RB", exclude_club="Club 1", max_age=25)
+    ), TARGET_QUERY_MS)
+
+    # On-disk snapshot round trip
+    engine.snapshot_path = os.path.join(tempfile.gettempdir(), "scienceball_similarity_bench.npz")
+    engine._key = np.array([str(N_PLAYERS)])
+    start = time.perf_counter()
+    engine.save_snapshot()
+    saved = time.perf_counter() - start
+    restored = SimilarityEngine(snapshot_path=engine.snapshot_path)
+    restored._snapshot_key = lambda session: engine._key
+    start = time.perf_counter()
+    assert restored._load_snapshot(None)
+    print(f"snapshot: saved in {saved:.2f}s, restored in {time.perf_counter() - start:.2f}s "
+          f"({os.path.getsize(engine.snapshot_path) / 1e6:.0f} MB)\n")
+
+    # Incremental refresh: updates to existing rows plus a few new players
+    updates = synthetic_rows(450, rng) + synthetic_rows(50, rng, offset=N_PLAYERS)
+    def refresh():
+        engine._after_change(np.array(engine._upsert_rows(updates)))
+    report("incremental refresh (500 rows)", *timed(refresh), TARGET_REFRESH_MS)
+
+if __name__ == "__main__":
+    run_benchmark()
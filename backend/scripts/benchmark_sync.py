@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import random
+import tempfile
+
+# Benchmark runs against its own database and master file
+# Usage: python scripts/benchmark_sync.py [n_players]
+N_PLAYERS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+WORK_DIR = tempfile.gettempdir()
+DB_PATH = os.path.join(WORK_DIR, "scienceball_sync_bench.db")
+MASTER_PATH = os.path.join(WORK_DIR, "scienceball_sync_bench_master.json")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, select, func
+from app.core.db import engine, init_db
+from app.models.player import Player, Shortlist, ShortlistPlayerLink
+from app.services.data_sync import DataSyncService
+from app.utils.data_generator import generate_player, CLUBS
+
+DERIVED = {"scientific_profile", "profile_version", "profile_fingerprint", "market_value_m"}
+
+def build_master(n: int) -> list:
+    random.seed(11)
+    players = []
+    for i in range(n):
+        record = generate_player().model_dump(exclude=DERIVED)
+        record["fm_id"] = 30_000_000 + i
+        record["is_shortlisted"] = i % 10 == 0
+        record["shortlist_category"] = "Ajax First Team" if i % 100 == 0 else "Global Scouting Targets"
+        players.append(record)
+    return players
+
+def write_master(players: list):
+    with open(MASTER_PATH, "w", encoding="utf-8") as f:
+        json.dump({"metadata": {"source": "benchmark"}, "players": players}, f)
+
+def run_pass(service: DataSyncService, label: str):
+    stats = service.sync_database()
+    print(f"{label:<28}{stats['rows_per_sec']:>10.0f} rows/s  {stats['duration_s']:>7.2f}s  "
+          f"created={stats['created']} updated={stats['updated']} unchanged={stats['unchanged']} transfers={stats['transfers']}")
+
+def run_benchmark():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+    with Session(engine) as session:
+        session.add(Shortlist(name="Global Scouting Targets"))
+        session.add(Shortlist(name="Ajax First Team"))
+        session.commit()
+
+    service = DataSyncService()
+    service.file_path = MASTER_PATH
+
+    print(f"Building master file with {N_PLAYERS} players...")
+    players = build_master(N_PLAYERS)
+    write_master(players)
+    run_pass(service, "initial load")
+    run_pass(service, "no-op resync")
+
+    # 10% transfers, 5% stat changes
+    for i, record in enumerate(players):
+        if i % 10 == 0:
+            record["club"] = random.choice([c for c in CLUBS if c != record["club"]])
+        elif i % 20 == 1:
+            record["pace"] = min(99, record["pace"] + 1)
+    write_master(players)
+    run_pass(service, "15% changed resync")
+
+    with Session(engine) as session:
+        total = session.exec(select(func.count(Player.id))).one()
+        links = session.exec(select(func.count()).select_from(ShortlistPlayerLink)).one()
+        print(f"\nDB: {total} players, {links} shortlist links")
+
+if __name__ == "__main__":
+    run_benchmark()
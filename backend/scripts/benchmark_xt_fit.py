@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Usage: python scripts/benchmark_xt_fit.py [n_events]
+# Default is roughly one league season: 380 matches x ~1,700 on-ball events.
+N_EVENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 650_000
+# Target: load + fit of a season at 12x8 and at a fine 48x32 grid within a few seconds each
+TARGET_FIT_S = 5.0
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analytics.xt_model import XT_GRID
+from app.analytics.xt_training import load_events, fit_grid
+
+def synthetic_season(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Moves drift towards goal, get riskier further up; shots convert more often close to goal."""
+    kind = rng.choice(["pass", "carry", "shot", "turnover"], size=n, p=[0.70, 0.16, 0.025, 0.115])
+    start_x = rng.beta(2.2, 2.0, size=n) * 100
+    start_y = rng.uniform(0, 100, size=n)
+    shot = kind == "shot"
+    start_x[shot] = rng.uniform(70, 100, size=shot.sum())
+    start_y[shot] = np.clip(rng.normal(50, 14, size=shot.sum()), 0, 100)
+
+    end_x = np.clip(start_x + rng.normal(6, 16, size=n), 0, 100)
+    end_y = np.clip(start_y + rng.normal(0, 18, size=n), 0, 100)
+    success = rng.random(n) < (0.92 - 0.35 * end_x / 100)
+    distance = np.hypot(100 - start_x, (start_y - 50) * 0.68)
+    goal = shot & (rng.random(n) < np.clip(0.45 - distance / 60, 0.02, 0.45))
+    return pd.DataFrame({
+        "type": kind, "start_x": start_x, "start_y": start_y, "end_x": end_x, "end_y": end_y,
+        "success": success, "goal": goal, "league": "Eredivisie", "season": "2025",
+    })
+
+def run():
+    rng = np.random.default_rng(21)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "season.csv")
+        synthetic_season(N_EVENTS, rng).to_csv(path, index=False)
+        size_mb = os.path.getsize(path) / 1e6
+
+        start = time.perf_counter()
+        events = load_events(path)
+        load_s = time.perf_counter() - start
+        print(f"Loaded {len(events):,} events ({size_mb:.0f} MB CSV) in {load_s:.2f}s")
+
+        for cols, rows in [(12, 8), (24, 16), (48, 32)]:
+            start = time.perf_counter()
+            result = fit_grid(events, cols, rows)
+            fit_s = time.perf_counter() - start
+            status = "OK" if load_s + fit_s <= TARGET_FIT_S else "SLOW"
+            print(f"{cols}x{rows}: fit {fit_s:.2f}s, {result['iterations']} iterations, "
+                  f"converged={result['converged']}, {result['transitions_nnz']:,} transitions [{status}]")
+
+        grid = fit_grid(events, 12, 8)["grid"]
+        print(f"12x8 fitted max {grid.max():.3f} at {np.unravel_index(grid.argmax(), grid.shape)}, "
+              f"baseline max {XT_GRID.max():.3f} at {np.unravel_index(XT_GRID.argmax(), XT_GRID.shape)}")
+
+if __name__ == "__main__":
+    run()
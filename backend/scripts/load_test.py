@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import statistics
+import httpx
+
+# Concurrent load against a real uvicorn process, reporting tail latency per endpoint.
+# Compare two builds on the same database by pointing --app-dir at another checkout:
+#   git worktree add /tmp/sb-before <commit> && python scripts/load_test.py --app-dir /tmp/sb-before/backend
+#   python scripts/load_test.py
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORK_DIR = tempfile.gettempdir()
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--app-dir", default=BACKEND_DIR)
+parser.add_argument("--players", type=int, default=50_000)
+parser.add_argument("--concurrency", type=int, default=32)
+parser.add_argument("--requests", type=int, default=3000)
+parser.add_argument("--port", type=int, default=8765)
+args = parser.parse_args()
+
+DB_PATH = os.path.join(WORK_DIR, f"scienceball_load_{args.players}.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.append(BACKEND_DIR)
+
+def prepare_database() -> list:
+    """Synthetic player pool, built once per size and reused across runs."""
+    from sqlalchemy import insert
+    from sqlmodel import Session, select
+    from app.core.db import engine, init_db
+    from app.models.player import Player
+    from app.services.profile_store import ProfileStore
+    from app.utils.data_generator import generate_player
+
+    init_db()
+    with Session(engine) as session:
+        ids = session.exec(select(Player.id)).all()
+        if len(ids) < args.players:
+            random.seed(3)
+            print(f"Seeding {args.players - len(ids)} synthetic players...")
+            rows = [generate_player().model_dump() for _ in range(args.players - len(ids))]
+            for start in range(0, len(rows), 5000):
+                session.connection().execute(insert(Player.__table__), rows[start:start + 5000])
+            session.commit()
+            ids = session.exec(select(Player.id)).all()
+    # Profiles up front, so profile backfills on first read do not turn the load into writes
+    ProfileStore.refresh_stale(engine)
+    return list(ids)
+
+def request_mix(ids: list, names: list) -> list:
+    """Cheap primary-key reads interleaved with heavier list/search queries."""
+    rng = random.Random(9)
+    mix = []
+    for _ in range(args.requests):
+        roll = rng.random()
+        if roll < 0.45:
+            mix.append(("player", f"/players/{rng.choice(ids)}"))
+        elif roll < 0.65:
+            mix.append(("filter", f"/players/filter?club={rng.choice(['a', 'e', 'on'])}&sort_by=value&limit=20"))
+        elif roll < 0.85:
+            mix.append(("search", f"/players/search?q={rng.choice(names)}"))
+        else:
+            mix.append(("watchlist", "/watchlist"))
+    return mix
+
+def start_server() -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--app-dir", args.app_dir,
+         "--port", str(args.port), "--log-level", "warning", "--timeout-keep-alive", "120"],
+        cwd=args.app_dir, env={**os.environ, "PYTHONPATH": args.app_dir},
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{args.port}/").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("server did not start")
+
+async def run_load(mix: list) -> tuple:
+    latencies = {}
+    queue = asyncio.Queue()
+    for item in mix:
+        queue.put_nowait(item)
+
+    async def worker(client: httpx.AsyncClient):
+        while not queue.empty():
+            label, url = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.setdefault(label, []).append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+        # Warm-up: first-use index detection and connection pools
+        for label, url in {label: url for label, url in mix}.items():
+            await client.get(url)
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(args.concurrency)])
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+def percentile(samples: list, q: float) -> float:
+    return statistics.quantiles(samples, n=100)[q - 1] if len(samples) > 1 else samples[0]
+
+def run():
+    ids = prepare_database()
+    names = ["gul", "mbappe", "van dijk", "silva", "kane"]
+    mix = request_mix(ids, names)
+
+    server = start_server()
+    try:
+        latencies, elapsed = asyncio.run(run_load(mix))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"\n{args.app_dir}: {len(mix)} requests, concurrency {args.concurrency}, "
+          f"{len(ids)} players, {len(mix) / elapsed:.0f} req/s")
+    print(f"{'endpoint':<12}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    everything = []
+    for label, samples in sorted(latencies.items()):
+        everything.extend(samples)
+        print(f"{label:<12}{len(samples):>6}{percentile(samples, 50):>8.1f}ms{percentile(samples, 95):>8.1f}ms"
+              f"{percentile(samples, 99):>8.1f}ms{max(samples):>8.1f}ms")
+    print(f"{'all':<12}{len(everything):>6}{percentile(everything, 50):>8.1f}ms{percentile(everything, 95):>8.1f}ms"
+          f"{percentile(everything, 99):>8.1f}ms{max(everything):>8.1f}ms")
+
+if __name__ == "__main__":
+    run()
@@ -18,6 +18,8 @@ sys.path.append(os.getcwd())
 from sqlmodel import Session, select, SQLModel
 from app.core.db import engine
 from app.models.player import Player, Shortlist, ShortlistPlayerLink
+from app.utils.market_value import parse_market_value
+from app.services.profile_store import ProfileStore
 
 def load_master_db():
     try:
@@ -69,6 +71,8 @@ def seed_professional_data():
             # Extract meta-fields that aren't in the Player model directly
             shortlist_category = p_data.pop("shortlist_category", "Global Scouting Targets")
             is_shortlisted = p_data.pop("is_shortlisted", False)
+            if "market_value" in p_data:
+                p_data["market_value_m"] = parse_market_value(p_data["market_value"])
             
             # Check if player exists by FM_ID (Ideal) or ID (Fallback)
             existing = None
@@ -82,11 +86,13 @@ def seed_professional_data():
                 # Update existing record
                 for key, value in p_data.items():
                     setattr(existing, key, value)
+                ProfileStore.apply(existing)
                 session.add(existing)
                 print(f"-> Updated: {existing.name}")
             else:
                 # Create new record
                 new_player = Player(**p_data)
+                ProfileStore.apply(new_player)
                 session.add(new_player)
                 session.commit() # Commit to get ID for linking
                 session.refresh(new_player)
@@ -41,7 +41,7 @@ const ArchivePage = () => {
                     </button>
                     {lastResult && (
                         <div className={styles.result}>
-                            <span>SUCCESS: {lastResult.archived_assignments} SIGNALS VAULTED</span>
+                            <span>SUCCESS: {lastResult.archived_assignments} SIGNALS / {lastResult.archived_messages} MESSAGES VAULTED</span>
                         </div>
                     )}
                 </section>
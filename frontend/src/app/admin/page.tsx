@@ -49,6 +49,22 @@ const AdminPage = () => {
         }
     };
 
+    const pollImportJob = async (jobId: string) => {
+        while (true) {
+            const res = await fetch(`${API_BASE_URL}/import/jobs/${jobId}`);
+            const job = await res.json();
+            if (!res.ok) {
+                throw new Error(job.detail);
+            }
+            if (job.status === 'COMPLETED' || job.status === 'FAILED') {
+                return job;
+            }
+            const eta = job.eta_s != null ? ` ~${Math.ceil(job.eta_s)}s left` : '';
+            setStatus(`Importing... ${Math.round(job.progress * 100)}% (${job.rows_parsed} rows,${eta})`);
+            await new Promise(resolve => setTimeout(resolve, 1000));
+        }
+    };
+
     const handleUpload = async () => {
         if (!file) return;
 
@@ -64,11 +80,19 @@ const AdminPage = () => {
 
             const data = await res.json();
 
-            if (res.ok) {
-                setStatus(`Success! Processed ${data.total_rows_processed} rows. Added ${data.players_added} new players.`);
+            if (!res.ok) {
+                setStatus(`Error: ${data.detail}`);
+                setIsError(true);
+                return;
+            }
+
+            const job = await pollImportJob(data.job_id);
+            if (job.status === 'COMPLETED') {
+                const failed = job.rows_failed > 0 ? ` ${job.rows_failed} rows failed (see error report).` : '';
+                setStatus(`Success! Processed ${job.rows_parsed} rows. Added ${job.rows_inserted} new players.${failed}`);
                 setIsError(false);
             } else {
-                setStatus(`Error: ${data.detail}`);
+                setStatus(`Error: ${job.error}`);
                 setIsError(true);
             }
         } catch (err) {
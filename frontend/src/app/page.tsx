@@ -67,16 +67,20 @@ export default function Home() {
   useEffect(() => {
     const fetchDashboardData = async () => {
       try {
-        const [td, brief, prospects] = await Promise.all([
+        const clubStr = localStorage.getItem('sb_club');
+        const club = clubStr ? JSON.parse(clubStr).name : undefined;
+        const directorQuery = club ? `?club=${encodeURIComponent(club)}` : '';
+
+        const [td, brief, director] = await Promise.all([
           fetch(`${API_BASE_URL}/analytics/td-dashboard`).then(res => res.json()),
           fetch(`${API_BASE_URL}/analytics/scout-report`).then(res => res.json()),
-          fetch(`${API_BASE_URL}/director/priority-targets`).then(res => res.json())
+          fetch(`${API_BASE_URL}/director/dashboard${directorQuery}`).then(res => res.json())
         ]);
 
         setData({
           td: td,
           tacticalBrief: brief,
-          prospects: prospects
+          prospects: director.priority_targets
         });
       } catch (err) {
         console.error("Dashboard aggregation failed:", err);
@@ -25,12 +25,29 @@ const ChatWidget: React.FC = () => {
 
     useEffect(() => {
         if (!activeChannel) return;
-        const interval = setInterval(() => {
+        const loadHistory = () => {
             fetch(`${API_BASE_URL}/chat/messages/${activeChannel.id}`)
                 .then(res => res.json())
                 .then(data => setMessages(data));
-        }, 3000);
-        return () => clearInterval(interval);
+        };
+        loadHistory();
+
+        // New messages are pushed; history is only refetched when the stream cannot resume
+        const source = new EventSource(`${API_BASE_URL}/events/stream?kinds=MESSAGE&channel_id=${activeChannel.id}`);
+        source.addEventListener('MESSAGE', (e) => {
+            const event = JSON.parse((e as MessageEvent).data);
+            const msg: Message = {
+                id: event.id,
+                channel_id: event.channel_id,
+                sender: event.user,
+                content: event.content,
+                player_id: event.ref ?? undefined,
+                timestamp: event.time,
+            };
+            setMessages(prev => prev.some(m => m.id === msg.id) ? prev : [...prev, msg]);
+        });
+        source.addEventListener('reset', loadHistory);
+        return () => source.close();
     }, [activeChannel]);
 
     useEffect(() => {
@@ -56,7 +73,7 @@ const ChatWidget: React.FC = () => {
         })
             .then(res => res.json())
             .then(newMsg => {
-                setMessages([...messages, newMsg]);
+                setMessages(prev => prev.some(m => m.id === newMsg.id) ? prev : [...prev, newMsg]);
                 setInput('');
             });
     };
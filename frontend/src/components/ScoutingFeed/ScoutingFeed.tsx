@@ -31,8 +31,16 @@ const ScoutingFeed = () => {
         };
 
         fetchFeed();
-        const interval = setInterval(fetchFeed, 10000); // Update every 10s
-        return () => clearInterval(interval);
+
+        // Pushed as they are committed; a reset means events were missed, so refetch
+        const source = new EventSource(`${API_BASE_URL}/events/stream?kinds=MESSAGE,NEGOTIATION,ASSIGNMENT`);
+        const onEvent = (e: Event) => {
+            const event: FeedEvent = JSON.parse((e as MessageEvent).data);
+            setEvents(prev => [event, ...prev].slice(0, 20));
+        };
+        ['MESSAGE', 'NEGOTIATION', 'ASSIGNMENT'].forEach(kind => source.addEventListener(kind, onEvent));
+        source.addEventListener('reset', fetchFeed);
+        return () => source.close();
     }, []);
 
     const getIcon = (type: string) => {
@@ -12,6 +12,33 @@ interface ShortlistContextType {
     shortlist: string[]; // Keep for compatibility with simpler components
 }
 
+interface WatchlistDelta {
+    op: 'create_category' | 'delete_category' | 'add_player' | 'remove_player';
+    category: string;
+    player_id?: string;
+}
+
+// Mutations answer with what changed rather than the whole watchlist
+const applyDelta = (current: Record<string, string[]>, delta: WatchlistDelta): Record<string, string[]> => {
+    const next = { ...current };
+    const players = next[delta.category] ?? [];
+    switch (delta.op) {
+        case 'create_category':
+            next[delta.category] = players;
+            break;
+        case 'delete_category':
+            delete next[delta.category];
+            break;
+        case 'add_player':
+            next[delta.category] = players.includes(delta.player_id!) ? players : [...players, delta.player_id!];
+            break;
+        case 'remove_player':
+            if (delta.category in next) next[delta.category] = players.filter(id => id !== delta.player_id);
+            break;
+    }
+    return next;
+};
+
 const ShortlistContext = createContext<ShortlistContextType | undefined>(undefined);
 
 export const ShortlistProvider: React.FC<{ children: React.ReactNode }> = ({ children }) => {
@@ -39,7 +66,7 @@ export const ShortlistProvider: React.FC<{ children: React.ReactNode }> = ({ chi
             const response = await fetch(`${API_BASE_URL}/watchlist/${encodeURIComponent(category)}/${playerId}`, { method });
             const data = await response.json();
             if (data.status === 'success') {
-                setShortlists(data.watchlist);
+                setShortlists(prev => applyDelta(prev, data.delta));
             }
         } catch (error) {
             console.error(`Failed to ${method} shortlist:`, error);
@@ -50,7 +77,9 @@ export const ShortlistProvider: React.FC<{ children: React.ReactNode }> = ({ chi
         try {
             const response = await fetch(`${API_BASE_URL}/watchlist/category?name=${encodeURIComponent(name)}`, { method: 'POST' });
             const data = await response.json();
-            setShortlists(data.watchlist);
+            if (data.status === 'success') {
+                setShortlists(prev => applyDelta(prev, data.delta));
+            }
         } catch (err) {
             console.error("Failed to create shortlist:", err);
         }
@@ -60,7 +89,9 @@ export const ShortlistProvider: React.FC<{ children: React.ReactNode }> = ({ chi
         try {
             const response = await fetch(`${API_BASE_URL}/watchlist/category/${encodeURIComponent(name)}`, { method: 'DELETE' });
             const data = await response.json();
-            setShortlists(data.watchlist);
+            if (data.status === 'success') {
+                setShortlists(prev => applyDelta(prev, data.delta));
+            }
         } catch (err) {
             console.error("Failed to delete shortlist:", err);
         }